@@ -1,21 +1,64 @@
-import pandas as pd
 import streamlit as st
+from mileage_model import shared_mileage_model
+from spatial_index import shared_locator
 
-# Load mileage data
-df = pd.read_csv("Evaluator_Customer_Mileage.csv")
+# Load mileage data (shared model, Evaluator/Customer held as integer codes)
+model = shared_mileage_model()
 
 # Sidebar filters
 st.sidebar.header("Filter Options")
-customer = st.sidebar.selectbox("Select Customer", sorted(df['Customer'].unique()))
-evaluator = st.sidebar.selectbox("Filter by Evaluator (optional)", ["All"] + sorted(df['Evaluator'].unique()))
+view = st.sidebar.radio("View", ["Evaluators by customer", "Customers by evaluator", "Ad-hoc address"])
+st.title("Evaluator Distance & Cost Viewer")
 
-# Filtered results
-filtered = df[df['Customer'] == customer]
-if evaluator != "All":
-    filtered = filtered[filtered['Evaluator'] == evaluator]
+if view == "Evaluators by customer":
+    customer = st.sidebar.selectbox("Select Customer", sorted(model.customer_names))
+    evaluator = st.sidebar.selectbox("Filter by Evaluator (optional)", ["All"] + sorted(model.active_evaluator_names()))
 
-# Sort and display
-filtered = filtered.sort_values(by='Round-Trip Miles')
-st.title("Evaluator Distance & Cost Viewer")
-st.subheader(f"Closest Evaluators to: {customer}")
-st.dataframe(filtered[['Evaluator', 'One-Way Miles', 'Round-Trip Miles', 'Drive Time (min)', 'Cost ($)']])
\ No newline at end of file
+    # Filtered results: the customer's rows come from the ranking index, closest first
+    filtered = model.frame(model.ranking.customer_rows(model.customer_code(customer), by="miles"))
+    if evaluator != "All":
+        filtered = filtered[filtered['Evaluator'].cat.codes == model.evaluator_code(evaluator)]
+
+    # Display
+    st.subheader(f"Closest Evaluators to: {customer}")
+    st.dataframe(filtered[['Evaluator', 'One-Way Miles', 'Round-Trip Miles', 'Drive Time (min)', '2026 Cost', 'Estimated']])
+elif view == "Customers by evaluator":
+    evaluator = st.sidebar.selectbox("Select Evaluator", sorted(model.active_evaluator_names()))
+    by = st.sidebar.radio("Rank by", ["Round-Trip Miles", "Total Cost"])
+    max_rank = st.sidebar.number_input("Show customers where they rank in the top", min_value=1, value=2)
+
+    # Reverse index: the evaluator's customers, best rank first
+    key = 'miles' if by == "Round-Trip Miles" else 'cost'
+    rows = model.ranking.evaluator_rows(model.evaluator_code(evaluator), by=key, max_rank=int(max_rank))
+    served = model.frame(rows)
+    served.insert(1, 'Rank', model.ranking.rank[key][rows] + 1)
+    served.insert(2, 'Competing Evaluators', model.ranking.competitors(model.customer_codes[rows]))
+
+    st.subheader(f"Customers where {evaluator} is a top-{int(max_rank)} evaluator by {by}")
+    st.dataframe(served[['Customer', 'Rank', 'Competing Evaluators', 'Round-Trip Miles',
+                         'Drive Time (min)', 'Total Cost', 'Estimated']], hide_index=True)
+else:
+    # Closest evaluators to a site that is not in the mileage CSV (spatial index over home ZIPs)
+    locator = shared_locator(model)
+    if locator is None:
+        st.info("Ad-hoc lookups need Zip_Centroids.csv (see distance_engine.py).")
+        st.stop()
+    site_zip = st.sidebar.text_input("Site ZIP code")
+    search = st.sidebar.radio("Find", ["Nearest evaluators", "Within a radius"])
+    if search == "Nearest evaluators":
+        k = st.sidebar.number_input("How many", min_value=1, max_value=max(len(locator), 1), value=min(10, max(len(locator), 1)))
+        radius = None
+    else:
+        k, radius = None, st.sidebar.number_input("Radius (straight-line miles)", min_value=1, value=100)
+
+    st.subheader("Closest Evaluators to an Ad-hoc Address")
+    location = locator.zip_coordinates(site_zip) if site_zip else None
+    if location is None:
+        st.warning("Enter a ZIP code from the centroid table.")
+        st.stop()
+    site = locator.site_table(*location, k=k, radius=radius)
+    if locator.road_model is None:
+        st.caption("Miles are straight-line: add Customer_Locations.csv to fit the road detour factor.")
+    columns = ['Evaluator', 'Straight-Line Miles', 'One-Way Miles', 'Round-Trip Miles', 'Drive Time (min)',
+               'Status', 'Total Cost']
+    st.dataframe(site[[c for c in columns if c in site.columns]], hide_index=True)
\ No newline at end of file
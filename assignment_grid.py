@@ -0,0 +1,141 @@
+import numpy as np
+import pandas as pd
+
+from candidate_masks import JobCandidates
+
+# Manual assignment as one editable grid instead of a selectbox per job.
+# Defaults are the cheapest unused evaluators in job order, found once. Each
+# override then changes only its own job:
+#
+#   holder[evaluator code] -> job holding them (-1 when free), so "is this
+#   evaluator taken?" is one lookup
+#   waiting[evaluator code] -> jobs asking for them, served in order as soon
+#   as the holder lets go (so two edits swap two evaluators)
+#
+# and the grand total moves by each change's cost delta instead of being
+# summed over every job again.
+
+TOP_N = 5
+
+
+class AssignmentGrid:
+    # customer_codes: one per job (-1 for unmatched jobs, which get no candidates)
+    def __init__(self, model, customer_codes, available=None, by="cost"):
+        self.model = model
+        self.job_candidates = candidates = JobCandidates(model, customer_codes, by=by, available=available)
+        n_jobs, n_evaluators = len(candidates), len(model.evaluator_names)
+
+        # (job, evaluator code) -> mileage row, for available evaluators only
+        job_of_entry = np.repeat(np.arange(n_jobs), np.diff(candidates.offsets))
+        usable = candidates.available[candidates.codes]
+        keys = (job_of_entry[usable].astype(np.int64) << 32) | candidates.codes[usable].astype(np.int64)
+        self.pair_rows = dict(zip(keys.tolist(), candidates.rows[usable].tolist()))
+
+        self.default_codes = np.full(n_jobs, -1)
+        for job in range(n_jobs):
+            row = candidates.next_best(job)
+            if row >= 0:
+                self.default_codes[job] = model.evaluator_codes[row]
+                candidates.use(model.evaluator_codes[row])
+        self.requested = self.default_codes.copy()
+        self.rows = np.full(n_jobs, -1)
+        self.holder = np.full(n_evaluators, -1)
+        self.waiting = {}
+        self.waiting_on = {}
+        self.total = 0.0
+        # Rounded as the final table shows them, so the running total matches its sum
+        self.total_costs = model.columns['Total Cost'].round(2)
+        for job in range(n_jobs):
+            self._take(job)
+
+    def __len__(self):
+        return len(self.rows)
+
+    def row_for(self, job, code):
+        return self.pair_rows.get((int(job) << 32) | int(code), -1)
+
+    # Ask for an evaluator on a job (-1 leaves the job open). Returns the job
+    # already holding them, or -1 when the job got them (or asked for none).
+    def request(self, job, code):
+        self._unwait(job)
+        self.requested[job] = code
+        self._release(job)
+        return self._take(job)
+
+    # Apply a whole column of requested codes, touching only the jobs that changed
+    def update(self, requested):
+        changed = np.flatnonzero(np.asarray(requested) != self.requested)
+        for job in changed:
+            self.request(job, requested[job])
+        return changed
+
+    def _take(self, job):
+        code = self.requested[job]
+        if code < 0:
+            return -1
+        row = self.row_for(job, code)
+        if row < 0:
+            return -1
+        holder = self.holder[code]
+        if holder >= 0 and holder != job:
+            self.waiting.setdefault(code, []).append(job)
+            self.waiting_on[job] = code
+            return holder
+        self.holder[code] = job
+        self.rows[job] = row
+        self.total += self.total_costs[row]
+        return -1
+
+    def _release(self, job):
+        row = self.rows[job]
+        if row < 0:
+            return
+        code = self.model.evaluator_codes[row]
+        self.rows[job] = -1
+        self.holder[code] = -1
+        self.total -= self.total_costs[row]
+        queue = self.waiting.get(code)
+        if queue:
+            next_job = queue.pop(0)
+            del self.waiting_on[next_job]
+            self._take(next_job)
+
+    def _unwait(self, job):
+        code = self.waiting_on.pop(job, None)
+        if code is not None:
+            self.waiting[code].remove(job)
+
+    # Jobs whose requested evaluator is held by another job: (job, code, holder)
+    def conflicts(self):
+        return sorted((int(job), int(code), int(self.holder[code])) for job, code in self.waiting_on.items())
+
+    # Jobs with no evaluator requested right now: (job, has candidates, has a free
+    # candidate), i.e. whether any available evaluator has mileage for the
+    # customer and whether one of them is not held by another job
+    def open_jobs(self):
+        result = []
+        for job in np.flatnonzero(self.requested < 0):
+            codes = self.model.evaluator_codes[self.job_candidates.candidates(job)]
+            result.append((int(job), len(codes) > 0, bool((self.holder[codes] < 0).any())))
+        return result
+
+    # Jobs asking for an evaluator without available mileage for their customer
+    def unpriced(self):
+        asked = np.flatnonzero(self.requested >= 0)
+        return [job for job in asked if self.row_for(job, self.requested[job]) < 0]
+
+    def assigned_jobs(self):
+        return np.flatnonzero(self.rows >= 0)
+
+    # Cheapest TOP_N available evaluators per job with their total cost, as text
+    def top_text(self, n=TOP_N):
+        names, costs = self.model.evaluator_names, self.total_costs
+        texts = []
+        for job in range(len(self)):
+            rows = self.job_candidates.candidates(job)[:n]
+            texts.append(", ".join(f"{names[self.model.evaluator_codes[r]]} ${costs[r]:,.0f}" for r in rows))
+        return texts
+
+    def codes_for(self, names):
+        codes = pd.Index(self.model.evaluator_names).get_indexer(pd.Series(names, dtype=object).fillna(""))
+        return np.where(codes >= 0, codes, -1)
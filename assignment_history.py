@@ -0,0 +1,201 @@
+import os
+import sqlite3
+from contextlib import closing, contextmanager
+from datetime import date, datetime, timedelta, timezone
+
+import numpy as np
+import pandas as pd
+
+from upload_cache import fingerprint
+
+# Confirmed plans in a local SQLite store (EVALUATOR_HISTORY_DB, default
+# assignment_history.sqlite3), one row per assignment. The indexes cover the
+# history page's queries, which aggregate in SQL so only the summary rows reach
+# pandas, whatever the size of the table:
+#
+#   job number             job lookups
+#   evaluator, job date    workload over a period
+#   customer, evaluator    repeat pairings
+#   job date               cost trends
+#
+# Job dates come from the job file's Job Date column when it has one, otherwise
+# the day the plan was confirmed. Customer names are stored title-cased, as the
+# pages show them. Confirming the same plan twice stores it once.
+
+HISTORY_DB = os.environ.get("EVALUATOR_HISTORY_DB", "assignment_history.sqlite3")
+PERIODS = {'day': "%Y-%m-%d", 'week': "%Y-W%W", 'month': "%Y-%m", 'year': "%Y"}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS plans (
+    plan_id INTEGER PRIMARY KEY,
+    plan_hash TEXT NOT NULL UNIQUE,
+    confirmed_at TEXT NOT NULL,
+    page TEXT,
+    source TEXT,
+    assignments INTEGER NOT NULL,
+    total_cost REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS assignments (
+    assignment_id INTEGER PRIMARY KEY,
+    plan_id INTEGER NOT NULL REFERENCES plans (plan_id) ON DELETE CASCADE,
+    job_date TEXT NOT NULL,
+    job_number TEXT NOT NULL,
+    customer TEXT NOT NULL,
+    evaluator TEXT NOT NULL,
+    round_trip_miles REAL,
+    total_cost REAL,
+    status TEXT,
+    tier TEXT
+);
+CREATE INDEX IF NOT EXISTS assignments_job ON assignments (job_number);
+CREATE INDEX IF NOT EXISTS assignments_evaluator_date ON assignments (evaluator, job_date);
+CREATE INDEX IF NOT EXISTS assignments_customer_evaluator ON assignments (customer, evaluator);
+CREATE INDEX IF NOT EXISTS assignments_date ON assignments (job_date);
+"""
+
+
+@contextmanager
+def connect(path=None):
+    with closing(sqlite3.connect(path or HISTORY_DB, timeout=30)) as conn:
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA foreign_keys=ON")
+        conn.executescript(SCHEMA)
+        with conn:
+            yield conn
+
+
+def _iso_dates(values, default):
+    dates = pd.to_datetime(pd.Series(values, dtype=object), errors='coerce')
+    return dates.dt.strftime("%Y-%m-%d").fillna(default).to_numpy()
+
+
+# Store a final assignment table (the pages' layout: Job number, Customer
+# Company, Evaluator, Round-Trip Miles, Total Cost, Status and optionally
+# Assignment Tier). Returns (plan_id, created).
+def record_plan(final_df, jobs_df=None, page=None, source=None, path=None):
+    today = datetime.now(timezone.utc).date().isoformat()
+    job_numbers = final_df['Job number'].astype(str).to_numpy()
+    if jobs_df is not None and 'Job Date' in jobs_df.columns:
+        first = jobs_df.drop_duplicates(subset=['Job number'])
+        job_dates = pd.Series(first['Job Date'].to_numpy(), index=first['Job number'].astype(str).to_numpy())
+        dates = _iso_dates(job_dates.reindex(job_numbers).to_numpy(), today)
+    else:
+        dates = np.full(len(final_df), today)
+
+    def column(name):
+        if name not in final_df.columns:
+            return np.full(len(final_df), None)
+        return np.array([None if pd.isna(v) else str(v) for v in final_df[name]], dtype=object)
+
+    rows = list(zip(
+        dates, job_numbers, final_df['Customer Company'].astype(str).str.strip().str.title().to_numpy(),
+        final_df['Evaluator'].astype(str).to_numpy(),
+        pd.to_numeric(final_df['Round-Trip Miles'], errors='coerce').astype(float).tolist(),
+        pd.to_numeric(final_df['Total Cost'], errors='coerce').astype(float).tolist(),
+        column('Status'), column('Assignment Tier'),
+    ))
+    plan_hash = fingerprint(repr(sorted(rows)).encode("utf-8"))
+    with connect(path) as conn:
+        existing = conn.execute("SELECT plan_id FROM plans WHERE plan_hash = ?", (plan_hash,)).fetchone()
+        if existing:
+            return existing[0], False
+        cursor = conn.execute(
+            "INSERT INTO plans (plan_hash, confirmed_at, page, source, assignments, total_cost) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (plan_hash, datetime.now(timezone.utc).isoformat(timespec="seconds"), page, source, len(rows),
+             float(np.nansum([r[5] for r in rows])))
+        )
+        plan_id = cursor.lastrowid
+        conn.executemany(
+            "INSERT INTO assignments (plan_id, job_date, job_number, customer, evaluator, round_trip_miles, "
+            "total_cost, status, tier) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            [(plan_id, *[None if isinstance(v, float) and np.isnan(v) else v for v in row]) for row in rows]
+        )
+    return plan_id, True
+
+
+def _period_filter(start, end):
+    clauses, params = [], []
+    if start is not None:
+        clauses.append("job_date >= ?")
+        params.append(str(start))
+    if end is not None:
+        clauses.append("job_date <= ?")
+        params.append(str(end))
+    return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+
+def query(sql, params=(), path=None):
+    with connect(path) as conn:
+        return pd.read_sql_query(sql, conn, params=list(params))
+
+
+# Jobs, miles and cost per evaluator between two dates (inclusive)
+def evaluator_workload(start=None, end=None, path=None):
+    where, params = _period_filter(start, end)
+    return query(
+        "SELECT evaluator AS Evaluator, COUNT(*) AS Assignments, COUNT(DISTINCT job_number) AS Jobs, "
+        "ROUND(SUM(round_trip_miles), 1) AS \"Round-Trip Miles\", ROUND(SUM(total_cost), 2) AS \"Total Cost\", "
+        "MIN(job_date) AS \"First Job\", MAX(job_date) AS \"Last Job\" "
+        f"FROM assignments{where} GROUP BY evaluator ORDER BY Assignments DESC, Evaluator",
+        params, path
+    )
+
+
+# Customer/evaluator pairs confirmed at least min_count times
+def repeat_pairings(min_count=2, start=None, end=None, limit=500, path=None):
+    where, params = _period_filter(start, end)
+    return query(
+        "SELECT customer AS Customer, evaluator AS Evaluator, COUNT(*) AS Times, "
+        "ROUND(AVG(total_cost), 2) AS \"Average Cost\", MAX(job_date) AS \"Last Job\" "
+        f"FROM assignments{where} GROUP BY customer, evaluator HAVING COUNT(*) >= ? "
+        "ORDER BY Times DESC, Customer, Evaluator LIMIT ?",
+        params + [int(min_count), int(limit)], path
+    )
+
+
+# Total and average assignment cost per day, week, month or year
+def cost_trend(period="month", start=None, end=None, path=None):
+    where, params = _period_filter(start, end)
+    return query(
+        f"SELECT strftime('{PERIODS[period]}', job_date) AS Period, COUNT(*) AS Assignments, "
+        "ROUND(SUM(total_cost), 2) AS \"Total Cost\", ROUND(AVG(total_cost), 2) AS \"Average Cost\", "
+        "ROUND(AVG(round_trip_miles), 1) AS \"Average Miles\" "
+        f"FROM assignments{where} GROUP BY Period ORDER BY Period",
+        params, path
+    )
+
+
+def job_history(job_number, path=None):
+    return query(
+        "SELECT a.job_date AS \"Job Date\", a.customer AS Customer, a.evaluator AS Evaluator, "
+        "a.round_trip_miles AS \"Round-Trip Miles\", a.total_cost AS \"Total Cost\", a.tier AS \"Assignment Tier\", "
+        "p.confirmed_at AS Confirmed FROM assignments a JOIN plans p USING (plan_id) "
+        "WHERE a.job_number = ? ORDER BY p.confirmed_at, a.evaluator",
+        [str(job_number)], path
+    )
+
+
+def history_summary(path=None):
+    with connect(path) as conn:
+        plans, assignments, first, last = conn.execute(
+            "SELECT (SELECT COUNT(*) FROM plans), COUNT(*), MIN(job_date), MAX(job_date) FROM assignments"
+        ).fetchone()
+    return {'plans': plans, 'assignments': assignments, 'first': first, 'last': last}
+
+
+# Confirm button for a page's final table
+def render_confirm_button(final_df, jobs_df=None, page=None, source=None, key="confirm_plan"):
+    import streamlit as st
+
+    if st.button("Confirm Plan", key=key, disabled=final_df.empty,
+                 help="Save these assignments to the assignment history"):
+        plan_id, created = record_plan(final_df, jobs_df, page=page, source=source)
+        if created:
+            st.success(f"Saved plan #{plan_id} ({len(final_df)} assignments) to the assignment history.")
+        else:
+            st.info(f"This plan is already in the assignment history (plan #{plan_id}).")
+
+
+def default_period(days=90):
+    return date.today() - timedelta(days=days), date.today()
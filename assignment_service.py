@@ -0,0 +1,346 @@
+import asyncio
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+import evaluator_core as core
+from auction_solver import solve_auction
+from contingency import contingency_table
+from drive_time_frontier import cost_time_frontier
+from engine_comparison import choose_engine
+from mileage_model import shared_mileage_model
+from spatial_index import shared_locator
+
+# Local assignment API over the shared pipeline, so solves run in a bounded
+# worker pool instead of inside the Streamlit server process.
+#
+#   uvicorn assignment_service:app --port 8502
+#
+# POST /match     {"companies": [...], "threshold": 85}
+# POST /optimize  {"jobs": [{"job_number", "customer", "evaluators_needed"}],
+#                  "available_evaluators": [...], "engine": null, "time_limit": null,
+#                  "candidates_k": null,   (k nearest evaluators per customer, see spatial_index.py)
+#                  "unfilled_penalty": null}   (cost per slot left open; null fills every slot)
+#                 engine: mip, auction (large instances, see auction_solver.py), greedy, nearest;
+#                 null picks mip or auction from engine_policy.json by job slot count (mip
+#                 without a policy); greedy and nearest run only when named
+#                 jobs whose customer is not in the mileage matrix come back in "unassigned",
+#                 slots left open are counted in "unfilled_slots"
+# POST /frontier  {"jobs": [...], "available_evaluators": [...], "points": 8, "time_limit": null,
+#                  "candidates_k": null, "unfilled_penalty": null}   (cost vs. drive time, see
+#                  drive_time_frontier.py)
+# POST /contingency {"jobs": [...], "available_evaluators": [...], "assignments": [...],
+#                  "candidates_k": null, "unfilled_penalty": null}   (cost of losing each assigned
+#                  evaluator, see contingency.py)
+# POST /rank      {"customer": "...", "top_n": 5, "by": "Total Cost"}
+# POST /coverage  {"evaluator": "...", "max_rank": 2, "by": "Round-Trip Miles"}
+# GET  /health
+#
+# At most WORKERS requests run at once (the process pool) and QUEUE_SIZE more
+# may wait; beyond that the service answers 503 so callers can back off.
+
+WORKERS = int(os.environ.get("EVALUATOR_SERVICE_WORKERS", "2"))
+QUEUE_SIZE = int(os.environ.get("EVALUATOR_SERVICE_QUEUE", "8"))
+
+
+class ServiceError(Exception):
+    def __init__(self, status, message):
+        super().__init__(status, message)
+        self.status = status
+        self.message = message
+
+
+# Mileage model, loaded once per worker process
+def load_mileage():
+    return shared_mileage_model().frame()
+
+
+def match(payload):
+    mileage_df = load_mileage()
+    companies = [str(c).strip().lower() for c in payload.get('companies', [])]
+    jobs_df = core.match_customers(
+        pd.DataFrame({'Customer Company': companies}), mileage_df['Customer'],
+        threshold=payload.get('threshold', 85)
+    )
+    matches = jobs_df['Matched Customer'].astype(object).where(jobs_df['Matched Customer'].notna(), None)
+    return {'matches': dict(zip(companies, matches))}
+
+
+# Mileage rows for the available evaluators and the payload's jobs as a frame
+def _jobs_frame(payload):
+    mileage_df = load_mileage()
+    available = payload.get('available_evaluators')
+    if available is not None:
+        mileage_df = mileage_df[mileage_df['Evaluator'].isin(available)]
+
+    jobs = payload.get('jobs', [])
+    jobs_df = pd.DataFrame({
+        'Job number': [job['job_number'] for job in jobs],
+        'Matched Customer': core.intern_names([job.get('customer') for job in jobs],
+                                              mileage_df['Customer'].cat.categories),
+        'Evaluators Needed': np.array([int(job.get('evaluators_needed', 1)) for job in jobs], dtype=np.int64),
+    })
+    return mileage_df, jobs_df
+
+
+def optimize(payload):
+    start = time.perf_counter()
+    mileage_df, jobs_df = _jobs_frame(payload)
+    job_slots = core.build_job_slots(jobs_df)
+    unknown = jobs_df['Matched Customer'].isna().to_numpy()
+    unassigned = [{'job_number': job['job_number'], 'customer': job.get('customer'),
+                   'reason': "Customer not in the mileage matrix"}
+                  for job, missing in zip(payload.get('jobs', []), unknown) if missing]
+
+    engine = payload.get('engine') or choose_engine(len(job_slots))
+    variables = constraints = 0
+    bound = None
+    if engine == "mip":
+        cost_matrix = core.build_cost_matrix(mileage_df, job_slots,
+                                             candidates=_candidates(jobs_df, payload))
+        prob, x = core.build_assignment_model(cost_matrix, job_slots, payload.get('unfilled_penalty'))
+        variables, constraints = len(x), len(prob.constraints)
+        assignments, status = core.solve_assignment_model(prob, x, time_limit=payload.get('time_limit'))
+    elif engine == "auction":
+        cost_matrix = core.build_cost_matrix(mileage_df, job_slots,
+                                             candidates=_candidates(jobs_df, payload))
+        assignments, status, stats = solve_auction(cost_matrix, job_slots, time_limit=payload.get('time_limit'),
+                                                   unfilled_penalty=payload.get('unfilled_penalty'))
+        variables = len(cost_matrix)
+        bound = {key: stats.get(key) for key in ['objective', 'lower_bound', 'gap', 'phases']}
+    elif engine == "greedy":
+        assignments, status = core.assign_unique_greedy(jobs_df, mileage_df), "Heuristic"
+    elif engine == "nearest":
+        assignments, status = core.assign_nearest(jobs_df, mileage_df), "Heuristic"
+    else:
+        raise ServiceError(400, f"Unknown engine: {engine}")
+
+    return {
+        'status': status,
+        'engine': engine,
+        'assignments': [{'evaluator': e, 'job_number': j} for e, j in assignments],
+        'unassigned': unassigned,
+        'job_slots': len(job_slots),
+        'unfilled_slots': max(len(job_slots) - len(assignments), 0),
+        'variables': variables,
+        'constraints': constraints,
+        'bound': bound,
+        'seconds': round(time.perf_counter() - start, 6),
+    }
+
+
+# Cost vs. drive time frontier, each point with its plan
+def frontier(payload):
+    mileage_df, jobs_df = _jobs_frame(payload)
+    job_slots = core.build_job_slots(jobs_df)
+    points, stats = cost_time_frontier(mileage_df, job_slots, points=int(payload.get('points', 8)),
+                                       time_limit=payload.get('time_limit'),
+                                       candidates=_candidates(jobs_df, payload),
+                                       unfilled_penalty=payload.get('unfilled_penalty'))
+    records = points.drop(columns=['objective', 'assignments'], errors='ignore').to_dict('records')
+    for record, plan in zip(records, points.get('assignments', [])):
+        record['assignments'] = [{'evaluator': e, 'job_number': j} for e, j in plan]
+    return {'points': records, 'job_slots': len(job_slots), **stats}
+
+
+# N-1 analysis of a plan ("assignments" as /optimize returns them; solved here
+# when missing)
+def contingency(payload):
+    start = time.perf_counter()
+    mileage_df, jobs_df = _jobs_frame(payload)
+    job_slots = core.build_job_slots(jobs_df)
+    cost_matrix = core.build_cost_matrix(mileage_df, job_slots,
+                                         candidates=_candidates(jobs_df, payload))
+    if payload.get('assignments') is None:
+        prob, x = core.build_assignment_model(cost_matrix, job_slots, payload.get('unfilled_penalty'))
+        plan, status = core.solve_assignment_model(prob, x, time_limit=payload.get('time_limit'))
+        if status != "Optimal":
+            raise ServiceError(422, f"No base plan to analyze ({status})")
+    else:
+        plan = [(a['evaluator'], a['job_number']) for a in payload['assignments']]
+    missing = [key for key in plan if key not in cost_matrix]
+    if missing:
+        raise ServiceError(400, f"Plan uses pairs outside the cost matrix: {missing[:5]}")
+    table = contingency_table(cost_matrix, plan, unfilled_penalty=payload.get('unfilled_penalty'))
+    table = table.astype({'Cost Delta': object}).where(table['Cost Delta'].notna(), None)
+    return {'evaluators': table.to_dict('records'), 'seconds': round(time.perf_counter() - start, 6)}
+
+
+# Candidate evaluators per job customer from the spatial index: the k nearest
+# of the payload's available evaluators (None without a k or without location
+# files). Customers without a location, or without an available evaluator in
+# the index, keep every pair.
+def _candidates(jobs_df, payload):
+    k = payload.get('candidates_k')
+    if not k:
+        return None
+    model = shared_mileage_model()
+    locator = shared_locator(model)
+    if locator is None:
+        return None
+    available = payload.get('available_evaluators')
+    mask = None
+    if available is not None:
+        mask = np.zeros(len(model.evaluator_names), dtype=bool)
+        codes = [model.evaluator_code(name) for name in available]
+        mask[[code for code in codes if code is not None]] = True
+    customer_codes = pd.unique(jobs_df['Matched Customer'].cat.codes[jobs_df['Matched Customer'].notna()])
+    nearest = locator.candidates(customer_codes, int(k), available=mask)
+    found = nearest >= 0
+    return nearest[found], np.repeat(customer_codes, found.sum(axis=1))
+
+
+def rank(payload):
+    by = payload.get('by', "Total Cost")
+    if by not in ("Total Cost", "Round-Trip Miles"):
+        raise ServiceError(400, f"Cannot rank by {by}")
+    model = shared_mileage_model()
+    code = model.customer_code(payload.get('customer', ""))
+    if code is None:
+        raise ServiceError(404, f"Unknown customer: {payload.get('customer')}")
+    key = 'cost' if by == "Total Cost" else 'miles'
+    top = model.frame(model.ranking.customer_rows(code, by=key, k=int(payload.get('top_n', 5))))
+    columns = ['Evaluator', 'Round-Trip Miles', 'Drive Time (min)', '2026 Cost', 'Total Cost', 'Status']
+    top = top[[c for c in columns if c in top.columns]].astype({'Evaluator': str, 'Status': str})
+    return {'customer': model.customer_names[code], 'evaluators': top.to_dict('records')}
+
+
+# Customers an evaluator serves with their rank among competing evaluators
+def coverage(payload):
+    by = payload.get('by', "Round-Trip Miles")
+    if by not in ("Total Cost", "Round-Trip Miles"):
+        raise ServiceError(400, f"Cannot rank by {by}")
+    model = shared_mileage_model()
+    code = model.evaluator_code(payload.get('evaluator', ""))
+    if code is None:
+        raise ServiceError(404, f"Unknown evaluator: {payload.get('evaluator')}")
+    key = 'cost' if by == "Total Cost" else 'miles'
+    max_rank = payload.get('max_rank')
+    rows = model.ranking.evaluator_rows(code, by=key, max_rank=None if max_rank is None else int(max_rank))
+    served = model.frame(rows)[['Customer', 'Round-Trip Miles', 'Drive Time (min)', 'Total Cost']]
+    served = served.astype({'Customer': str})
+    served['rank'] = model.ranking.rank[key][rows] + 1
+    served['competitors'] = model.ranking.competitors(model.customer_codes[rows])
+    return {'evaluator': model.evaluator_names[code], 'customers': served.to_dict('records')}
+
+
+ROUTES = {
+    ('POST', '/match'): match,
+    ('POST', '/optimize'): optimize,
+    ('POST', '/frontier'): frontier,
+    ('POST', '/contingency'): contingency,
+    ('POST', '/rank'): rank,
+    ('POST', '/coverage'): coverage,
+}
+
+
+def _json_default(value):
+    if hasattr(value, 'item'):
+        return value.item()
+    return str(value)
+
+
+class AssignmentService:
+    def __init__(self, workers=WORKERS, queue_size=QUEUE_SIZE, executor=None):
+        self.workers = workers
+        self.queue_size = queue_size
+        self.executor = executor
+        self.active = 0
+
+    def _pool(self):
+        if self.executor is None:
+            self.executor = ProcessPoolExecutor(max_workers=self.workers)
+        return self.executor
+
+    def shutdown(self):
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = None
+
+    async def handle(self, method, path, body):
+        if (method, path) == ('GET', '/health'):
+            return 200, {'status': "ok", 'workers': self.workers, 'active': self.active,
+                         'queue_size': self.queue_size}
+        handler = ROUTES.get((method, path))
+        if handler is None:
+            return 404, {'error': f"No route for {method} {path}"}
+        try:
+            payload = json.loads(body or b"{}")
+        except ValueError:
+            return 400, {'error': "Request body is not valid JSON"}
+
+        executor = self._pool()
+        if self.active >= self.workers + self.queue_size:
+            return 503, {'error': "Assignment service is busy, try again shortly"}
+        self.active += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return 200, await loop.run_in_executor(executor, handler, payload)
+        except ServiceError as exc:
+            return exc.status, {'error': exc.message}
+        except Exception as exc:
+            return 500, {'error': f"{type(exc).__name__}: {exc}"}
+        finally:
+            self.active -= 1
+
+    # ASGI entry point
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            while True:
+                message = await receive()
+                if message['type'] == 'lifespan.startup':
+                    await send({'type': 'lifespan.startup.complete'})
+                elif message['type'] == 'lifespan.shutdown':
+                    self.shutdown()
+                    await send({'type': 'lifespan.shutdown.complete'})
+                    return
+        if scope['type'] != 'http':
+            return
+
+        body = b""
+        while True:
+            message = await receive()
+            body += message.get('body', b"")
+            if not message.get('more_body'):
+                break
+
+        status, result = await self.handle(scope['method'], scope['path'], body)
+        content = json.dumps(result, default=_json_default).encode("utf-8")
+        headers = [(b"content-type", b"application/json"), (b"content-length", str(len(content)).encode())]
+        if status == 503:
+            headers.append((b"retry-after", b"1"))
+        await send({'type': 'http.response.start', 'status': status, 'headers': headers})
+        await send({'type': 'http.response.body', 'body': content})
+
+
+app = AssignmentService()
+
+
+# In-process client for the ASGI app (no server or network needed)
+async def _local_request(service, method, path, payload):
+    body = json.dumps(payload or {}).encode("utf-8")
+    sent = []
+    received = False
+
+    async def receive():
+        nonlocal received
+        if received:
+            return {'type': 'http.disconnect'}
+        received = True
+        return {'type': 'http.request', 'body': body, 'more_body': False}
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {'type': 'http', 'method': method, 'path': path, 'headers': [], 'query_string': b""}
+    await service(scope, receive, send)
+    status = sent[0]['status']
+    return status, json.loads(b"".join(m.get('body', b"") for m in sent[1:]) or b"null")
+
+
+def local_request(service, method, path, payload=None):
+    return asyncio.run(_local_request(service, method, path, payload))
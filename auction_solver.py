@@ -0,0 +1,226 @@
+import time
+from collections import Counter
+
+import numpy as np
+import pandas as pd
+
+# Auction solver (Bertsekas) for assignment instances too large for CBC. Job
+# slots bid for evaluators; a bid raises the evaluator's price by the slot's
+# margin over its second-best evaluator plus epsilon, and the highest bid wins.
+#
+#   - costs in integer cents over the candidate pairs only (CSR, one row per
+#     job slot; a job's slots share its pairs)
+#   - every unassigned slot bids in the same round (Jacobi), vectorized
+#   - epsilon-scaling: the first, coarse phase gives a feasible plan quickly;
+#     each later phase divides epsilon by SCALING, ending below 1 / slots
+#   - there are more evaluators than slots, so after each phase a reverse pass
+#     lowers the price of every evaluator left without a job to the lowest
+#     price of an assigned one (re-assigning a slot where that pays); the plan
+#     is then within slots x epsilon cents of optimal, and the last phase is
+#     exact
+#
+# Every phase reports the plan's cost and a lower bound from the prices (LP
+# duality), so the gap to optimal is known whenever the solver is stopped.
+# Without unfilled_penalty every slot must be filled, as in the MIP; with it,
+# each slot may instead stay open at that cost.
+
+SCALING = 5
+
+
+# Slot rows over evaluator columns: CSR arrays of evaluator codes and costs
+# in cents, plus the evaluator names and each slot's job number
+def auction_arrays(cost_matrix, job_slots, unfilled_penalty=None):
+    slot_counts = Counter(job for job, _ in job_slots)
+    jobs = pd.Index(list(slot_counts))
+    keys = list(cost_matrix)
+    evaluator_idx, evaluators = pd.factorize(pd.Series([e for e, _ in keys], dtype=object))
+    pair_job = jobs.get_indexer(pd.Series([j for _, j in keys], dtype=object))
+    cents = np.rint(np.fromiter(cost_matrix.values(), dtype=float, count=len(keys)) * 100).astype(np.int64)
+    keep = pair_job >= 0
+    order = np.argsort(pair_job[keep], kind="stable")
+    pair_job, pair_evaluator, pair_cents = pair_job[keep][order], evaluator_idx[keep][order], cents[keep][order]
+    job_offsets = np.concatenate([[0], np.cumsum(np.bincount(pair_job, minlength=len(jobs)))])
+
+    slot_job = np.repeat(np.arange(len(jobs)), [slot_counts[j] for j in jobs])
+    lengths = np.diff(job_offsets)[slot_job]
+    offsets = np.concatenate([[0], np.cumsum(lengths)]).astype(np.int64)
+    positions = np.repeat(job_offsets[slot_job] - offsets[:-1], lengths) + np.arange(offsets[-1])
+    columns, costs = pair_evaluator[positions], pair_cents[positions]
+
+    n_objects = len(evaluators)
+    if unfilled_penalty is not None:
+        # One private "unfilled" column per slot, after the evaluators
+        n_slots = len(slot_job)
+        new_offsets = offsets + np.arange(n_slots + 1)
+        filled = np.ones(new_offsets[-1], dtype=bool)
+        filled[new_offsets[1:] - 1] = False
+        new_columns = np.empty(new_offsets[-1], dtype=np.int64)
+        new_costs = np.empty(new_offsets[-1], dtype=np.int64)
+        new_columns[filled], new_costs[filled] = columns, costs
+        new_columns[~filled] = n_objects + np.arange(n_slots)
+        new_costs[~filled] = int(round(unfilled_penalty * 100))
+        offsets, columns, costs = new_offsets, new_columns, new_costs
+        n_objects += n_slots
+    return {'offsets': offsets, 'columns': columns, 'costs': costs, 'n_objects': n_objects,
+            'evaluators': evaluators, 'slot_jobs': jobs.to_numpy()[slot_job]}
+
+
+def _rows(offsets, rows):
+    lengths = offsets[rows + 1] - offsets[rows]
+    starts = np.concatenate([[0], np.cumsum(lengths)[:-1]]).astype(np.int64)
+    positions = np.repeat(offsets[rows] - starts, lengths) + np.arange(lengths.sum())
+    return positions, starts, lengths
+
+
+# One forward phase: bid until every slot holds an evaluator. False if the
+# deadline passed first.
+def _forward(arrays, prices, eps, spread, assigned, position, owner, deadline):
+    offsets, columns, benefit = arrays['offsets'], arrays['columns'], -arrays['costs'].astype(float)
+    bidders = np.flatnonzero(assigned < 0)
+    iterations = 0
+    while len(bidders):
+        if deadline is not None and time.perf_counter() > deadline:
+            return False, iterations
+        iterations += 1
+        positions, starts, lengths = _rows(offsets, bidders)
+        values = benefit[positions] - prices[columns[positions]]
+        best = np.maximum.reduceat(values, starts)
+        index = np.arange(len(values))
+        first = np.minimum.reduceat(np.where(values == np.repeat(best, lengths), index, len(values)), starts)
+        values[first] = -np.inf
+        second = np.where(lengths > 1, np.maximum.reduceat(values, starts), best - spread)
+        targets = columns[positions[first]]
+        bids = prices[targets] + best - second + eps
+
+        # Highest bid per evaluator wins; its previous slot bids again
+        order = np.lexsort((-bids, targets))
+        won = order[np.r_[True, targets[order][1:] != targets[order][:-1]]]
+        winners, objects = bidders[won], targets[won]
+        previous = owner[objects]
+        previous = previous[previous >= 0]
+        assigned[previous] = -1
+        owner[objects] = winners
+        assigned[winners] = objects
+        position[winners] = positions[first[won]]
+        prices[objects] = bids[won]
+        lost = np.ones(len(bidders), dtype=bool)
+        lost[won] = False
+        bidders = np.concatenate([bidders[lost], previous])
+    return True, iterations
+
+
+# Reverse pass: evaluators without a slot priced above the lowest assigned
+# price either win a slot from its evaluator or drop to that price
+def _reverse(arrays, reverse, prices, eps, assigned, position, owner):
+    benefit = -arrays['costs'].astype(float)
+    reverse_offsets, reverse_positions, position_slot = reverse
+    floor = prices[owner >= 0].min()
+    queue = list(np.flatnonzero((owner < 0) & (prices > floor)))
+    while queue:
+        obj = queue.pop()
+        positions = reverse_positions[reverse_offsets[obj]:reverse_offsets[obj + 1]]
+        if not len(positions):
+            prices[obj] = floor
+            continue
+        slots = position_slot[positions]
+        profits = benefit[position[slots]] - prices[assigned[slots]]
+        values = benefit[positions] - profits
+        k = int(values.argmax())
+        beta = values[k]
+        if floor >= beta - eps:
+            prices[obj] = floor
+            continue
+        values[k] = -np.inf
+        omega = values.max() if len(values) > 1 else -np.inf
+        prices[obj] = max(floor, omega - eps)
+        slot = slots[k]
+        old = assigned[slot]
+        owner[old] = -1
+        owner[obj] = slot
+        assigned[slot] = obj
+        position[slot] = positions[k]
+        if prices[old] > floor:
+            queue.append(old)
+    return floor
+
+
+# Plan cost and the dual lower bound from the prices, in cents
+def _bounds(arrays, prices, floor, position):
+    offsets, columns, costs = arrays['offsets'], arrays['columns'], arrays['costs']
+    shifted = np.maximum(prices - floor, 0.0)
+    reduced = np.minimum.reduceat(costs + shifted[columns], offsets[:-1])
+    return int(costs[position].sum()), float(reduced.sum() - shifted.sum())
+
+
+# Phases of the auction, one snapshot each: epsilon, the plan (evaluator code
+# per slot), its cost and lower bound in dollars
+def auction_phases(arrays, time_limit=None, scaling=SCALING):
+    offsets, columns, costs = arrays['offsets'], arrays['columns'], arrays['costs']
+    n_slots, n_objects = len(offsets) - 1, arrays['n_objects']
+    deadline = None if time_limit is None else time.perf_counter() + time_limit
+    spread = float(costs.max() - costs.min() + 1) if len(costs) else 1.0
+
+    reverse_order = np.argsort(columns, kind="stable")
+    reverse = (np.concatenate([[0], np.cumsum(np.bincount(columns, minlength=n_objects))]),
+               reverse_order, np.repeat(np.arange(n_slots), np.diff(offsets)))
+    prices = np.zeros(n_objects)
+    final_eps = 1.0 / (n_slots + 1)
+    eps, phase, start = max(spread / 2, final_eps), 0, time.perf_counter()
+    while True:
+        phase += 1
+        assigned = np.full(n_slots, -1)
+        position = np.full(n_slots, -1)
+        owner = np.full(n_objects, -1)
+        done, iterations = _forward(arrays, prices, eps, spread, assigned, position, owner, deadline)
+        if not done:
+            return
+        floor = _reverse(arrays, reverse, prices, eps, assigned, position, owner)
+        cost, bound = _bounds(arrays, prices, floor, position)
+        yield {'phase': phase, 'epsilon': eps / 100, 'iterations': iterations, 'assigned': assigned.copy(),
+               'objective': cost / 100, 'lower_bound': bound / 100, 'gap': (cost - bound) / 100,
+               'seconds': time.perf_counter() - start}
+        # Integer cents: a gap under one cent proves the plan optimal
+        if cost - bound < 1 - 1e-6 or eps <= final_eps:
+            return
+        eps = max(eps / scaling, final_eps)
+
+
+def _feasible(arrays):
+    from scipy.sparse import csr_matrix
+    from scipy.sparse.csgraph import maximum_bipartite_matching
+
+    offsets, columns = arrays['offsets'], arrays['columns']
+    n_slots = len(offsets) - 1
+    if not n_slots:
+        return True
+    graph = csr_matrix((np.ones(len(columns)), columns, offsets), shape=(n_slots, arrays['n_objects']))
+    return bool((maximum_bipartite_matching(graph, perm_type='column') >= 0).all())
+
+
+# Solve like evaluator_core.solve_assignment_model: the chosen (evaluator, job
+# number) pairs and a status ("Optimal", "Feasible" when time_limit stopped it
+# with a gap, "Infeasible", "Not Solved"), plus the last phase's stats
+def solve_auction(cost_matrix, job_slots, time_limit=None, unfilled_penalty=None, scaling=SCALING):
+    start = time.perf_counter()
+    arrays = auction_arrays(cost_matrix, job_slots, unfilled_penalty)
+    stats = {'slots': len(arrays['slot_jobs']), 'pairs': len(arrays['columns']), 'phases': 0}
+    if not len(arrays['slot_jobs']):
+        return [], "Optimal", stats
+    if unfilled_penalty is None and not _feasible(arrays):
+        return [], "Infeasible", stats
+    last = None
+    for last in auction_phases(arrays, time_limit, scaling):
+        pass
+    stats['seconds'] = round(time.perf_counter() - start, 4)
+    if last is None:
+        return [], "Not Solved", stats
+    stats.update({
+        'phases': last['phase'], 'epsilon': last['epsilon'], 'iterations': last['iterations'],
+        'objective': round(last['objective'], 2), 'lower_bound': round(last['lower_bound'], 4),
+        'gap': round(max(last['gap'], 0.0), 4),
+    })
+    evaluators = arrays['evaluators']
+    filled = last['assigned'] < len(evaluators)
+    stats['unfilled'] = int((~filled).sum())
+    assignments = list(zip(evaluators[last['assigned'][filled]].tolist(), arrays['slot_jobs'][filled].tolist()))
+    return assignments, "Optimal" if last['gap'] < 0.01 - 1e-9 else "Feasible", stats
@@ -0,0 +1,144 @@
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+import evaluator_core as core
+from synthetic_data import write_dataset
+
+# Times each pipeline stage on seeded synthetic data across a size sweep and
+# appends one JSON record per run for regression tracking.
+#
+#   python benchmark.py --sizes 36x143x15 100x1000x40 100x10000x2000 --repeat 3
+#
+# Sizes are EVALUATORSxCUSTOMERSxJOBS. Every evaluator takes at most one job
+# slot, so a size with more job slots than evaluators cannot fill them all.
+# Slots are allowed to stay open at UNFILLED_PENALTY each (the same form the
+# engine comparison uses), so every size still times a real solve; the open
+# slots are logged as 'unfilled_slots'.
+
+DEFAULT_SIZES = ["36x143x15", "100x1000x40", "100x10000x2000"]
+DEFAULT_OUTPUT = "benchmark_results.jsonl"
+UNFILLED_PENALTY = core.UNFILLED_PENALTY
+
+
+def parse_size(text):
+    n_evaluators, n_customers, n_jobs = (int(part) for part in text.lower().split("x"))
+    return n_evaluators, n_customers, n_jobs
+
+
+# Revision of the checkout this file is in, wherever the benchmark is run from
+def git_revision():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+class StageClock:
+    def __init__(self):
+        self.seconds = {}
+
+    def run(self, stage, func, *args, **kwargs):
+        start = time.perf_counter()
+        result = func(*args, **kwargs)
+        self.seconds[stage] = round(time.perf_counter() - start, 6)
+        return result
+
+
+# Run every stage once on the files in paths
+def run_pipeline(paths, solve=True, time_limit=None, unfilled_penalty=UNFILLED_PENALTY):
+    clock = StageClock()
+    mileage_df = clock.run("csv_parse", core.read_mileage, paths['mileage'])
+    full_time_names = clock.run("roster_parse", core.read_full_time_names, paths['roster'])
+    mileage_df = clock.run("enrichment", core.enrich_mileage, mileage_df, full_time_names)
+    jobs_df = clock.run("job_parse", core.read_jobs, paths['jobs'])
+    jobs_df = clock.run("fuzzy_match", core.match_customers, jobs_df, mileage_df['Customer'].unique())
+    job_slots = clock.run("job_slots", core.build_job_slots, jobs_df)
+    cost_matrix = clock.run("cost_matrix", core.build_cost_matrix, mileage_df, job_slots)
+    prob, x = clock.run("model_build", core.build_assignment_model, cost_matrix, job_slots,
+                        unfilled_penalty)
+
+    status = "Skipped"
+    assignments = []
+    if solve:
+        assignments, status = clock.run("solve", core.solve_assignment_model, prob, x, time_limit)
+    final_df = clock.run("output", core.build_assignment_output, assignments, jobs_df, mileage_df)
+
+    counts = {
+        'mileage_rows': len(mileage_df),
+        'job_rows': len(jobs_df),
+        'unmatched_jobs': int(jobs_df['Matched Customer'].isna().sum()),
+        'job_slots': len(job_slots),
+        'variables': len(x),
+        'constraints': len(prob.constraints),
+        'assigned': len(final_df),
+        'unfilled_slots': len(job_slots) - len(assignments) if solve else None,
+    }
+    return clock.seconds, counts, status
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the evaluator assignment pipeline.")
+    parser.add_argument("--sizes", nargs="+", default=DEFAULT_SIZES, help="EVALUATORSxCUSTOMERSxJOBS")
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--density", type=float, default=1.0, help="share of evaluator/customer pairs present")
+    parser.add_argument("--no-solve", action="store_true", help="skip the CBC solve stage")
+    parser.add_argument("--time-limit", type=float, default=None, help="CBC time limit in seconds")
+    parser.add_argument("--unfilled-penalty", type=float, default=UNFILLED_PENALTY,
+                        help="cost of leaving a job slot open")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT, help="JSONL file to append results to")
+    args = parser.parse_args(argv)
+
+    revision = git_revision()
+    failed = []
+    with tempfile.TemporaryDirectory() as tmp, open(args.output, "a") as out:
+        for size in args.sizes:
+            n_evaluators, n_customers, n_jobs = parse_size(size)
+            paths = write_dataset(os.path.join(tmp, size), n_evaluators, n_customers, n_jobs,
+                                  density=args.density, seed=args.seed)
+            for repeat in range(args.repeat):
+                seconds, counts, status = run_pipeline(paths, solve=not args.no_solve,
+                                                       time_limit=args.time_limit,
+                                                       unfilled_penalty=args.unfilled_penalty)
+                if status not in ("Optimal", "Skipped"):
+                    print(f"{size} #{repeat} [{status}] no plan; not logged", file=sys.stderr)
+                    failed.append(size)
+                    break
+                record = {
+                    'timestamp': datetime.now(timezone.utc).isoformat(timespec="seconds"),
+                    'git_revision': revision,
+                    'python': platform.python_version(),
+                    'size': size,
+                    'evaluators': n_evaluators,
+                    'customers': n_customers,
+                    'jobs': n_jobs,
+                    'density': args.density,
+                    'seed': args.seed,
+                    'repeat': repeat,
+                    'status': status,
+                    'stages': seconds,
+                    'total_seconds': round(sum(seconds.values()), 6),
+                    **counts,
+                }
+                out.write(json.dumps(record) + "\n")
+                out.flush()
+                stages = "  ".join(f"{k}={v:.3f}s" for k, v in seconds.items())
+                print(f"{size} #{repeat} [{status}] {stages}  unfilled_slots={counts['unfilled_slots']}")
+
+    if failed:
+        print(f"No plan for: {', '.join(failed)}", file=sys.stderr)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
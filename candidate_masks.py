@@ -0,0 +1,69 @@
+import numpy as np
+import pandas as pd
+
+# Availability and "already used" state as boolean masks over evaluator codes
+# (the shared mileage model's codes), so filtering candidates is one vectorized
+# lookup instead of isin / set membership per row.
+#
+# JobCandidates ranks each job's evaluators once (a slice of the ranking index)
+# and keeps a cursor per job. Used evaluators only ever get added during a pass,
+# so the cursor only moves forward: the next best available evaluator for a job
+# is found without rescanning its list.
+
+
+# Mask over evaluator codes with the named evaluators set
+def evaluator_mask(model, names):
+    mask = np.zeros(len(model.evaluator_names), dtype=bool)
+    codes = pd.Index(model.evaluator_names).get_indexer(list(names))
+    mask[codes[codes >= 0]] = True
+    return mask
+
+
+class JobCandidates:
+    # customer_codes: one per job (-1 for unmatched jobs, which get no candidates)
+    def __init__(self, model, customer_codes, by="cost", available=None):
+        self.model = model
+        customer_codes = np.asarray(customer_codes)
+        blocks = [model.ranking.customer_rows(code, by) if code >= 0 else np.empty(0, np.int64)
+                  for code in customer_codes]
+        self.offsets = np.concatenate([[0], np.cumsum([len(b) for b in blocks])]).astype(np.int64)
+        self.rows = np.concatenate(blocks or [np.empty(0, np.int64)]).astype(np.int64)
+        self.codes = model.evaluator_codes[self.rows]
+        self.available = np.ones(len(model.evaluator_names), dtype=bool) if available is None else available
+        self.used = np.zeros(len(model.evaluator_names), dtype=bool)
+        self.cursor = self.offsets[:-1].copy()
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def selectable(self):
+        return self.available & ~self.used
+
+    # Mileage rows for a job, best first: available ones, or only those not used yet
+    def candidates(self, job, unused=False):
+        start, stop = self.offsets[job], self.offsets[job + 1]
+        mask = self.selectable() if unused else self.available
+        return self.rows[start:stop][mask[self.codes[start:stop]]]
+
+    # Row of the best available evaluator not used yet (-1 when none is left)
+    def next_best(self, job):
+        mask = self.selectable()
+        position, stop = self.cursor[job], self.offsets[job + 1]
+        while position < stop and not mask[self.codes[position]]:
+            position += 1
+        self.cursor[job] = position
+        return self.rows[position] if position < stop else -1
+
+    # Best n unused rows for a job, marking their evaluators used
+    def take(self, job, n):
+        taken = []
+        while len(taken) < n:
+            row = self.next_best(job)
+            if row < 0:
+                break
+            self.use(self.model.evaluator_codes[row])
+            taken.append(row)
+        return np.asarray(taken, dtype=np.int64)
+
+    def use(self, code):
+        self.used[code] = True
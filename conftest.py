@@ -0,0 +1,22 @@
+import pandas as pd
+import pytest
+
+from mileage_model import MileageModel
+
+# A hand-sized mileage model for unit tests: three evaluators, two customers,
+# Carter has no mileage for Yates Co
+SMALL_ROWS = [
+    # Evaluator, Customer, Round-Trip Miles, Total Cost
+    ("Adams", "Xavier Inc", 10.0, 10.0),
+    ("Baker", "Xavier Inc", 20.0, 20.0),
+    ("Carter", "Xavier Inc", 30.0, 30.0),
+    ("Adams", "Yates Co", 5.0, 5.0),
+    ("Baker", "Yates Co", 50.0, 50.0),
+]
+
+
+@pytest.fixture
+def small_model():
+    frame = pd.DataFrame(SMALL_ROWS, columns=['Evaluator', 'Customer', 'Round-Trip Miles', 'Total Cost'])
+    frame['Status'] = "Contract"
+    return MileageModel.from_frame(frame)
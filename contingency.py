@@ -0,0 +1,175 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+import evaluator_core as core
+
+# N-1 contingency analysis for an optimized plan: for every assigned evaluator,
+# the cheapest plan without them and what it costs on top of the base plan.
+#
+# The assignment is a min-cost flow (job slots <- evaluators), so the base plan
+# minus one evaluator is repaired by a single shortest augmenting path in the
+# residual graph, starting at the job that lost its evaluator:
+#
+#   job -> evaluator   +cost   pair not in the plan
+#   evaluator -> job   -cost   pair in the plan (that evaluator moves away)
+#
+# ending at an evaluator with no job or, with an unfilled_penalty (the plan was
+# solved allowing open slots), at any job left open for that penalty. The base
+# plan is optimal, so the residual graph has no negative cycles and Bellman-Ford
+# (vectorized over the dense evaluators x jobs cost array) finds the path; the
+# repaired plan is optimal.
+# One path per evaluator instead of a full re-solve, spread over a process pool
+# (EVALUATOR_CONTINGENCY_WORKERS, default one per CPU) for large plans.
+
+WORKERS = int(os.environ.get("EVALUATOR_CONTINGENCY_WORKERS", "0")) or os.cpu_count() or 1
+PARALLEL_MIN = 64
+
+
+# Dense cost arrays over evaluator and job indices plus each evaluator's job in
+# the plan (-1 when unassigned)
+def plan_arrays(cost_matrix, plan, last_resort_managers=core.LAST_RESORT_MANAGERS,
+                manager_penalty=core.MANAGER_PENALTY):
+    keys = list(cost_matrix)
+    evaluator_idx, evaluators = pd.factorize(pd.Series([e for e, _ in keys], dtype=object))
+    job_idx, jobs = pd.factorize(pd.Series([j for _, j in keys], dtype=object))
+    cost = np.full((len(evaluators), len(jobs)), np.inf)
+    cost[evaluator_idx, job_idx] = list(cost_matrix.values())
+    managers = np.asarray(evaluators.isin(last_resort_managers))
+    spend = cost - np.where(managers, manager_penalty, 0)[:, None]
+
+    assigned_job = np.full(len(evaluators), -1)
+    assigned_job[evaluators.get_indexer([e for e, _ in plan])] = jobs.get_indexer([j for _, j in plan])
+    return {'evaluators': evaluators, 'jobs': jobs, 'cost': cost, 'spend': spend,
+            'managers': managers, 'assigned_job': assigned_job}
+
+
+# Moves that refill the slot removed evaluator held: [(evaluator, from job, to
+# job)] with from job -1 for an evaluator that had no job, or None if no
+# available evaluator can take it. With unfilled_penalty, the first move may
+# come from a job that is then left open ([] leaves the removed slot open).
+def replacement_path(cost, assigned_job, removed, unfilled_penalty=None):
+    n_evaluators, n_jobs = cost.shape
+    source = assigned_job[removed]
+    assigned_job = assigned_job.copy()
+    assigned_job[removed] = -1
+    forward = cost.copy()
+    forward[removed] = np.inf
+    moving = np.flatnonzero(assigned_job >= 0)
+    forward[moving, assigned_job[moving]] = np.inf
+    backward = -cost[moving, assigned_job[moving]]
+
+    dist_job = np.full(n_jobs, np.inf)
+    dist_job[source] = 0.0
+    came_from = np.full(n_jobs, -1)
+    dist_evaluator = np.full(n_evaluators, np.inf)
+    via_job = np.full(n_evaluators, -1)
+    # Labels only change on strict improvement, so the predecessors stay a tree
+    for _ in range(n_jobs + 1):
+        reach = dist_job[None, :] + forward
+        best_job = reach.argmin(axis=1)
+        shorter = reach[np.arange(n_evaluators), best_job] < dist_evaluator - 1e-9
+        dist_evaluator[shorter] = reach[shorter, best_job[shorter]]
+        via_job[shorter] = best_job[shorter]
+        if not len(moving):
+            break
+        # Best evaluator moving out of each job this round
+        candidate = dist_evaluator[moving] + backward
+        order = np.lexsort((candidate, assigned_job[moving]))
+        first = np.r_[True, np.diff(assigned_job[moving][order]) != 0]
+        best = order[first]
+        targets = assigned_job[moving][best]
+        improved = candidate[best] < dist_job[targets] - 1e-9
+        if not improved.any():
+            break
+        dist_job[targets[improved]] = candidate[best][improved]
+        came_from[targets[improved]] = moving[best][improved]
+
+    free = (assigned_job < 0) & np.isfinite(dist_evaluator)
+    free[removed] = False
+    best = dist_evaluator[free].min() if free.any() else np.inf
+    if unfilled_penalty is not None and dist_job.min() + unfilled_penalty < best - 1e-9:
+        job = int(dist_job.argmin())
+        if job == source:
+            return []
+        evaluator = int(came_from[job])
+    elif free.any():
+        evaluator = int(np.flatnonzero(free)[dist_evaluator[free].argmin()])
+    else:
+        return None
+    moves = []
+    for _ in range(n_jobs + 1):
+        job = int(via_job[evaluator])
+        moves.append((evaluator, int(assigned_job[evaluator]), job))
+        if job == source:
+            return moves
+        evaluator = int(came_from[job])
+    raise ValueError("Base plan is not optimal (negative cycle in the residual graph)")
+
+
+def _left_open(moves):
+    return not moves or moves[0][1] >= 0
+
+
+def _analyze(arrays, removed_codes, unfilled_penalty=None):
+    cost, spend, assigned_job = arrays['cost'], arrays['spend'], arrays['assigned_job']
+    results = []
+    for removed in removed_codes:
+        moves = replacement_path(cost, assigned_job, removed, unfilled_penalty)
+        source = assigned_job[removed]
+        if moves is None:
+            results.append((removed, None, None, 0, 0))
+            continue
+        added = sum(spend[e, to] for e, _, to in moves) - sum(spend[e, frm] for e, frm, _ in moves if frm >= 0)
+        if _left_open(moves):
+            added += unfilled_penalty
+        new_managers = sum(1 for e, frm, _ in moves if frm < 0 and arrays['managers'][e])
+        results.append((removed, moves, added - spend[removed, source],
+                        new_managers - int(arrays['managers'][removed]), len(moves)))
+    return results
+
+
+# One row per assigned evaluator, worst first: the cost of the repaired plan
+# minus the base plan (manager penalty left out, unfilled_penalty included for
+# a slot left open), last-resort managers brought in, and the moves that refill
+# the slot
+def contingency_table(cost_matrix, plan, workers=WORKERS, unfilled_penalty=None,
+                      last_resort_managers=core.LAST_RESORT_MANAGERS, manager_penalty=core.MANAGER_PENALTY):
+    arrays = plan_arrays(cost_matrix, plan, last_resort_managers, manager_penalty)
+    removed_codes = np.flatnonzero(arrays['assigned_job'] >= 0)
+    if workers <= 1 or len(removed_codes) < PARALLEL_MIN:
+        results = _analyze(arrays, removed_codes, unfilled_penalty)
+    else:
+        chunks = np.array_split(removed_codes, workers)
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = [r for part in pool.map(_analyze, [arrays] * len(chunks), chunks,
+                                              [unfilled_penalty] * len(chunks)) for r in part]
+
+    evaluators, jobs = arrays['evaluators'], arrays['jobs']
+
+    def describe(moves, source):
+        steps = [f"{evaluators[e]}: {'unassigned' if frm < 0 else f'job {jobs[frm]}'} -> job {jobs[to]}"
+                 for e, frm, to in reversed(moves)]
+        if _left_open(moves):
+            steps.append(f"job {jobs[moves[0][1] if moves else source]} left unfilled")
+        return "; ".join(steps)
+
+    rows = []
+    for removed, moves, delta, managers, changed in results:
+        rows.append({
+            'Evaluator': evaluators[removed],
+            'Job number': jobs[arrays['assigned_job'][removed]],
+            'Cost Delta': np.nan if moves is None else round(float(delta), 2),
+            'Last Resort Added': managers,
+            'Reassigned': changed,
+            'Replacement': evaluators[moves[-1][0]] if moves else "",
+            'Moves': "No available evaluator can cover this job" if moves is None
+                     else describe(moves, arrays['assigned_job'][removed]),
+        })
+    table = pd.DataFrame(rows, columns=['Evaluator', 'Job number', 'Cost Delta', 'Last Resort Added',
+                                        'Reassigned', 'Replacement', 'Moves'])
+    table['Uncoverable'] = table['Cost Delta'].isna()
+    return table.sort_values(['Uncoverable', 'Last Resort Added', 'Cost Delta'],
+                             ascending=False).reset_index(drop=True)
@@ -0,0 +1,69 @@
+import math
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+# Server-side paged and sorted table for the viewer pages. Sorting and paging
+# happen here, so only the visible page is styled and sent to the browser.
+# Numbers stay numeric (formats are display-only, the CSV download keeps raw
+# values) and the "closest per customer" mask is computed once for the frame.
+
+PAGE_SIZES = [25, 50, 100, 250]
+HIGHLIGHT = 'background-color: lightgreen'
+RANKED = "(ranked)"
+
+
+# True on the row with the lowest value per group (one vectorized groupby/idxmin)
+def closest_mask(df, group_col='Customer', value_col='Round-Trip Miles'):
+    mask = pd.Series(False, index=df.index)
+    values = df[value_col].dropna()
+    if not values.empty:
+        closest = values.groupby(df.loc[values.index, group_col], observed=True).idxmin()
+        mask.loc[closest.to_numpy()] = True
+    return mask
+
+
+# Row labels in display order; RANKED keeps the frame's own order. Categorical
+# columns (Evaluator, Customer) sort by name, not by category (first-seen) order.
+def sorted_index(df, column, ascending=True):
+    if column == RANKED:
+        return df.index
+    values = df[column]
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        names = values.cat.categories.astype(str).str.lower().to_numpy()
+        rank = np.empty(len(names))
+        rank[np.argsort(names, kind='stable')] = np.arange(len(names))
+        codes = values.cat.codes.to_numpy()
+        values = pd.Series(np.where(codes >= 0, rank[codes], np.nan), index=df.index)
+    return values.sort_values(ascending=ascending, kind='stable', na_position='last').index
+
+
+def paged_grid(df, key, formats=None, highlight=None, page_size=50):
+    sort_col, order_col, size_col, page_col = st.columns(4)
+    sort_by = sort_col.selectbox("Sort by", [RANKED] + list(df.columns), key=f"{key}_sort")
+    ascending = order_col.radio("Order", ["Ascending", "Descending"], horizontal=True,
+                                key=f"{key}_order") == "Ascending"
+    page_size = size_col.selectbox("Rows per page", PAGE_SIZES, index=PAGE_SIZES.index(page_size),
+                                   key=f"{key}_size")
+    n_pages = max(1, math.ceil(len(df) / page_size))
+    page = min(int(page_col.number_input("Page", min_value=1, value=1, step=1, key=f"{key}_page")), n_pages)
+
+    start = (page - 1) * page_size
+    labels = sorted_index(df, sort_by, ascending)[start:start + page_size]
+    page_df = df.loc[labels]
+
+    styler = page_df.style.format(formats or {}, na_rep="")
+    if highlight is not None:
+        flags = highlight.loc[labels].to_numpy()
+
+        def highlight_rows(frame):
+            colors = np.where(flags[:, None], HIGHLIGHT, '')
+            return pd.DataFrame(np.broadcast_to(colors, frame.shape), index=frame.index, columns=frame.columns)
+
+        styler = styler.apply(highlight_rows, axis=None)
+
+    st.dataframe(styler, use_container_width=True, hide_index=True)
+    st.caption(f"Rows {start + 1 if len(page_df) else 0}-{start + len(page_df)} of {len(df)} "
+               f"(page {page} of {n_pages})")
+    return page_df
@@ -0,0 +1,180 @@
+import argparse
+import os
+
+import numpy as np
+import pandas as pd
+
+import evaluator_core as core
+import mileage_delta
+from mileage_model import shared_mileage_model
+
+# Offline estimates for evaluator/customer pairs missing from the mileage CSV,
+# so every pair can be assigned without calling a routing service:
+#
+#   straight-line miles  haversine between ZIP centroids
+#   one-way road miles   straight-line miles x detour factor
+#   drive time           linear in round-trip miles
+#
+# The detour factor and drive-time line are fitted on the pairs the mileage CSV
+# already has. Evaluator ZIPs come from Evaluators_FullTime.csv plus, for
+# contractors, Evaluator_Locations.csv (Evaluator,Street,City,State,Zip);
+# customer ZIPs from Customer_Locations.csv (Customer,Street,City,State,Zip) and
+# centroids
+# from a local ZIP table: Zip,Latitude,Longitude or the Census ZCTA gazetteer
+# layout (GEOID,INTPTLAT,INTPTLONG).
+#
+#   python distance_engine.py fill    -> mileage_deltas/estimated_pairs.csv
+#
+# The output is a mileage delta with Estimated=true, merged like any other delta.
+
+ZIP_CENTROIDS_FILE = "Zip_Centroids.csv"
+CUSTOMER_LOCATIONS_FILE = "Customer_Locations.csv"
+EVALUATOR_LOCATIONS_FILE = "Evaluator_Locations.csv"
+EARTH_RADIUS_MILES = 3958.8
+
+
+def haversine_miles(lat1, lon1, lat2, lon2):
+    lat1, lon1, lat2, lon2 = map(np.radians, (lat1, lon1, lat2, lon2))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return EARTH_RADIUS_MILES * 2 * np.arcsin(np.sqrt(a))
+
+
+# 5-digit ZIP strings (Excel drops leading zeros, ZIP+4 keeps the first five)
+def normalize_zip(values):
+    digits = pd.Series(values, dtype=object).astype(str).str.extract(r"(\d+)", expand=False)
+    return digits.str.zfill(5).str[:5]
+
+
+def read_zip_centroids(path=ZIP_CENTROIDS_FILE):
+    centroids = pd.read_csv(path, sep=None, engine="python", dtype=str)
+    centroids.columns = centroids.columns.str.strip()
+    layouts = [('Zip', 'Latitude', 'Longitude'), ('GEOID', 'INTPTLAT', 'INTPTLONG')]
+    zip_col, lat_col, lon_col = next((l for l in layouts if set(l) <= set(centroids.columns)), layouts[0])
+    centroids = pd.DataFrame({
+        'Latitude': pd.to_numeric(centroids[lat_col], errors='coerce').to_numpy(),
+        'Longitude': pd.to_numeric(centroids[lon_col], errors='coerce').to_numpy(),
+    }, index=normalize_zip(centroids[zip_col]).to_numpy()).dropna()
+    # One centroid per ZIP (tables that list a ZIP per county or city repeat it)
+    return centroids[~centroids.index.duplicated()]
+
+
+# Name -> ZIP for one side of the matrix
+def read_locations(path, name_col):
+    locations = pd.read_csv(path, dtype=str)
+    locations.columns = locations.columns.str.strip()
+    return pd.Series(normalize_zip(locations['Zip']).to_numpy(), index=locations[name_col].str.strip().to_numpy())
+
+
+# Latitude/longitude per code of a name array (NaN where the name or ZIP is unknown)
+def coordinates(names, zips, centroids, lookup):
+    coords = np.full((len(names), 2), np.nan)
+    for name, zip_code in zips.items():
+        code = lookup(name)
+        if code is not None and zip_code in centroids.index:
+            coords[code] = centroids.loc[zip_code, ['Latitude', 'Longitude']].to_numpy(dtype=float)
+    return coords
+
+
+# Rows with measured miles (not estimates from an earlier run)
+def measured_rows(model):
+    if 'Estimated' not in model.columns:
+        return np.ones(len(model), dtype=bool)
+    return model.columns['Estimated'] == 0
+
+
+# Detour factor (road / straight-line miles) and drive minutes per round-trip
+# mile, fitted on the measured pairs that have coordinates on both ends
+def fit_road_model(model, evaluator_coords, customer_coords):
+    e, c = evaluator_coords[model.evaluator_codes], customer_coords[model.customer_codes]
+    straight = haversine_miles(e[:, 0], e[:, 1], c[:, 0], c[:, 1])
+    one_way = model.columns['One-Way Miles']
+    round_trip = model.columns['Round-Trip Miles']
+    minutes = model.columns['Drive Time (min)']
+    usable = measured_rows(model) & np.isfinite(straight) & (straight > 1) & np.isfinite(one_way) & (one_way > 0)
+    if usable.sum() < 2:
+        raise ValueError("Not enough known pairs with coordinates to fit the road model")
+    detour = float(np.median(one_way[usable] / straight[usable]))
+    timed = usable & np.isfinite(round_trip) & np.isfinite(minutes)
+    slope, intercept = np.polyfit(round_trip[timed], minutes[timed], 1)
+    residual = one_way[usable] - detour * straight[usable]
+    return {'detour': detour, 'minutes_per_mile': float(slope), 'minutes_intercept': float(intercept),
+            'pairs': int(usable.sum()), 'mean_abs_error_miles': float(np.mean(np.abs(residual)))}
+
+
+# Estimated rows, in mileage delta layout, for every active evaluator/customer
+# pair the model has no measured miles for
+def estimate_missing_pairs(model, evaluator_coords, customer_coords, road_model):
+    evaluator_codes = np.flatnonzero(np.diff(model.ranking.evaluator_offsets) > 0)
+    customer_codes = np.flatnonzero(np.diff(model.ranking.offsets) > 0)
+    grid_e, grid_c = (a.ravel() for a in np.meshgrid(evaluator_codes, customer_codes, indexing="ij"))
+    # Earlier estimates count as missing, so a re-run regenerates the whole file
+    measured = measured_rows(model)
+    known = np.zeros((len(model.evaluator_names), len(model.customer_names)), dtype=bool)
+    known[model.evaluator_codes[measured], model.customer_codes[measured]] = True
+    missing = ~known[grid_e, grid_c]
+    grid_e, grid_c = grid_e[missing], grid_c[missing]
+
+    e, c = evaluator_coords[grid_e], customer_coords[grid_c]
+    one_way = haversine_miles(e[:, 0], e[:, 1], c[:, 0], c[:, 1]) * road_model['detour']
+    located = np.isfinite(one_way)
+    one_way, grid_e, grid_c = np.round(one_way[located]), grid_e[located], grid_c[located]
+    round_trip = 2 * one_way
+    return pd.DataFrame({
+        'Evaluator': model.evaluator_names[grid_e],
+        'Customer': model.customer_names[grid_c],
+        'One-Way Miles': one_way,
+        'Round-Trip Miles': round_trip,
+        'Drive Time (min)': np.round(road_model['minutes_intercept'] + road_model['minutes_per_mile'] * round_trip),
+        'Action': "upsert",
+        'Estimated': True,
+    })
+
+
+# ZIP centroids plus coordinates per evaluator and customer code (customers are
+# all NaN when there is no customer locations file)
+def load_locations(model, zip_path=ZIP_CENTROIDS_FILE, customer_path=CUSTOMER_LOCATIONS_FILE,
+                   full_time_path=core.FULL_TIME_FILE, evaluator_path=EVALUATOR_LOCATIONS_FILE):
+    centroids = read_zip_centroids(zip_path)
+    evaluator_zips = read_locations(full_time_path, 'Last Name')
+    if os.path.exists(evaluator_path):
+        evaluator_zips = pd.concat([evaluator_zips, read_locations(evaluator_path, 'Evaluator')])
+    customer_zips = read_locations(customer_path, 'Customer') if os.path.exists(customer_path) else {}
+    return {
+        'centroids': centroids,
+        'evaluators': coordinates(model.evaluator_names, evaluator_zips, centroids, model.evaluator_code),
+        'customers': coordinates(model.customer_names, customer_zips, centroids, model.customer_code),
+    }
+
+
+def fill_missing_pairs(output=None, zip_path=ZIP_CENTROIDS_FILE, customer_path=CUSTOMER_LOCATIONS_FILE,
+                       full_time_path=core.FULL_TIME_FILE, evaluator_path=EVALUATOR_LOCATIONS_FILE):
+    model = shared_mileage_model()
+    locations = load_locations(model, zip_path, customer_path, full_time_path, evaluator_path)
+    evaluator_coords, customer_coords = locations['evaluators'], locations['customers']
+    road_model = fit_road_model(model, evaluator_coords, customer_coords)
+    estimates = estimate_missing_pairs(model, evaluator_coords, customer_coords, road_model)
+    if output:
+        os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+        estimates.to_csv(output, index=False)
+    return estimates, road_model
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Estimate missing evaluator/customer pairs from ZIP centroids.")
+    parser.add_argument("command", choices=["fill"])
+    parser.add_argument("--output", default=os.path.join(mileage_delta.DELTA_DIR, "estimated_pairs.csv"))
+    parser.add_argument("--zips", default=ZIP_CENTROIDS_FILE)
+    parser.add_argument("--customers", default=CUSTOMER_LOCATIONS_FILE)
+    parser.add_argument("--evaluators", default=EVALUATOR_LOCATIONS_FILE, help="addresses for contract evaluators")
+    args = parser.parse_args(argv)
+
+    estimates, road_model = fill_missing_pairs(args.output, args.zips, args.customers,
+                                               evaluator_path=args.evaluators)
+    print(f"Detour factor {road_model['detour']:.3f} from {road_model['pairs']} known pairs "
+          f"(mean error {road_model['mean_abs_error_miles']:.1f} mi); "
+          f"drive time {road_model['minutes_intercept']:.1f} + {road_model['minutes_per_mile']:.3f} min/mi")
+    print(f"Wrote {len(estimates)} estimated pairs to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+import time
+
+import numpy as np
+import pandas as pd
+
+import evaluator_core as core
+
+# Cost vs. drive time trade-off for one job file. The optimizers minimize total
+# cost only; this traces the efficient frontier between total cost and total
+# evaluator drive time with epsilon-constraint solves:
+#
+#   1. minimize cost                    -> the cheapest plan and its drive time
+#   2. minimize drive time              -> the shortest drive time
+#   3. minimize cost s.t. time <= eps   for eps stepping down from 1 to 2
+#
+# Every solve reuses one PuLP model (only the objective or the constraint's
+# right-hand side changes) and is warm-started from the cheapest plan found so
+# far that fits under the cap (the fastest plan always does). A cap the
+# previous plan already meets needs no solve: that plan stays optimal.
+#
+# If the drive-time solve fails (e.g. under time_limit) the frontier is just
+# the cheapest plan, and stats['status'] reports the failed solve.
+#
+# With unfilled_penalty set (as the optimizer page does) slots may stay open,
+# but every plan after the cheapest must fill as many slots as it does:
+# otherwise the drive time solve would leave slots open to save driving.
+
+
+# Drive minutes keyed like the cost matrix; pairs without a drive time are
+# estimated from their round-trip miles at the median minutes per mile
+def build_time_matrix(mileage_df, cost_matrix, job_slots):
+    customers = dict(job_slots)
+    keys = pd.DataFrame(list(cost_matrix), columns=['Evaluator', 'Job number'])
+    keys['Customer'] = keys['Job number'].map(customers).astype(str)
+    lookup = mileage_df[['Evaluator', 'Customer', 'Round-Trip Miles', 'Drive Time (min)']].astype(
+        {'Evaluator': str, 'Customer': str}
+    ).drop_duplicates(subset=['Evaluator', 'Customer'])
+    pairs = keys.merge(lookup, on=['Evaluator', 'Customer'], how='left')
+    minutes = pairs['Drive Time (min)'].to_numpy(dtype=float)
+    miles = pairs['Round-Trip Miles'].to_numpy(dtype=float)
+    timed = np.isfinite(minutes) & (miles > 0)
+    per_mile = np.median(minutes[timed] / miles[timed]) if timed.any() else 1.0
+    minutes = np.where(np.isfinite(minutes), minutes, np.nan_to_num(miles) * per_mile)
+    return dict(zip(cost_matrix, minutes.tolist()))
+
+
+def _plan_row(plan, cost_matrix, spend, time_matrix, last_resort_managers, seconds, status):
+    managers = sum(1 for e, _ in plan if e in last_resort_managers)
+    return {
+        'Total Cost': sum(spend[key] for key in plan),
+        'Drive Time (min)': sum(time_matrix[key] for key in plan),
+        'Last Resort': managers,
+        'Assigned': len(plan),
+        'Status': status,
+        'Seconds': seconds,
+        'objective': sum(cost_matrix[key] for key in plan),
+        'assignments': sorted(plan, key=lambda key: (str(key[1]), key[0])),
+    }
+
+
+# Frontier points (cheapest first), each with its plan. The solves and the
+# dominance check include the manager penalty, as the optimizer does; the
+# reported 'Total Cost' leaves it out (see 'Last Resort').
+def cost_time_frontier(mileage_df, job_slots, points=8, time_limit=None, candidates=None, unfilled_penalty=None,
+                       last_resort_managers=core.LAST_RESORT_MANAGERS, manager_penalty=core.MANAGER_PENALTY):
+    from pulp import lpSum
+
+    cost_matrix = core.build_cost_matrix(mileage_df, job_slots, last_resort_managers, manager_penalty, candidates)
+    time_matrix = build_time_matrix(mileage_df, cost_matrix, job_slots)
+    spend = {key: cost - (manager_penalty if key[0] in last_resort_managers else 0)
+             for key, cost in cost_matrix.items()}
+    prob, x = core.build_assignment_model(cost_matrix, job_slots, unfilled_penalty)
+    cost_objective = prob.objective
+    time_total = lpSum(time_matrix[key] * var for key, var in x.items())
+    rows, timings = [], []
+
+    def solve(warm_start=None):
+        start = time.perf_counter()
+        plan, status = core.solve_assignment_model(prob, x, time_limit=time_limit, warm_start=warm_start)
+        seconds = time.perf_counter() - start
+        timings.append(seconds)
+        if status == "Optimal":
+            rows.append(_plan_row(plan, cost_matrix, spend, time_matrix, last_resort_managers, seconds, status))
+        return plan, status
+
+    cheapest, status = solve()
+    if status != "Optimal":
+        return pd.DataFrame(rows), {'status': status}
+    cheapest_time = rows[-1]['Drive Time (min)']
+    if unfilled_penalty is not None:
+        prob += lpSum(x.values()) >= len(cheapest), "filled_slots"
+
+    prob.setObjective(time_total)
+    fastest, fastest_status = solve(warm_start=cheapest)
+    if fastest_status == "Optimal":
+        # The fastest plan minimizes time only; the last cap below finds the
+        # cheapest plan at that time, so this row is dropped
+        rows.pop()
+        fastest_time = sum(time_matrix[key] for key in fastest)
+
+        # Cost-minimal plans under a falling drive time cap
+        prob.setObjective(cost_objective)
+        prob += time_total <= cheapest_time, "drive_time_cap"
+        known = [(cheapest_time, rows[0]['objective'], cheapest), (fastest_time, np.inf, fastest)]
+        previous_time = cheapest_time
+        for eps in np.linspace(cheapest_time, fastest_time, max(points, 2))[1:]:
+            if previous_time <= eps + 1e-6:
+                continue
+            prob.constraints['drive_time_cap'].changeRHS(float(eps) + 1e-6)
+            start = min((k for k in known if k[0] <= eps + 1e-6), key=lambda k: k[1])
+            plan, status = solve(warm_start=start[2])
+            if status == "Optimal":
+                previous_time = rows[-1]['Drive Time (min)']
+                known.append((previous_time, rows[-1]['objective'], plan))
+
+    frontier = pd.DataFrame(rows)
+    frontier = frontier.sort_values(['objective', 'Drive Time (min)']).drop_duplicates(
+        subset=['objective', 'Drive Time (min)']
+    )
+    # Keep only points no other point beats on both axes
+    best_time = frontier['Drive Time (min)'].cummin().shift(fill_value=np.inf)
+    frontier = frontier[frontier['Drive Time (min)'] < best_time].reset_index(drop=True)
+    frontier['Total Cost'] = frontier['Total Cost'].round(2)
+    frontier['Drive Time (min)'] = frontier['Drive Time (min)'].round(1)
+    frontier.insert(0, 'Point', np.arange(1, len(frontier) + 1))
+    stats = {'status': fastest_status, 'solves': len(timings), 'variables': len(x),
+             'seconds': round(sum(timings), 4), 'first_solve_seconds': round(timings[0], 4)}
+    return frontier, stats
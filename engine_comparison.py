@@ -0,0 +1,190 @@
+import argparse
+import json
+import os
+import tempfile
+import time
+from collections import Counter
+
+import pandas as pd
+
+import evaluator_core as core
+from auction_solver import solve_auction
+from synthetic_data import write_dataset
+
+# Runs every assignment engine on the same inputs and compares plan quality
+# against wall time:
+#
+#   python engine_comparison.py --sizes 36x143x15 100x1000x40 100x2000x200
+#
+# nearest  - closest evaluators per job, evaluators may repeat (evaluator_app6.py)
+# greedy   - closest unused evaluators in job order (evaluator_app7.py)
+# mip      - PuLP/CBC minimum total cost (evaluator_optomization_app*.py)
+# auction  - auction algorithm, same optimum as mip (auction_solver.py)
+#
+# Unfilled slots and evaluators booked on more than one job are charged
+# UNFILLED_PENALTY each in the effective cost so the engines can be ranked on
+# one axis. The Pareto frontier (effective cost vs. wall time) per size is
+# written as a chart and an engine policy that choose_engine() reads back.
+# The policy only picks between EXACT_ENGINES (same optimum, different speed):
+# the heuristics are compared here but run only when a caller asks for them.
+# The policy lives next to this module (not in the working directory), so the
+# service picks the same engine wherever it is started.
+
+ENGINES = ["nearest", "greedy", "mip", "auction"]
+EXACT_ENGINES = ["mip", "auction"]
+UNFILLED_PENALTY = core.UNFILLED_PENALTY
+DEFAULT_POLICY = os.environ.get("EVALUATOR_ENGINE_POLICY",
+                                os.path.join(os.path.dirname(os.path.abspath(__file__)), "engine_policy.json"))
+
+
+def run_engine(engine, jobs_df, mileage_df, job_slots, time_limit=None):
+    start = time.perf_counter()
+    if engine == "nearest":
+        assignments = core.assign_nearest(jobs_df, mileage_df)
+    elif engine == "greedy":
+        assignments = core.assign_unique_greedy(jobs_df, mileage_df)
+    elif engine == "mip":
+        cost_matrix = core.build_cost_matrix(mileage_df, job_slots)
+        prob, x = core.build_assignment_model(cost_matrix, job_slots, unfilled_penalty=UNFILLED_PENALTY)
+        assignments, _ = core.solve_assignment_model(prob, x, time_limit=time_limit)
+    elif engine == "auction":
+        cost_matrix = core.build_cost_matrix(mileage_df, job_slots)
+        assignments, _, _ = solve_auction(cost_matrix, job_slots, time_limit=time_limit,
+                                          unfilled_penalty=UNFILLED_PENALTY)
+    else:
+        raise ValueError(f"Unknown engine: {engine}")
+    wall_time = time.perf_counter() - start
+    return assignments, wall_time
+
+
+# Total cost, last-resort usage, unfilled slots and double bookings for a plan
+def score_plan(assignments, jobs_df, mileage_df, job_slots):
+    final_df = core.build_assignment_output(assignments, jobs_df, mileage_df)
+    unmatched = jobs_df['Matched Customer'].isna()
+    requested = len(job_slots) + int(jobs_df.loc[unmatched, 'Evaluators Needed'].sum())
+    uses = Counter(e for e, _ in assignments)
+    double_booked = sum(n - 1 for n in uses.values() if n > 1)
+    last_resort = int((final_df['Assignment Tier'] == "Last Resort Manager").sum())
+    total_cost = float(final_df['Total Cost'].sum())
+    unfilled = requested - len(final_df)
+    return {
+        'total_cost': round(total_cost, 2),
+        'last_resort': last_resort,
+        'unfilled_slots': unfilled,
+        'double_booked': double_booked,
+        'effective_cost': round(
+            total_cost + last_resort * core.MANAGER_PENALTY + (unfilled + double_booked) * UNFILLED_PENALTY, 2
+        ),
+    }
+
+
+def compare_engines(paths, engines=ENGINES, time_limit=None):
+    mileage_df = core.enrich_mileage(core.read_mileage(paths['mileage']),
+                                     core.read_full_time_names(paths['roster']))
+    jobs_df = core.match_customers(core.read_jobs(paths['jobs']), mileage_df['Customer'].unique())
+    job_slots = core.build_job_slots(jobs_df)
+
+    rows = []
+    for engine in engines:
+        assignments, wall_time = run_engine(engine, jobs_df, mileage_df, job_slots, time_limit)
+        rows.append({
+            'engine': engine,
+            'job_slots': len(job_slots),
+            'wall_time': round(wall_time, 4),
+            **score_plan(assignments, jobs_df, mileage_df, job_slots),
+        })
+    return pd.DataFrame(rows)
+
+
+# Engines not beaten on both effective cost and wall time, per size
+def pareto_frontier(results_df):
+    frontier = []
+    for _, group in results_df.groupby('size', sort=False):
+        for _, row in group.iterrows():
+            dominated = (
+                (group['effective_cost'] <= row['effective_cost']) &
+                (group['wall_time'] <= row['wall_time']) &
+                ((group['effective_cost'] < row['effective_cost']) | (group['wall_time'] < row['wall_time']))
+            ).any()
+            frontier.append(not dominated)
+    results_df = results_df.copy()
+    results_df['pareto'] = frontier
+    return results_df
+
+
+def plot_frontier(results_df, path):
+    import altair as alt
+
+    base = alt.Chart(results_df).encode(
+        x=alt.X('wall_time:Q', title="Wall time (s)", scale=alt.Scale(type="log")),
+        y=alt.Y('effective_cost:Q', title="Effective cost ($)"),
+        color='size:N',
+    )
+    points = base.mark_point(filled=True, size=80).encode(
+        shape='engine:N', tooltip=['size', 'engine', 'total_cost', 'unfilled_slots', 'last_resort', 'wall_time']
+    )
+    line = base.transform_filter(alt.datum.pareto).mark_line()
+    (points + line).properties(title="Assignment engines: cost vs. time").save(path)
+
+
+# Cheapest exact engine per size that fits the time budget, as job-slot
+# thresholds (sizes without an exact engine result are left out)
+def build_policy(results_df, time_budget):
+    policy = []
+    exact = results_df[results_df['engine'].isin(EXACT_ENGINES)]
+    for _, group in exact.sort_values('job_slots').groupby('size', sort=False):
+        within = group[group['wall_time'] <= time_budget]
+        pick = within if not within.empty else group.nsmallest(1, 'wall_time')
+        best = pick.nsmallest(1, 'effective_cost').iloc[0]
+        policy.append({'max_job_slots': int(best['job_slots']), 'engine': best['engine']})
+    return {'time_budget': time_budget, 'thresholds': policy}
+
+
+# Exact engine for a job slot count from the policy file; entries naming a
+# heuristic (policies written before EXACT_ENGINES) are skipped
+def choose_engine(n_job_slots, policy_path=DEFAULT_POLICY, default="mip"):
+    if not os.path.exists(policy_path):
+        return default
+    with open(policy_path) as f:
+        thresholds = [entry for entry in json.load(f)['thresholds'] if entry['engine'] in EXACT_ENGINES]
+    for entry in thresholds:
+        if n_job_slots <= entry['max_job_slots']:
+            return entry['engine']
+    return thresholds[-1]['engine'] if thresholds else default
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare assignment engines on the same inputs.")
+    parser.add_argument("--sizes", nargs="+", default=["36x143x15", "100x1000x40", "100x2000x200"],
+                        help="EVALUATORSxCUSTOMERSxJOBS")
+    parser.add_argument("--engines", nargs="+", default=ENGINES, choices=ENGINES)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--time-limit", type=float, default=None, help="CBC time limit in seconds")
+    parser.add_argument("--time-budget", type=float, default=5.0, help="seconds allowed per solve in the policy")
+    parser.add_argument("--output", default="engine_comparison.csv")
+    parser.add_argument("--chart", default="engine_frontier.html")
+    parser.add_argument("--policy", default=DEFAULT_POLICY)
+    args = parser.parse_args(argv)
+
+    frames = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in args.sizes:
+            n_evaluators, n_customers, n_jobs = (int(p) for p in size.lower().split("x"))
+            paths = write_dataset(os.path.join(tmp, size), n_evaluators, n_customers, n_jobs, seed=args.seed)
+            result = compare_engines(paths, args.engines, args.time_limit)
+            result.insert(0, 'size', size)
+            frames.append(result)
+            print(result.to_string(index=False))
+
+    results_df = pareto_frontier(pd.concat(frames, ignore_index=True))
+    results_df.to_csv(args.output, index=False)
+    with open(args.policy, "w") as f:
+        json.dump(build_policy(results_df, args.time_budget), f, indent=2)
+    try:
+        plot_frontier(results_df, args.chart)
+    except ImportError:
+        print("altair is not installed, skipping the frontier chart")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,54 +1,37 @@
 import streamlit as st
-import pandas as pd
+import numpy as np
+from mileage_model import shared_mileage_model
+from display_grid import paged_grid, closest_mask
+from exports import render_downloads
 
-# Load your data
-df = pd.read_csv("Evaluator_Customer_Mileage.csv")  # Replace with your actual filename
+# Load your data (shared model, Evaluator/Customer held as integer codes)
+model = shared_mileage_model()
 
 # Sidebar filters
 st.sidebar.header("Filter Options")
 selected_customers = st.sidebar.multiselect(
     "Select Customers",
-    options=sorted(df['Customer'].unique()),
+    options=sorted(model.customer_names),
     default=[]
 )
 
 selected_evaluators = st.sidebar.multiselect(
     "Select Evaluators",
-    options=sorted(df['Evaluator'].unique()),
+    options=sorted(model.active_evaluator_names()),
     default=[]
 )
 
-# Apply filters
-filtered_df = df.copy()
-if selected_customers:
-    filtered_df = filtered_df[filtered_df['Customer'].isin(selected_customers)]
+# Apply filters (rows come from the ranking index grouped by customer, closest first)
+customer_codes = [model.customer_code(c) for c in selected_customers] if selected_customers else None
+filtered_df = model.frame(model.ranking.rows_for_customers(customer_codes, by="miles"))
 if selected_evaluators:
-    filtered_df = filtered_df[filtered_df['Evaluator'].isin(selected_evaluators)]
+    codes = [model.evaluator_code(e) for e in selected_evaluators]
+    filtered_df = filtered_df[np.isin(filtered_df['Evaluator'].cat.codes, codes)]
 
-# Ensure 'Round-Trip Miles' column exists and is numeric
-if 'Round-Trip Miles' in filtered_df.columns:
-    filtered_df['Round-Trip Miles'] = pd.to_numeric(filtered_df['Round-Trip Miles'], errors='coerce')
-
-    # Identify closest evaluator per customer
-    def highlight_grouped_rows(df_grouped):
-        highlight = pd.DataFrame('', index=df_grouped.index, columns=df_grouped.columns)
-        for customer, group in df_grouped.groupby('Customer'):
-            if not group.empty:
-                min_index = group['Round-Trip Miles'].idxmin()
-                highlight.loc[min_index] = ['background-color: lightgreen'] * len(group.columns)
-        return highlight
-
-    styled_df = filtered_df.style.apply(highlight_grouped_rows, axis=None)
-    st.subheader("Closest Evaluator per Customer")
-    st.dataframe(styled_df)
-else:
-    st.error("Column 'Round-Trip Miles' not found in your data.")
+# Identify closest evaluator per customer, then show one page at a time
+closest = closest_mask(filtered_df)
+st.subheader("Closest Evaluator per Customer")
+paged_grid(filtered_df, key="evaluators", highlight=closest)
 
 # Download button
-csv = filtered_df.to_csv(index=False).encode('utf-8')
-st.download_button(
-    label="Download Filtered Data as CSV",
-    data=csv,
-    file_name="filtered_evaluators.csv",
-    mime="text/csv"
-)
\ No newline at end of file
+render_downloads(filtered_df, "filtered_evaluators", "Download Filtered Data")
\ No newline at end of file
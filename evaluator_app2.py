@@ -1,5 +1,6 @@
 import streamlit as st
 import pandas as pd
+from exports import render_downloads
 
 # Load your data
 df = pd.read_csv("Evaluator_Customer_Mileage.csv")  # Make sure this file is in your GitHub repo
@@ -57,10 +58,4 @@ st.subheader("Closest Evaluator per Customer")
 st.dataframe(styled_df)
 
 # Download button
-csv = filtered_df.to_csv(index=False).encode('utf-8')
-st.download_button(
-    label="Download Filtered Data as CSV",
-    data=csv,
-    file_name="filtered_evaluators.csv",
-    mime="text/csv"
-)
\ No newline at end of file
+render_downloads(filtered_df, "filtered_evaluators", "Download Filtered Data")
\ No newline at end of file
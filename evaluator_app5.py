@@ -1,7 +1,12 @@
 import streamlit as st
 import pandas as pd
 import os
-from rapidfuzz import process
+from evaluator_core import match_customers
+from job_ingest import read_jobs
+from mileage_model import shared_mileage_model
+from exports import render_downloads
+
+OUTPUT_NUMERIC_COLS = ['Round-Trip Miles', '2026 Cost', 'Per Diem', 'Mileage Bonus', 'Total Cost']
 
 st.set_page_config(page_title="Evaluator Assignment Tool", layout="wide")
 st.title("Evaluator Assignment by Closest Distance")
@@ -13,78 +18,36 @@ if missing:
     st.error(f"Missing required file(s): {', '.join(missing)}. Please upload them to proceed.")
     st.stop()
 
-# Load mileage data
-mileage_df = pd.read_csv("Evaluator_Customer_Mileage.csv")
-mileage_df.columns = mileage_df.columns.str.strip()
-mileage_df.rename(columns={"Cost ($)": "cost ($)"}, inplace=True)
-
-# Load full-time evaluator list
-full_time_df = pd.read_csv("Evaluators_FullTime.csv")
-full_time_names = full_time_df['Last Name'].str.strip().unique()
-
-# Tag evaluator status
-mileage_df['Status'] = mileage_df['Evaluator'].apply(
-    lambda name: 'Full-Time' if name.strip() in full_time_names else 'Contract'
-)
-
-# Ensure numeric columns
-mileage_df['Round-Trip Miles'] = pd.to_numeric(mileage_df['Round-Trip Miles'], errors='coerce')
-mileage_df['cost ($)'] = pd.to_numeric(mileage_df['cost ($)'], errors='coerce')
-
-# Add Per Diem (contractors only)
-mileage_df['Per Diem'] = mileage_df.apply(
-    lambda row: 225 if row['Round-Trip Miles'] > 175 and row['Status'] == 'Contract' else 0,
-    axis=1
-)
-
-# Add Mileage Bonus (contractors only)
-def mileage_bonus(row):
-    if row['Status'] != 'Contract' or pd.isnull(row['Round-Trip Miles']):
-        return 0
-    elif row['Round-Trip Miles'] > 800:
-        return 500
-    elif row['Round-Trip Miles'] > 400:
-        return 250
-    else:
-        return 0
-
-mileage_df['Mileage Bonus'] = mileage_df.apply(mileage_bonus, axis=1)
-
-# Add Total Cost
-mileage_df['Total Cost'] = (
-    mileage_df['cost ($)'].fillna(0) +
-    mileage_df['Per Diem'] +
-    mileage_df['Mileage Bonus']
-)
-
-# Load job data
-jobs_df = pd.read_excel("Jobs_1526.xlsx")
-jobs_df['Customer Company'] = jobs_df['Customer Company'].astype(str).str.strip().str.lower()
-mileage_df['Customer'] = mileage_df['Customer'].astype(str).str.strip().str.lower()
-
-# Fuzzy match customer names
-def fuzzy_match_customer(job_name, choices, threshold=85):
-    match, score, _ = process.extractOne(job_name, choices)
-    return match if score >= threshold else None
-
-jobs_df['Matched Customer'] = jobs_df['Customer Company'].apply(
-    lambda x: fuzzy_match_customer(x, mileage_df['Customer'].unique())
-)
-
-# Infer number of evaluators needed
-jobs_df['Evaluators Needed'] = jobs_df['Assignee(s)'].apply(
-    lambda x: len(str(x).split(',')) if pd.notnull(x) else 1
-)
-
-# Merge using fuzzy-matched customer
-merged_df = jobs_df.merge(mileage_df, left_on="Matched Customer", right_on="Customer", how="left")
-
-# Select closest evaluators per job
-def select_closest(group):
-    n = group['Evaluators Needed'].iloc[0]
-    return group.nsmallest(n, 'Round-Trip Miles')
-
-ranked_df = merged_df.groupby('Job number').apply(select_closest).reset_index(drop=True)
+# Load mileage data (shared model: status, per diem and mileage bonus for
+# contractors and total cost already computed; Evaluator/Customer held as codes)
+mileage_model = shared_mileage_model()
+mileage_df = mileage_model.frame()
+
+# Load job data (streamed; evaluators needed = one per listed assignee)
+jobs_df = read_jobs("Jobs_1526.xlsx")
+
+# Fuzzy match customer names against the customer dictionary ('Matched Customer'
+# shares the mileage Customer codes, so the ranking index is read by code)
+jobs_df = match_customers(jobs_df, mileage_df['Customer'])
+
+# Select closest evaluators per job straight from the ranking index: only the
+# key columns (customer code, evaluators needed) of the jobs are used and only
+# the selected mileage rows and output columns are built, so memory follows the
+# number of assignments rather than jobs x evaluators x columns
+jobs = jobs_df.drop_duplicates(subset=['Job number'])
+rows, owner = mileage_model.ranking.top_rows(jobs['Matched Customer'].cat.codes, jobs['Evaluators Needed'],
+                                             by="miles")
+ranked_df = mileage_model.frame(rows, columns=OUTPUT_NUMERIC_COLS).reset_index(drop=True)
+ranked_df['Job number'] = jobs['Job number'].to_numpy()[owner]
+ranked_df['Customer Company'] = jobs['Customer Company'].to_numpy()[owner]
+
+# Unmatched jobs stay in the table, without an evaluator
+unmatched = jobs[jobs['Matched Customer'].isna()]
+if len(unmatched):
+    blank = ranked_df.iloc[:0].reindex(range(len(unmatched)))
+    blank['Job number'] = unmatched['Job number'].to_numpy()
+    blank['Customer Company'] = unmatched['Customer Company'].to_numpy()
+    ranked_df = pd.concat([ranked_df, blank], ignore_index=True)
 
 # Format output
 ranked_df['Round-Trip Miles'] = ranked_df['Round-Trip Miles'].round(2)
@@ -93,7 +56,7 @@ ranked_df['Total Cost'] = ranked_df['Total Cost'].round(2)
 # Final columns
 output_cols = [
     'Job number', 'Customer Company', 'Evaluator',
-    'Round-Trip Miles', 'cost ($)', 'Per Diem', 'Mileage Bonus',
+    'Round-Trip Miles', '2026 Cost', 'Per Diem', 'Mileage Bonus',
     'Total Cost', 'Status'
 ]
 
@@ -104,10 +67,4 @@ st.subheader("Closest Evaluators Assigned to Each Job")
 st.dataframe(final_df, use_container_width=True)
 
 # Download button
-csv = final_df.to_csv(index=False).encode('utf-8')
-st.download_button(
-    label="Download Assignment Table as CSV",
-    data=csv,
-    file_name="evaluator_assignments.csv",
-    mime="text/csv"
-)
\ No newline at end of file
+render_downloads(final_df, "evaluator_assignments", "Download Assignment Table")
\ No newline at end of file
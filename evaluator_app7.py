@@ -1,7 +1,14 @@
 import streamlit as st
-import pandas as pd
+import numpy as np
 import os
-from rapidfuzz import process
+from candidate_masks import JobCandidates
+from assignment_history import render_confirm_button
+from evaluator_core import match_customers
+from mileage_model import shared_mileage_model
+from upload_cache import load_jobs, render_upload_status, result_key, shared_upload_cache
+from exports import render_downloads
+
+OUTPUT_NUMERIC_COLS = ['Round-Trip Miles', '2026 Cost', 'Per Diem', 'Mileage Bonus', 'Total Cost']
 
 st.set_page_config(page_title="Evaluator Assignment Tool", layout="wide")
 st.title("Evaluator Assignment by Closest Distance")
@@ -19,106 +26,61 @@ if missing:
     st.error(f"Missing required file(s): {', '.join(missing)}. Please upload them to proceed.")
     st.stop()
 
-# Load mileage data
-mileage_df = pd.read_csv("Evaluator_Customer_Mileage.csv")
-mileage_df.columns = mileage_df.columns.str.strip()
-mileage_df.rename(columns={"Cost ($)": "cost ($)"}, inplace=True)
-
-# Load full-time evaluator list
-full_time_df = pd.read_csv("Evaluators_FullTime.csv")
-full_time_names = full_time_df['Last Name'].str.strip().unique()
-
-# Tag evaluator status
-mileage_df['Status'] = mileage_df['Evaluator'].apply(
-    lambda name: 'Full-Time' if name.strip() in full_time_names else 'Contract'
-)
-
-# Ensure numeric columns
-mileage_df['Round-Trip Miles'] = pd.to_numeric(mileage_df['Round-Trip Miles'], errors='coerce')
-mileage_df['cost ($)'] = pd.to_numeric(mileage_df['cost ($)'], errors='coerce')
-
-# Add Per Diem (contractors only)
-mileage_df['Per Diem'] = mileage_df.apply(
-    lambda row: 225 if row['Round-Trip Miles'] > 175 and row['Status'] == 'Contract' else 0,
-    axis=1
-)
-
-# Add Mileage Bonus (contractors only)
-def mileage_bonus(row):
-    if row['Status'] != 'Contract' or pd.isnull(row['Round-Trip Miles']):
-        return 0
-    elif row['Round-Trip Miles'] > 800:
-        return 500
-    elif row['Round-Trip Miles'] > 400:
-        return 250
-    else:
-        return 0
-
-mileage_df['Mileage Bonus'] = mileage_df.apply(mileage_bonus, axis=1)
-
-# Add Total Cost
-mileage_df['Total Cost'] = (
-    mileage_df['cost ($)'].fillna(0) +
-    mileage_df['Per Diem'] +
-    mileage_df['Mileage Bonus']
-)
-
-# Load uploaded job file
-jobs_df = pd.read_excel(uploaded_job_file)
-jobs_df['Customer Company'] = jobs_df['Customer Company'].astype(str).str.strip().str.lower()
-mileage_df['Customer'] = mileage_df['Customer'].astype(str).str.strip().str.lower()
-
-# Fuzzy match customer names
-def fuzzy_match_customer(job_name, choices, threshold=85):
-    match, score, _ = process.extractOne(job_name, choices)
-    return match if score >= threshold else None
-
-jobs_df['Matched Customer'] = jobs_df['Customer Company'].apply(
-    lambda x: fuzzy_match_customer(x, mileage_df['Customer'].unique())
-)
-
-# Infer number of evaluators needed
-jobs_df['Evaluators Needed'] = jobs_df['Assignee(s)'].apply(
-    lambda x: len(str(x).split(',')) if pd.notnull(x) else 1
+# Load mileage data (shared model: status, per diem and mileage bonus for
+# contractors and total cost already computed; Evaluator/Customer held as codes)
+mileage_model = shared_mileage_model()
+mileage_df = mileage_model.frame()
+
+# Load uploaded job file (streamed; evaluators needed = one per listed assignee) and
+# fuzzy match customer names against the customer dictionary ('Matched Customer'
+# shares the mileage Customer codes, so the merge below joins on integers).
+# Both go through the upload cache: the same bytes skip parsing and matching.
+upload_cache = shared_upload_cache()
+upload_key, upload, upload_info = load_jobs(
+    uploaded_job_file, lambda jobs: match_customers(jobs, mileage_df['Customer']),
+    mileage_df['Customer'].cat.categories, namespace="rapidfuzz"
 )
-
-# Merge using fuzzy-matched customer
-merged_df = jobs_df.merge(mileage_df, left_on="Matched Customer", right_on="Customer", how="left")
-
-# Assign evaluators only once per file
-used_evaluators = set()
-
-def select_unique_closest(group):
-    n = group['Evaluators Needed'].iloc[0]
-    available = group[~group['Evaluator'].isin(used_evaluators)]
-    selected = available.nsmallest(n, 'Round-Trip Miles')
-    used_evaluators.update(selected['Evaluator'].dropna().tolist())
-    return selected
-
-ranked_df = merged_df.groupby('Job number').apply(select_unique_closest).reset_index(drop=True)
-
-# Format output
-ranked_df['Round-Trip Miles'] = ranked_df['Round-Trip Miles'].round(2)
-ranked_df['Total Cost'] = ranked_df['Total Cost'].round(2)
-
-# Final columns
-output_cols = [
-    'Job number', 'Customer Company', 'Evaluator',
-    'Round-Trip Miles', 'cost ($)', 'Per Diem', 'Mileage Bonus',
-    'Total Cost', 'Status'
-]
-
-final_df = ranked_df[output_cols].sort_values(by=['Job number', 'Round-Trip Miles'])
+render_upload_status(upload_info)
+jobs_df = upload['jobs']
+
+# Reuse the assignment table from an earlier upload of the same file
+assignments_key = result_key("unique_closest", mileage_model.version)
+final_df = upload['results'].get(assignments_key)
+if final_df is None:
+    # Assign evaluators only once per file, jobs in job-number order: each job's
+    # evaluators come pre-ranked by miles from the fuzzy-matched customer, and a
+    # used mask over evaluator codes lets each job's cursor skip taken evaluators
+    jobs = jobs_df.drop_duplicates(subset=['Job number']).sort_values('Job number', kind='stable')
+    candidates = JobCandidates(mileage_model, jobs['Matched Customer'].cat.codes, by="miles")
+    needed = jobs['Evaluators Needed'].to_numpy()
+    selected = [candidates.take(i, needed[i]) for i in range(len(candidates))]
+    counts = [len(rows) for rows in selected]
+
+    ranked_df = mileage_model.frame(np.concatenate(selected or [np.empty(0, np.int64)]),
+                                    columns=OUTPUT_NUMERIC_COLS).reset_index(drop=True)
+    ranked_df['Job number'] = np.repeat(jobs['Job number'].to_numpy(), counts)
+    ranked_df['Customer Company'] = np.repeat(jobs['Customer Company'].to_numpy(), counts)
+
+    # Format output
+    ranked_df['Round-Trip Miles'] = ranked_df['Round-Trip Miles'].round(2)
+    ranked_df['Total Cost'] = ranked_df['Total Cost'].round(2)
+
+    # Final columns
+    output_cols = [
+        'Job number', 'Customer Company', 'Evaluator',
+        'Round-Trip Miles', '2026 Cost', 'Per Diem', 'Mileage Bonus',
+        'Total Cost', 'Status'
+    ]
+
+    final_df = ranked_df[output_cols].sort_values(by=['Job number', 'Round-Trip Miles'])
+    upload_cache.store_result(upload_key, assignments_key, final_df)
 
 # Display results
 st.subheader("Closest Evaluators Assigned to Each Job")
 st.dataframe(final_df, use_container_width=True)
 
+# Save the confirmed plan to the assignment history (see evaluator_history_app.py)
+render_confirm_button(final_df, jobs_df, page="evaluator_app7", source=uploaded_job_file.name)
+
 # Download button
-csv = final_df.to_csv(index=False).encode('utf-8')
-st.download_button(
-    label="Download Assignment Table as CSV",
-    data=csv,
-    file_name="evaluator_assignments.csv",
-    mime="text/csv"
-)
\ No newline at end of file
+render_downloads(final_df, "evaluator_assignments", "Download Assignment Table")
\ No newline at end of file
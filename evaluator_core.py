@@ -0,0 +1,292 @@
+import numpy as np
+import pandas as pd
+from collections import Counter, defaultdict
+import job_ingest
+
+# Shared pipeline stages behind the Streamlit pages and the benchmark tools:
+# CSV parse -> enrichment -> job parse -> fuzzy match -> model build -> solve -> output
+# rapidfuzz and pulp are imported by the stages that use them, so pages that
+# have not matched or solved anything yet start without loading them.
+
+MILEAGE_FILE = "Evaluator_Customer_Mileage.csv"
+FULL_TIME_FILE = "Evaluators_FullTime.csv"
+
+# Cost rules
+MILE_RATE = 0.725
+PER_DIEM = 225
+PER_DIEM_MILES = 175
+BONUS_TIERS = [(800, 500), (400, 250)]
+
+# Last-resort managers and penalty
+LAST_RESORT_MANAGERS = ["Sherman", "Gray", "MacDonald"]
+MANAGER_PENALTY = 10000
+# Cost of a job slot left open, for solves that allow it (benchmark, engine
+# comparison and the optimizer page use the same value)
+UNFILLED_PENALTY = 2 * MANAGER_PENALTY
+
+OUTPUT_COLS = [
+    'Job number', 'Customer Company', 'Evaluator',
+    'Round-Trip Miles', '2026 Cost', 'Per Diem', 'Mileage Bonus',
+    'Total Cost', 'Status', 'Assignment Tier'
+]
+
+
+# Load mileage data
+def read_mileage(path=MILEAGE_FILE):
+    mileage_df = pd.read_csv(path)
+    mileage_df.columns = mileage_df.columns.str.strip()
+    mileage_df.rename(columns={"Cost ($)": "cost ($)"}, inplace=True)
+    return mileage_df
+
+
+# Load full-time evaluator list
+def read_full_time_names(path=FULL_TIME_FILE):
+    full_time_df = pd.read_csv(path)
+    return full_time_df['Last Name'].str.strip().unique()
+
+
+# Intern a name column as categorical codes. Names are stripped and compared
+# case-insensitively once per distinct value, not once per row, so spelling
+# variants such as "AGI Construction" / "Agi Construction" share one code (the
+# first spelling seen is kept for display). Pass categories to code against an
+# existing name dictionary; unknown names get code -1 (NaN).
+def intern_names(values, categories=None):
+    codes, uniques = pd.factorize(pd.Series(values))
+    names = pd.Index(uniques).astype(str).str.strip()
+    keys = names.str.lower()
+    if categories is None:
+        key_codes, _ = pd.factorize(keys)
+        first = pd.Series(np.arange(len(keys))).groupby(key_codes).first().to_numpy()
+        categories = names[first] if len(names) else pd.Index([], dtype=object)
+    else:
+        lookup = name_codes(categories)
+        key_codes = np.array([lookup.get(key, -1) for key in keys], dtype=np.int64)
+    codes = np.where(codes >= 0, np.asarray(key_codes)[codes] if len(names) else -1, -1)
+    return pd.Categorical.from_codes(codes, categories=categories)
+
+
+# Lowercased name -> code, for case-insensitive lookups against a name dictionary
+def name_codes(categories):
+    lookup = {}
+    for code, name in enumerate(pd.Index(categories).astype(str)):
+        lookup.setdefault(name.strip().lower(), code)
+    return lookup
+
+
+# Tag status and add per diem, mileage bonus and total cost (contractors only)
+def enrich_mileage(mileage_df, full_time_names, mile_rate=MILE_RATE, per_diem=PER_DIEM,
+                   per_diem_miles=PER_DIEM_MILES, bonus_tiers=BONUS_TIERS):
+    mileage_df = mileage_df.copy()
+    mileage_df['Evaluator'] = intern_names(mileage_df['Evaluator'])
+    mileage_df['Customer'] = intern_names(mileage_df['Customer'])
+    evaluators = mileage_df['Evaluator'].cat
+    full_time = evaluators.categories.isin(full_time_names)[evaluators.codes]
+    mileage_df['Status'] = pd.Categorical.from_codes(full_time.astype(np.int8), categories=['Contract', 'Full-Time'])
+
+    miles = pd.to_numeric(mileage_df['Round-Trip Miles'], errors='coerce')
+    mileage_df['Round-Trip Miles'] = miles
+    if 'Drive Time (min)' in mileage_df.columns:
+        mileage_df['Drive Time (min)'] = pd.to_numeric(mileage_df['Drive Time (min)'], errors='coerce')
+
+    # Cost column is mileage x rate
+    mileage_df['2026 Cost'] = miles * mile_rate
+
+    contract = ~full_time
+    mileage_df['Per Diem'] = np.where(contract & (miles > per_diem_miles).to_numpy(), per_diem, 0)
+
+    # Higher tiers overwrite lower ones, same result as mileage_bonus()
+    bonus = np.zeros(len(mileage_df))
+    for threshold, amount in sorted(bonus_tiers):
+        bonus = np.where((miles > threshold).to_numpy(), amount, bonus)
+    mileage_df['Mileage Bonus'] = np.where(contract, bonus, 0)
+
+    mileage_df['Total Cost'] = (
+        mileage_df['2026 Cost'].fillna(0) +
+        mileage_df['Per Diem'] +
+        mileage_df['Mileage Bonus']
+    )
+
+    # Pairs filled in by distance_engine.py rather than measured
+    if 'Estimated' in mileage_df.columns:
+        mileage_df['Estimated'] = parse_flag(mileage_df['Estimated'])
+    else:
+        mileage_df['Estimated'] = False
+    return mileage_df
+
+
+def parse_flag(values):
+    return pd.Series(values).astype(str).str.strip().str.lower().isin(["true", "1", "1.0", "yes"]).to_numpy()
+
+
+# Load uploaded job file (streamed, needed columns only) and infer number of
+# evaluators needed
+def read_jobs(job_file):
+    return job_ingest.read_jobs(job_file)
+
+
+# Fuzzy match customer names against the lowercased customer dictionary (each
+# distinct company name is scored once). 'Matched Customer' comes back as codes
+# into the same categories as the mileage Customer column.
+def match_customers(jobs_df, customers, threshold=85):
+    from rapidfuzz import process
+
+    if isinstance(getattr(customers, 'dtype', None), pd.CategoricalDtype):
+        categories = customers.cat.categories if isinstance(customers, pd.Series) else customers.categories
+    else:
+        categories = pd.Index(pd.unique(pd.Series(customers).dropna().astype(str)))
+    choices = list(categories.str.lower())
+
+    companies, names = pd.factorize(jobs_df['Customer Company'])
+    matched = np.full(len(names), -1)
+    for i, name in enumerate(names):
+        result = process.extractOne(str(name).lower(), choices)
+        if result and result[1] >= threshold:
+            matched[i] = result[2]
+    codes = np.where(companies >= 0, matched[companies] if len(names) else -1, -1)
+    jobs_df = jobs_df.copy()
+    jobs_df['Matched Customer'] = pd.Categorical.from_codes(codes, categories=categories)
+    return jobs_df
+
+
+# Create job slots, one per evaluator needed (unmatched jobs are left out)
+def build_job_slots(jobs_df):
+    job_numbers, customer_codes = job_ingest.job_slot_arrays(jobs_df)
+    customers = jobs_df['Matched Customer'].cat.categories.to_numpy()[customer_codes]
+    return list(zip(job_numbers.tolist(), customers.tolist()))
+
+
+# Build cost matrix with penalty, keyed by (evaluator, job number); the join
+# runs on customer codes. candidates, an (evaluator codes, customer codes) pair
+# of arrays such as spatial_index.EvaluatorLocator.candidates() produces, limits
+# the customers it covers to those evaluators (last-resort managers are kept).
+def build_cost_matrix(mileage_df, job_slots, last_resort_managers=LAST_RESORT_MANAGERS,
+                      manager_penalty=MANAGER_PENALTY, candidates=None):
+    slots_df = pd.DataFrame(job_slots, columns=['Job number', 'Customer']).drop_duplicates()
+    slots_df['Customer'] = intern_names(slots_df['Customer'], _categories(mileage_df['Customer']))
+    pairs = slots_df.merge(mileage_df[['Evaluator', 'Customer', 'Total Cost']], on='Customer')
+    if candidates is not None:
+        evaluator_codes, customer_codes = (np.asarray(a, dtype=np.int64) for a in candidates)
+        pair_codes = pairs['Customer'].cat.codes.to_numpy().astype(np.int64)
+        pair_keys = pairs['Evaluator'].cat.codes.to_numpy().astype(np.int64) << 32 | pair_codes
+        keep = (np.isin(pair_keys, evaluator_codes << 32 | customer_codes) |
+                ~np.isin(pair_codes, customer_codes) | pairs['Evaluator'].isin(last_resort_managers).to_numpy())
+        pairs = pairs[keep]
+    pairs = pairs.drop_duplicates(subset=['Evaluator', 'Job number'])
+    cost = pairs['Total Cost'].to_numpy() + np.where(
+        pairs['Evaluator'].isin(last_resort_managers), manager_penalty, 0
+    )
+    return dict(zip(zip(pairs['Evaluator'].astype(str), pairs['Job number']), cost.tolist()))
+
+
+def _categories(column):
+    if isinstance(column.dtype, pd.CategoricalDtype):
+        return column.cat.categories
+    return pd.Index(pd.unique(column.dropna().astype(str)))
+
+
+# Define optimization problem: each job slot filled once, evaluators used once.
+# With unfilled_penalty set, slots may stay open at that cost each instead of
+# making the whole model infeasible.
+def build_assignment_model(cost_matrix, job_slots, unfilled_penalty=None):
+    from pulp import LpProblem, LpMinimize, LpVariable, lpSum, LpBinary
+
+    prob = LpProblem("EvaluatorAssignment", LpMinimize)
+    x = LpVariable.dicts("assign", cost_matrix.keys(), cat=LpBinary)
+
+    slot_counts = Counter(j[0] for j in job_slots)
+    objective = [cost_matrix[key] * x[key] for key in cost_matrix]
+    unfilled = {}
+    if unfilled_penalty is not None:
+        for i, (job_num, slots) in enumerate(slot_counts.items()):
+            unfilled[job_num] = LpVariable(f"unfilled_{i}", lowBound=0, upBound=slots, cat="Integer")
+            objective.append(unfilled_penalty * unfilled[job_num])
+    prob += lpSum(objective)
+
+    by_job = defaultdict(list)
+    by_evaluator = defaultdict(list)
+    for (evaluator, job_num), var in x.items():
+        by_job[job_num].append(var)
+        by_evaluator[evaluator].append(var)
+
+    for job_num, slots in slot_counts.items():
+        if job_num in unfilled:
+            prob += lpSum(by_job[job_num]) + unfilled[job_num] == slots
+        else:
+            prob += lpSum(by_job[job_num]) == slots
+    for evaluator, variables in by_evaluator.items():
+        prob += lpSum(variables) <= 1
+    return prob, x
+
+
+# Solve and return the chosen (evaluator, job number) pairs. warm_start, a
+# feasible set of pairs such as the previous solve's, is passed to CBC as its
+# starting incumbent.
+def solve_assignment_model(prob, x, time_limit=None, msg=False, warm_start=None):
+    from pulp import LpStatus, PULP_CBC_CMD
+
+    if warm_start is not None:
+        chosen = set(warm_start)
+        for key, var in x.items():
+            var.setInitialValue(1 if key in chosen else 0)
+    prob.solve(PULP_CBC_CMD(msg=msg, timeLimit=time_limit, warmStart=warm_start is not None))
+    status = LpStatus[prob.status]
+    if status != "Optimal":
+        return [], status
+    assignments = [key for key, var in x.items() if var.value() is not None and var.value() > 0.5]
+    return assignments, status
+
+
+# Nearest evaluators per job by round-trip miles, evaluators may repeat across jobs
+# (evaluator_app6.py)
+def assign_nearest(jobs_df, mileage_df):
+    merged_df = jobs_df[['Job number', 'Matched Customer', 'Evaluators Needed']].merge(
+        mileage_df[['Evaluator', 'Customer', 'Round-Trip Miles']],
+        left_on="Matched Customer", right_on="Customer"
+    )
+    assignments = []
+    for job_num, group in merged_df.groupby('Job number'):
+        n = int(group['Evaluators Needed'].iloc[0])
+        assignments += [(str(e), job_num) for e in group.nsmallest(n, 'Round-Trip Miles')['Evaluator']]
+    return assignments
+
+
+# Closest unused evaluators per job in job-number order, each evaluator used once
+# (evaluator_app7.py)
+def assign_unique_greedy(jobs_df, mileage_df):
+    merged_df = jobs_df[['Job number', 'Matched Customer', 'Evaluators Needed']].merge(
+        mileage_df[['Evaluator', 'Customer', 'Round-Trip Miles']],
+        left_on="Matched Customer", right_on="Customer"
+    )
+    evaluators = intern_names(merged_df['Evaluator'], _categories(mileage_df['Evaluator']))
+    merged_df['Evaluator Code'] = evaluators.codes
+    used_evaluators = np.zeros(len(evaluators.categories), dtype=bool)
+    assignments = []
+    for job_num, group in merged_df.groupby('Job number'):
+        n = int(group['Evaluators Needed'].iloc[0])
+        available = group[~used_evaluators[group['Evaluator Code'].to_numpy()]]
+        selected = available.nsmallest(n, 'Round-Trip Miles')
+        used_evaluators[selected['Evaluator Code'].to_numpy()] = True
+        assignments += [(str(e), job_num) for e in selected['Evaluator']]
+    return assignments
+
+
+# Build output table from (evaluator, job number) pairs
+def build_assignment_output(assignments, jobs_df, mileage_df, last_resort_managers=LAST_RESORT_MANAGERS):
+    if not assignments:
+        return pd.DataFrame(columns=OUTPUT_COLS)
+    chosen = pd.DataFrame(assignments, columns=['Evaluator', 'Job number'])
+    chosen['Evaluator'] = intern_names(chosen['Evaluator'], _categories(mileage_df['Evaluator']))
+    jobs = jobs_df.drop_duplicates(subset=['Job number'])[['Job number', 'Customer Company', 'Matched Customer']]
+    final_df = chosen.merge(jobs, on='Job number', how='left').merge(
+        mileage_df.drop_duplicates(subset=['Evaluator', 'Customer']),
+        left_on=['Evaluator', 'Matched Customer'], right_on=['Evaluator', 'Customer'], how='left'
+    )
+    final_df['Customer Company'] = final_df['Customer Company'].astype(str).str.title()
+    final_df['Evaluator'] = final_df['Evaluator'].astype(str)
+    final_df['Round-Trip Miles'] = final_df['Round-Trip Miles'].round(2)
+    final_df['2026 Cost'] = final_df['2026 Cost'].round(2)
+    final_df['Total Cost'] = final_df['Total Cost'].round(2)
+    final_df['Assignment Tier'] = np.where(
+        final_df['Evaluator'].isin(last_resort_managers), "Last Resort Manager", "Primary"
+    )
+    return final_df[OUTPUT_COLS].sort_values(by=['Job number', 'Round-Trip Miles']).reset_index(drop=True)
@@ -0,0 +1,47 @@
+import streamlit as st
+from assignment_history import (PERIODS, cost_trend, default_period, evaluator_workload, history_summary,
+                                job_history, repeat_pairings)
+
+st.set_page_config(page_title="Assignment History", layout="wide")
+st.title("Assignment History")
+
+# Confirmed plans come from the Confirm Plan button on the assignment pages
+summary = history_summary()
+if not summary['assignments']:
+    st.info("No confirmed plans yet. Use Confirm Plan on an assignment page to start the history.")
+    st.stop()
+st.caption(f"{summary['plans']} confirmed plan(s), {summary['assignments']:,} assignments, "
+           f"job dates {summary['first']} to {summary['last']}.")
+
+# Period filter (inclusive), applied in SQL
+default_start, default_end = default_period()
+period = st.sidebar.date_input("Job dates", value=(default_start, default_end))
+start, end = (period + (None, None))[:2] if isinstance(period, tuple) else (period, None)
+if st.sidebar.checkbox("All dates"):
+    start = end = None
+
+workload_tab, pairings_tab, trend_tab, job_tab = st.tabs(
+    ["Evaluator workload", "Repeat pairings", "Cost trend", "Job lookup"]
+)
+
+with workload_tab:
+    workload_df = evaluator_workload(start, end)
+    st.dataframe(workload_df, use_container_width=True, hide_index=True)
+    if not workload_df.empty:
+        st.bar_chart(workload_df.set_index('Evaluator')['Assignments'])
+
+with pairings_tab:
+    min_count = st.number_input("Paired at least", min_value=2, value=2)
+    st.dataframe(repeat_pairings(min_count, start, end), use_container_width=True, hide_index=True)
+
+with trend_tab:
+    period_name = st.radio("Group by", list(PERIODS), index=list(PERIODS).index("month"), horizontal=True)
+    trend_df = cost_trend(period_name, start, end)
+    if not trend_df.empty:
+        st.line_chart(trend_df.set_index('Period')[['Total Cost']])
+    st.dataframe(trend_df, use_container_width=True, hide_index=True)
+
+with job_tab:
+    job_number = st.text_input("Job number")
+    if job_number:
+        st.dataframe(job_history(job_number.strip()), use_container_width=True, hide_index=True)
\ No newline at end of file
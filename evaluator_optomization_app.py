@@ -1,8 +1,7 @@
 import streamlit as st
 import pandas as pd
 import os
-from rapidfuzz import process
-from pulp import LpProblem, LpMinimize, LpVariable, lpSum, LpBinary, LpStatus
+from exports import render_downloads
 
 st.set_page_config(page_title="Evaluator Optimizer", layout="wide")
 st.title("Optimized Evaluator Assignment")
@@ -69,7 +68,9 @@ jobs_df = pd.read_excel(uploaded_job_file)
 jobs_df['Customer Company'] = jobs_df['Customer Company'].astype(str).str.strip().str.lower()
 mileage_df['Customer'] = mileage_df['Customer'].astype(str).str.strip().str.lower()
 
-# Fuzzy match customer names
+# Fuzzy match customer names (rapidfuzz loads here, after the upload)
+from rapidfuzz import process
+
 def fuzzy_match_customer(job_name, choices, threshold=85):
     match, score, _ = process.extractOne(job_name, choices)
     return match if score >= threshold else None
@@ -97,6 +98,8 @@ for evaluator in mileage_df['Evaluator'].unique():
             cost_matrix[(evaluator, job_num)] = match['Total Cost'].values[0]
 
 # Define optimization problem
+from pulp import LpProblem, LpMinimize, LpVariable, lpSum, LpBinary, LpStatus
+
 prob = LpProblem("EvaluatorAssignment", LpMinimize)
 x = LpVariable.dicts("assign", cost_matrix.keys(), cat=LpBinary)
 
@@ -139,14 +142,7 @@ st.subheader("Optimized Evaluator Assignments")
 st.dataframe(final_df, use_container_width=True)
 
 # Download button
-csv = final_df.to_csv(index=False).encode('utf-8')
-st.download_button(
-    label="Download Assignment Table as CSV",
-    data=csv,
-    file_name="optimized_evaluator_assignments.csv",
-    mime="text/csv"
-
-)
+render_downloads(final_df, "optimized_evaluator_assignments", "Download Assignment Table")
 
 
 
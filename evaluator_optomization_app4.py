@@ -1,11 +1,23 @@
 import streamlit as st
 import pandas as pd
+import numpy as np
 import os
 from difflib import get_close_matches   # built-in fuzzy matching
-from pulp import LpProblem, LpMinimize, LpVariable, lpSum, LpBinary
+import service_client
+from assignment_history import render_confirm_button
+from assignment_grid import AssignmentGrid
+from candidate_masks import evaluator_mask
+from exports import render_downloads
+from instrumentation import RunProfiler, render_debug_panel
+from evaluator_core import UNFILLED_PENALTY, build_assignment_output, intern_names
+from job_ingest import job_slot_arrays
+from spatial_index import CANDIDATES_K
+from upload_cache import load_jobs, render_upload_status, result_key, shared_upload_cache
+from mileage_model import shared_mileage_model, memory_report
 
 st.set_page_config(page_title="Evaluator Optimizer", layout="wide")
 st.title("Optimized Evaluator Assignment")
+profiler = RunProfiler("evaluator_optomization_app4")
 
 # Upload job file
 uploaded_job_file = st.file_uploader("Upload a Job File (.xlsx)", type=["xlsx"])
@@ -20,187 +32,237 @@ if missing:
     st.error(f"Missing required file(s): {', '.join(missing)}. Please upload them to proceed.")
     st.stop()
 
-# Load mileage data
-mileage_df = pd.read_csv("Evaluator_Customer_Mileage.csv")
-mileage_df.columns = mileage_df.columns.str.strip()
-
-# Load full-time evaluator list
-full_time_df = pd.read_csv("Evaluators_FullTime.csv")
-full_time_names = full_time_df['Last Name'].str.strip().unique()
-
-# Tag evaluator status
-mileage_df['Status'] = mileage_df['Evaluator'].apply(
-    lambda name: 'Full-Time' if name.strip() in full_time_names else 'Contract'
-)
-
-# Ensure numeric miles
-mileage_df['Round-Trip Miles'] = pd.to_numeric(mileage_df['Round-Trip Miles'], errors='coerce')
-
-# --- Overwrite cost column with mileage × 0.725 ---
-mileage_df['2026 Cost'] = mileage_df['Round-Trip Miles'] * 0.725
-
-# Add Per Diem (contractors only)
-mileage_df['Per Diem'] = mileage_df.apply(
-    lambda row: 225 if row['Round-Trip Miles'] > 175 and row['Status'] == 'Contract' else 0,
-    axis=1
-)
-
-# Add Mileage Bonus (contractors only)
-def mileage_bonus(row):
-    if row['Status'] != 'Contract' or pd.isnull(row['Round-Trip Miles']):
-        return 0
-    elif row['Round-Trip Miles'] > 800:
-        return 500
-    elif row['Round-Trip Miles'] > 400:
-        return 250
-    else:
-        return 0
-
-mileage_df['Mileage Bonus'] = mileage_df.apply(mileage_bonus, axis=1)
-
-# Keep Total Cost as is (base cost + per diem + bonus)
-mileage_df['Total Cost'] = (
-    mileage_df['2026 Cost'].fillna(0) +
-    mileage_df['Per Diem'] +
-    mileage_df['Mileage Bonus']
-)
+# Shared, read-only mileage model (status, per diem, bonus and total cost already
+# computed); this session only holds a view over it
+with profiler.stage("mileage_model") as stage:
+    mileage_model = shared_mileage_model()
+    mileage_df = mileage_model.frame()
+    stage['rows'] = len(mileage_df)
+profiler.record(**memory_report(mileage_model, mileage_df))
 
 # --- NEW: Let user choose available evaluators ---
-all_evaluators = sorted(mileage_df['Evaluator'].unique())
+all_evaluators = sorted(mileage_model.active_evaluator_names())
 available_evaluators = st.multiselect(
     "Select available evaluators",
     options=all_evaluators,
     default=all_evaluators
 )
-mileage_df = mileage_df[mileage_df['Evaluator'].isin(available_evaluators)]
-
-# Load uploaded job file
-jobs_df = pd.read_excel(uploaded_job_file)
-jobs_df['Customer Company'] = jobs_df['Customer Company'].astype(str).str.strip().str.lower()
-mileage_df['Customer'] = mileage_df['Customer'].astype(str).str.strip().str.lower()
+# Availability as a mask over evaluator codes (see candidate_masks.py)
+available_mask = evaluator_mask(mileage_model, available_evaluators)
+mileage_df = mileage_df[available_mask[mileage_df['Evaluator'].cat.codes.to_numpy()]]
 
-# Fuzzy match customer names (using difflib)
+# Fuzzy match customer names (using difflib) against the lowercased customer
+# dictionary, once per distinct company; matches are stored as customer codes
 def fuzzy_match_customer(job_name, choices, threshold=0.85):
     matches = get_close_matches(job_name, choices, n=1, cutoff=threshold)
     return matches[0] if matches else None
 
-jobs_df['Matched Customer'] = jobs_df['Customer Company'].apply(
-    lambda x: fuzzy_match_customer(x, mileage_df['Customer'].unique())
-)
-
-# Infer number of evaluators needed
-jobs_df['Evaluators Needed'] = jobs_df['Assignee(s)'].apply(
-    lambda x: len(str(x).split(',')) if pd.notnull(x) else 1
-)
-
-# Create job slots
-job_slots = []
-for _, row in jobs_df.iterrows():
-    job_slots += [(row['Job number'], row['Matched Customer'])] * row['Evaluators Needed']
-
-# Define last-resort managers and penalty
+customer_names = mileage_df['Customer'].cat.categories
+choices = list(customer_names.str.lower())
+
+def match_jobs(jobs):
+    matches = {name: fuzzy_match_customer(name, choices) for name in jobs['Customer Company'].unique()}
+    return jobs.assign(**{'Matched Customer': intern_names(jobs['Customer Company'].map(matches), customer_names)})
+
+# Load uploaded job file (streamed, needed columns only; evaluators needed =
+# one per listed assignee) and match it, through the upload cache: the same
+# bytes skip both, and a file that differs in a few rows only re-matches those
+upload_cache = shared_upload_cache()
+with profiler.stage("load_jobs") as stage:
+    upload_key, upload, upload_info = load_jobs(uploaded_job_file, match_jobs, customer_names, namespace="difflib")
+    jobs_df = upload['jobs']
+    stage.update(upload_info)
+    stage['unmatched'] = int(jobs_df['Matched Customer'].isna().sum())
+render_upload_status(upload_info)
+
+# Create job slots (job number / customer code arrays, one entry per evaluator needed)
+with profiler.stage("job_slots") as stage:
+    slot_jobs, slot_customers = job_slot_arrays(jobs_df)
+    stage['rows'] = len(slot_jobs)
+
+# Define last-resort managers (penalized in the optimizer)
 last_resort_managers = ["Sherman", "Gray", "MacDonald"]
-manager_penalty = 10000
-
-# Build cost matrix with penalty
-cost_matrix = {}
-for evaluator in mileage_df['Evaluator'].unique():
-    for job_num, customer in job_slots:
-        match = mileage_df[(mileage_df['Evaluator'] == evaluator) & (mileage_df['Customer'] == customer)]
-        if not match.empty:
-            base_cost = match['Total Cost'].values[0]
-            adjusted_cost = base_cost + (manager_penalty if evaluator in last_resort_managers else 0)
-            cost_matrix[(evaluator, job_num)] = adjusted_cost
-
-# Define optimization problem
-prob = LpProblem("EvaluatorAssignment", LpMinimize)
-x = LpVariable.dicts("assign", cost_matrix.keys(), cat=LpBinary)
-
-# Objective: minimize total cost
-prob += lpSum([cost_matrix[key] * x[key] for key in cost_matrix])
-
-# Constraint: each job slot filled once
-for job_num in set(j[0] for j in job_slots):
-    prob += lpSum([x[(evaluator, job_num)] for evaluator in mileage_df['Evaluator'].unique() if (evaluator, job_num) in x]) == job_slots.count((job_num, jobs_df[jobs_df['Job number'] == job_num]['Matched Customer'].iloc[0]))
-
-# Evaluators cannot be reused (one-time use)
-for evaluator in mileage_df['Evaluator'].unique():
-    prob += lpSum([x[(evaluator, job_num)] for job_num, customer in job_slots if (evaluator, job_num) in x]) <= 1
-
-# Solve
-prob.solve()
-
-# --- Manual Selection Mode (chart shows top 5, dropdown allows all, default closest, one-time use enforced) ---
-st.subheader("Manual Selection: Chart Top 5, Choose Any Evaluator (One-Time Use)")
-selected_assignments = {}
-used_evaluators = set()
-
-def get_top_evaluators(job_customer, mileage_df, top_n=5):
-    matches = mileage_df[mileage_df['Customer'] == job_customer]
-    return matches.nsmallest(top_n, 'Total Cost')[['Evaluator','Round-Trip Miles','2026 Cost','Total Cost']]
-
-for _, job_row in jobs_df.iterrows():
-    job_num = job_row['Job number']
-    customer = job_row['Matched Customer']
-    if pd.isnull(customer):
-        continue
-    
-    # Show top 5 evaluators in chart
-    top_eval_df = get_top_evaluators(customer, mileage_df)
-    st.write(f"### Job {job_num} - {job_row['Customer Company'].title()}")
-    st.dataframe(top_eval_df)
-    
-    # Dropdown allows ALL evaluators for this customer
-    all_matches = mileage_df[mileage_df['Customer'] == customer]
-    available_evals = all_matches['Evaluator'].tolist()
-    
-    # Filter out already-used evaluators
-    selectable_evals = [e for e in available_evals if e not in used_evaluators]
-    if not selectable_evals:
-        # fallback: still show all, but mark reused ones
-        selectable_evals = available_evals
-    
-    # Default to closest among selectable
-    closest_eval = all_matches[all_matches['Evaluator'].isin(selectable_evals)].nsmallest(1, 'Total Cost')['Evaluator'].iloc[0]
-    default_index = selectable_evals.index(closest_eval) if closest_eval in selectable_evals else 0
-    
-    chosen_eval = st.selectbox(
-        f"Select evaluator for Job {job_num}",
-        options=selectable_evals,
-        index=default_index,
-        key=f"job_{job_num}"
-    )
-    
-    selected_assignments[job_num] = chosen_eval
-    used_evaluators.add(chosen_eval)
-
-# Build output from manual selections
-assignments = []
-for job_num, evaluator in selected_assignments.items():
-    job_row = jobs_df[jobs_df['Job number'] == job_num].iloc[0]
-    cost_row = mileage_df[(mileage_df['Evaluator'] == evaluator) & (mileage_df['Customer'] == job_row['Matched Customer'])].iloc[0]
-    assignment_tier = "Last Resort Manager" if evaluator in last_resort_managers else "Primary"
-    assignments.append({
-        'Job number': job_num,
-        'Customer Company': job_row['Customer Company'].title(),
-        'Evaluator': evaluator,
-        'Round-Trip Miles': round(cost_row['Round-Trip Miles'], 2),
-        '2026 Cost': round(cost_row['2026 Cost'], 2),
-        'Per Diem': cost_row['Per Diem'],
-        'Mileage Bonus': cost_row['Mileage Bonus'],
-        'Total Cost': round(cost_row['Total Cost'], 2),
-        'Status': cost_row['Status'],
-        'Assignment Tier': assignment_tier
-    })
 
-final_df = pd.DataFrame(assignments).sort_values(by=['Job number'])
+# Optimize in the assignment service. When EVALUATOR_SERVICE_URL is unset (the
+# default) the handlers, CBC included, run in-process in this Streamlit server,
+# so set it to the service for shared use. Slots may stay open at
+# UNFILLED_PENALTY each, as in the benchmark, so oversubscribed files still get
+# a plan. Plans are cached on the upload per set of available evaluators.
+with profiler.stage("optimize") as stage:
+    optimize_key = result_key("optimize", tuple(available_evaluators), CANDIDATES_K, mileage_model.version)
+    optimized = upload['results'].get(optimize_key)
+    stage['cache_hit'] = optimized is not None
+    if optimized is None:
+        try:
+            optimized = service_client.optimize(jobs_df, available_evaluators, candidates_k=CANDIDATES_K,
+                                                unfilled_penalty=UNFILLED_PENALTY)
+        except service_client.ServiceUnavailable as exc:
+            st.error(f"Optimization failed: {exc}")
+            st.stop()
+        upload_cache.store_result(upload_key, optimize_key, optimized)
+    stage['rows'] = optimized['job_slots']
+for job in optimized.get('unassigned', []):
+    st.warning(f"Job {job['job_number']} was not optimized: {job['reason']} ({job['customer']}).")
+if optimized.get('unfilled_slots'):
+    st.warning(f"{optimized['unfilled_slots']} of {optimized['job_slots']} job slot(s) left unfilled: "
+               "not enough available evaluators can cover them.")
+profiler.record(variables=optimized['variables'], constraints=optimized['constraints'],
+                status=optimized['status'], solver_seconds=optimized['seconds'])
+
+# --- Cost vs. drive time: efficient plans between the cheapest and the shortest total drive ---
+st.subheader("Cost vs. Drive Time")
+if st.checkbox("Compare plans by total drive time", key="show_frontier"):
+    frontier_points = st.slider("Frontier points", min_value=3, max_value=15, value=8)
+    with profiler.stage("frontier") as stage:
+        frontier_key = result_key("frontier", tuple(available_evaluators), frontier_points, CANDIDATES_K,
+                                  mileage_model.version)
+        frontier = upload['results'].get(frontier_key)
+        stage['cache_hit'] = frontier is not None
+        if frontier is None:
+            try:
+                frontier = service_client.frontier(jobs_df, available_evaluators, points=frontier_points,
+                                                   candidates_k=CANDIDATES_K, unfilled_penalty=UNFILLED_PENALTY)
+            except service_client.ServiceUnavailable as exc:
+                st.error(f"Frontier failed: {exc}")
+                st.stop()
+            upload_cache.store_result(upload_key, frontier_key, frontier)
+        stage['rows'] = len(frontier['points'])
+    if not frontier['points']:
+        st.warning(f"No feasible plan for the available evaluators ({frontier['status']}).")
+    else:
+        if frontier['status'] != "Optimal":
+            st.info(f"Only the cheapest plan is shown: the drive time solve ended {frontier['status']}.")
+        points_df = pd.DataFrame(frontier['points']).drop(columns=['assignments'])
+        st.caption(f"{len(points_df)} efficient plan(s) from {frontier['solves']} warm-started solves in "
+                   f"{frontier['seconds']:.2f}s (a single solve took {frontier['first_solve_seconds']:.2f}s).")
+        st.line_chart(points_df, x='Drive Time (min)', y='Total Cost')
+        st.dataframe(points_df[['Point', 'Total Cost', 'Drive Time (min)', 'Last Resort', 'Assigned']],
+                     hide_index=True)
+        point = st.selectbox("Plan", points_df['Point'], format_func=lambda p: (
+            f"Point {p}: ${points_df.loc[p - 1, 'Total Cost']:,.2f}, "
+            f"{points_df.loc[p - 1, 'Drive Time (min)']:,.0f} min driving"))
+        plan = [(a['evaluator'], a['job_number']) for a in frontier['points'][point - 1]['assignments']]
+        plan_df = build_assignment_output(plan, jobs_df, mileage_df)
+        st.dataframe(plan_df, use_container_width=True)
+        render_downloads(plan_df, f"evaluator_plan_point_{point}", "Download Selected Plan", key="frontier_plan")
+
+# --- N-1 contingency: cost of losing each evaluator in the optimized plan ---
+st.subheader("If an Evaluator Drops Out")
+if st.checkbox("Analyze the cost of losing each assigned evaluator", key="show_contingency"):
+    if optimized['status'] != "Optimal":
+        st.warning(f"No optimized plan to analyze ({optimized['status']}).")
+    else:
+        with profiler.stage("contingency") as stage:
+            contingency_key = result_key("contingency", optimize_key)
+            contingency = upload['results'].get(contingency_key)
+            stage['cache_hit'] = contingency is not None
+            if contingency is None:
+                try:
+                    contingency = service_client.contingency(jobs_df, available_evaluators, optimized['assignments'],
+                                                             candidates_k=CANDIDATES_K,
+                                                             unfilled_penalty=UNFILLED_PENALTY)
+                except service_client.ServiceUnavailable as exc:
+                    st.error(f"Contingency analysis failed: {exc}")
+                    st.stop()
+                upload_cache.store_result(upload_key, contingency_key, contingency)
+            stage['rows'] = len(contingency)
+        contingency_df = pd.DataFrame(contingency)
+        uncoverable = int(contingency_df['Uncoverable'].sum()) if len(contingency_df) else 0
+        if uncoverable:
+            st.error(f"{uncoverable} evaluator(s) cannot be replaced by anyone available.")
+        st.caption("Extra cost of the best repaired plan if the evaluator becomes unavailable, worst first. "
+                   "Moves lists who shifts to refill the slot; a slot left unfilled costs "
+                   f"${UNFILLED_PENALTY:,.0f}.")
+        st.dataframe(contingency_df, use_container_width=True, hide_index=True,
+                     column_config={'Cost Delta': st.column_config.NumberColumn(format="$%.2f")})
+
+# --- Manual Selection Mode: one editable grid, defaults are the closest unused evaluators ---
+st.subheader("Manual Selection: Edit the Evaluator Column (One-Time Use)")
+
+# The grid (defaults, evaluator -> job reverse map, running total) is kept in
+# the session, so a rerun only applies the rows that changed; overriding one
+# job never reshuffles the others (see assignment_grid.py)
+matched_jobs = jobs_df[jobs_df['Matched Customer'].notna()]
+grid_key = result_key("assignment_grid", upload_key, tuple(available_evaluators), mileage_model.version)
+if st.session_state.get('assignment_grid_key') != grid_key:
+    grid = AssignmentGrid(mileage_model, matched_jobs['Matched Customer'].cat.codes, available=available_mask)
+    st.session_state['assignment_grid'] = grid
+    st.session_state['assignment_grid_base'] = pd.DataFrame({
+        'Job number': matched_jobs['Job number'].to_numpy(),
+        'Customer Company': matched_jobs['Customer Company'].str.title().to_numpy(),
+        'Evaluator': [mileage_model.evaluator_names[c] if c >= 0 else None for c in grid.default_codes],
+        'Cheapest 5 (Total Cost)': grid.top_text(),
+    })
+    st.session_state['assignment_grid_key'] = grid_key
+grid = st.session_state['assignment_grid']
+
+edited_df = st.data_editor(
+    st.session_state['assignment_grid_base'],
+    key=f"assignment_grid_{grid_key[:16]}",
+    hide_index=True,
+    use_container_width=True,
+    disabled=['Job number', 'Customer Company', 'Cheapest 5 (Total Cost)'],
+    column_config={'Evaluator': st.column_config.SelectboxColumn(
+        "Evaluator", options=available_evaluators, required=False,
+        help="Defaults to the cheapest evaluator not already used by an earlier job"
+    )},
+)
+with profiler.stage("manual_grid") as stage:
+    stage['changed'] = len(grid.update(grid.codes_for(edited_df['Evaluator'])))
+
+# Jobs left open (from the grid as edited, not the defaults): no evaluator
+# picked, a conflicting override, or no mileage for the pick
+grid_jobs = matched_jobs['Job number'].to_numpy()
+for job, has_candidates, has_free in grid.open_jobs():
+    if not has_candidates:
+        st.warning(f"No available evaluator has mileage for Job {grid_jobs[job]}.")
+    elif has_free:
+        st.warning(f"Job {grid_jobs[job]} has no evaluator. Pick one in the grid.")
+    else:
+        st.warning(f"Job {grid_jobs[job]}: all available evaluators with mileage for this customer are "
+                   "already assigned to other jobs. Free one up or pick one in the grid.")
+for job, code, holder in grid.conflicts():
+    name = mileage_model.evaluator_names[code]
+    st.warning(f"Job {grid_jobs[job]}: {name} is already assigned to Job {grid_jobs[holder]}. "
+               f"Job {grid_jobs[job]} stays open until {name} is free.")
+for job in grid.unpriced():
+    st.warning(f"Job {grid_jobs[job]}: {mileage_model.evaluator_names[grid.requested[job]]} has no mileage "
+               "for this customer.")
+
+# Build output from the grid (one mileage row per assigned job)
+assigned_jobs = grid.assigned_jobs()
+job_numbers = grid_jobs[assigned_jobs]
+cost_df = mileage_model.frame(grid.rows[assigned_jobs].astype(np.int64))
+final_df = pd.DataFrame({
+    'Job number': job_numbers,
+    'Customer Company': matched_jobs['Customer Company'].str.title().to_numpy()[assigned_jobs],
+    'Evaluator': cost_df['Evaluator'].astype(str).to_numpy(),
+    'Round-Trip Miles': cost_df['Round-Trip Miles'].round(2).to_numpy(),
+    '2026 Cost': cost_df['2026 Cost'].round(2).to_numpy(),
+    'Per Diem': cost_df['Per Diem'].to_numpy(),
+    'Mileage Bonus': cost_df['Mileage Bonus'].to_numpy(),
+    'Total Cost': cost_df['Total Cost'].round(2).to_numpy(),
+    'Status': cost_df['Status'].astype(str).to_numpy(),
+    'Assignment Tier': np.where(cost_df['Evaluator'].isin(last_resort_managers), "Last Resort Manager", "Primary"),
+}).sort_values(by=['Job number'])
 
 # Display detailed results
 st.subheader("Final Assignments (Detailed)")
 st.dataframe(final_df, use_container_width=True)
 
-# Grand total
-grand_total = final_df['Total Cost'].sum()
+# Grand total (kept up to date by the grid, change by change)
+grand_total = grid.total
 st.markdown(f"### Grand Total Cost: ${grand_total:,.2f}")
 
+# Download button (encoded only when clicked)
+render_downloads(final_df, "optimized_evaluator_assignments", "Download Assignment Table")
+
+# Save the confirmed plan to the assignment history (see evaluator_history_app.py)
+render_confirm_button(final_df, jobs_df, page="evaluator_optomization_app4", source=uploaded_job_file.name)
+
+# Debug panel and run log
+profiler.record(assignments=len(final_df))
+profiler.append_log()
+render_debug_panel(profiler)
+
 
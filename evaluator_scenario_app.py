@@ -0,0 +1,87 @@
+import streamlit as st
+import os
+from evaluator_core import match_customers
+from mileage_model import shared_mileage_model
+from scenario_sweep import CURRENT_RULES, format_tiers, parse_tiers, scenario_grid, sweep
+from upload_cache import load_jobs, render_upload_status, result_key, shared_upload_cache
+from exports import render_downloads
+
+st.set_page_config(page_title="Cost Rule Scenarios", layout="wide")
+st.title("Cost Rule Scenarios")
+
+# Upload job file
+uploaded_job_file = st.file_uploader("Upload a Job File (.xlsx)", type=["xlsx"])
+if uploaded_job_file is None:
+    st.warning("Please upload a job file to continue.")
+    st.stop()
+
+# Load static files
+required_files = ["Evaluator_Customer_Mileage.csv", "Evaluators_FullTime.csv"]
+missing = [f for f in required_files if not os.path.exists(f)]
+if missing:
+    st.error(f"Missing required file(s): {', '.join(missing)}. Please upload them to proceed.")
+    st.stop()
+
+mileage_model = shared_mileage_model()
+mileage_df = mileage_model.frame()
+
+# Parse and match the job file through the upload cache (same cache as the other pages)
+upload_cache = shared_upload_cache()
+upload_key, upload, upload_info = load_jobs(
+    uploaded_job_file, lambda jobs: match_customers(jobs, mileage_df['Customer']),
+    mileage_df['Customer'].cat.categories, namespace="rapidfuzz"
+)
+render_upload_status(upload_info)
+jobs_df = upload['jobs']
+
+# Parameter grid: comma-separated values per rule (bonus tier sets separated by ";")
+st.sidebar.header("Cost rules to compare")
+def number_list(label, default):
+    text = st.sidebar.text_input(label, f"{default:g}")
+    return [float(v) for v in text.split(",") if v.strip()]
+
+try:
+    grid = {
+        'Mile Rate': number_list("Mile rates ($/mile)", CURRENT_RULES['Mile Rate']),
+        'Per Diem': number_list("Per diem amounts ($)", CURRENT_RULES['Per Diem']),
+        'Per Diem Miles': number_list("Per diem above (round-trip miles)", CURRENT_RULES['Per Diem Miles']),
+        'Bonus Tiers': [parse_tiers(t) for t in st.sidebar.text_input(
+            "Bonus tiers (miles:amount, sets separated by ;)", format_tiers(CURRENT_RULES['Bonus Tiers'])
+        ).split(";")],
+        'Manager Penalty': number_list("Manager penalties ($)", CURRENT_RULES['Manager Penalty']),
+    }
+    scenarios = scenario_grid(grid)
+except ValueError as exc:
+    st.error(f"Could not read the scenario grid: {exc}")
+    st.stop()
+
+# Sweep results are cached on the upload per grid
+sweep_key = result_key("sweep", scenarios['Scenario'].tolist(), mileage_model.version)
+cached = upload['results'].get(sweep_key)
+if cached is None:
+    with st.spinner(f"Solving {len(scenarios)} scenario(s)..."):
+        cached = sweep(jobs_df, mileage_df, scenarios)
+    upload_cache.store_result(upload_key, sweep_key, cached)
+results, stats = cached
+st.caption(f"{len(results)} scenario(s), {stats['solves']} distinct solve(s) over {stats['pairs']} "
+           f"candidate pairs for {stats['job_slots']} job slots. The first row is the current rules.")
+
+# Comparison table and chart (scenarios the solver did not finish have no
+# costs and are left out of the chart)
+results = results.assign(**{'Bonus Tiers': results['Bonus Tiers'].map(format_tiers)})
+solved = results['Status'] == "Optimal"
+if not solved.all():
+    st.warning(f"{int((~solved).sum())} scenario(s) were not solved "
+               f"({', '.join(sorted(results.loc[~solved, 'Status'].unique()))}) and are left out of the comparison.")
+if solved.any() and results.loc[solved, 'Unfilled'].max() > 0:
+    st.info(f"{int(results.loc[solved, 'Unfilled'].max())} job slot(s) cannot be filled in any scenario "
+            "(not enough evaluators with mileage); totals cover the filled slots.")
+st.subheader("Scenario Comparison")
+st.dataframe(results.drop(columns=['Current Rules']), use_container_width=True, hide_index=True)
+
+if solved.any():
+    st.subheader("Total Cost by Scenario")
+    chart_cols = ['Total Cost', 'Current Plan Cost'] if 'Current Plan Cost' in results.columns else ['Total Cost']
+    st.bar_chart(results[solved].set_index('Scenario')[chart_cols], stack=False, horizontal=True)
+
+render_downloads(results, "cost_rule_scenarios", "Download Scenario Table")
\ No newline at end of file
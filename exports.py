@@ -0,0 +1,229 @@
+import io
+import os
+import re
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from importlib.util import find_spec
+
+import pandas as pd
+
+import evaluator_core as core
+from upload_cache import fingerprint
+
+# Result tables as download bytes. The pages used to build to_csv().encode() on
+# every rerun just to feed st.download_button; render_downloads hands the
+# buttons a callable instead (Streamlit 1.52+), so a table is only encoded when
+# its download is requested. Tables are written in chunks of CHUNK_ROWS rows (no
+# full-table string or object copy) into one buffer: st.download_button serves
+# a complete file, so the finished bytes are held in memory rather than
+# streamed to the browser. The bytes are cached per table hash and format
+# (EVALUATOR_EXPORT_CACHE_MB, least recently used first), so downloading the
+# same result again, or from another session, does not re-encode it.
+#
+#   csv      one file
+#   xlsx     one sheet per region: the customer's state from
+#            Customer_Locations.csv, else the evaluator's home state
+#            (Evaluators_FullTime.csv, Evaluator_Locations.csv), else Other
+#   parquet  row groups of CHUNK_ROWS rows (needs pyarrow)
+
+CHUNK_ROWS = 50_000
+MAX_BYTES = int(float(os.environ.get("EVALUATOR_EXPORT_CACHE_MB", "64")) * 2 ** 20)
+OTHER_REGION = "Other"
+FORMATS = {
+    'csv': ("CSV", "csv", "text/csv"),
+    'xlsx': ("Excel", "xlsx", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"),
+    'parquet': ("Parquet", "parquet", "application/vnd.apache.parquet"),
+}
+
+
+def available_formats():
+    return [fmt for fmt in FORMATS if fmt != 'parquet' or find_spec("pyarrow") is not None]
+
+
+def table_hash(df):
+    row_hashes = pd.util.hash_pandas_object(df, index=False).to_numpy()
+    return fingerprint(row_hashes.tobytes(), namespace=repr(list(df.columns)))
+
+
+def _chunks(df, chunk_rows=CHUNK_ROWS):
+    for start in range(0, len(df), chunk_rows):
+        yield df.iloc[start:start + chunk_rows]
+
+
+# CSV bytes chunk by chunk (the header only with the first one)
+def csv_chunks(df, chunk_rows=CHUNK_ROWS):
+    if df.empty:
+        yield df.to_csv(index=False).encode('utf-8')
+        return
+    for i, chunk in enumerate(_chunks(df, chunk_rows)):
+        yield chunk.to_csv(index=False, header=i == 0).encode('utf-8')
+
+
+def to_csv_bytes(df, chunk_rows=CHUNK_ROWS):
+    buffer = io.BytesIO()
+    for part in csv_chunks(df, chunk_rows):
+        buffer.write(part)
+    return buffer.getvalue()
+
+
+# Name -> state from a locations file (empty when the file is missing)
+def _states(path, name_col):
+    if not os.path.exists(path):
+        return pd.Series(dtype=object)
+    locations = pd.read_csv(path, dtype=str)
+    locations.columns = locations.columns.str.strip()
+    if name_col not in locations.columns or 'State' not in locations.columns:
+        return pd.Series(dtype=object)
+    states = pd.Series(locations['State'].str.strip().str.upper().to_numpy(),
+                       index=locations[name_col].str.strip().str.lower().to_numpy())
+    return states[states.notna() & (states != "")]
+
+
+def _stamp(*paths):
+    return tuple((path, os.path.getmtime(path)) for path in paths if os.path.exists(path))
+
+
+# distance_engine (and the mileage model it loads) is imported only when a
+# region split is asked for, not by every page that offers a download
+@lru_cache(maxsize=2)
+def _region_lookups(stamp):
+    import distance_engine as de
+
+    evaluators = pd.concat([_states(core.FULL_TIME_FILE, 'Last Name'),
+                            _states(de.EVALUATOR_LOCATIONS_FILE, 'Evaluator')])
+    customers = _states(de.CUSTOMER_LOCATIONS_FILE, 'Customer')
+    return (customers[~customers.index.duplicated(keep='last')],
+            evaluators[~evaluators.index.duplicated(keep='last')])
+
+
+def _lookup(values, states):
+    names = pd.Series(values, dtype=object).astype(str).str.strip().str.lower()
+    return names.map(states).to_numpy(dtype=object)
+
+
+# Region per row of a result table (customer state, else evaluator state)
+def region_labels(df):
+    import distance_engine as de
+
+    customer_states, evaluator_states = _region_lookups(
+        _stamp(de.CUSTOMER_LOCATIONS_FILE, core.FULL_TIME_FILE, de.EVALUATOR_LOCATIONS_FILE)
+    )
+    regions = pd.Series(OTHER_REGION, index=range(len(df)), dtype=object)
+    for column, states in [('Evaluator', evaluator_states), ('Customer', customer_states),
+                           ('Customer Company', customer_states)]:
+        if column in df.columns and len(states):
+            found = _lookup(df[column].to_numpy(), states)
+            regions = regions.where(pd.isna(found), found)
+    return regions.to_numpy()
+
+
+def sheet_name(region, used):
+    name = re.sub(r"[\[\]:*?/\\]", " ", str(region)).strip()[:31] or OTHER_REGION
+    base, n = name, 2
+    while name.lower() in used:
+        suffix = f" ({n})"
+        name, n = base[:31 - len(suffix)] + suffix, n + 1
+    used.add(name.lower())
+    return name
+
+
+def to_xlsx_bytes(df, regions=None, chunk_rows=CHUNK_ROWS):
+    from openpyxl import Workbook
+
+    regions = region_labels(df) if regions is None else regions
+    labels = sorted(set(regions) - {OTHER_REGION}) + ([OTHER_REGION] if OTHER_REGION in set(regions) else [])
+    workbook = Workbook(write_only=True)
+    used = set()
+    for label in labels or [OTHER_REGION]:
+        sheet = workbook.create_sheet(sheet_name(label, used))
+        sheet.append([str(c) for c in df.columns])
+        for chunk in _chunks(df[regions == label] if labels else df, chunk_rows):
+            values = chunk.astype(object).where(chunk.notna(), None)
+            for row in values.itertuples(index=False, name=None):
+                sheet.append(row)
+    buffer = io.BytesIO()
+    workbook.save(buffer)
+    return buffer.getvalue()
+
+
+def to_parquet_bytes(df, chunk_rows=CHUNK_ROWS):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    try:
+        schema = pa.Schema.from_pandas(df, preserve_index=False)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        # Mixed-type text columns (e.g. job numbers read as int and str)
+        mixed = [c for c in df.columns if df[c].dtype == object]
+        df = df.assign(**{c: df[c].map(lambda v: v if pd.isna(v) else str(v)) for c in mixed})
+        schema = pa.Schema.from_pandas(df, preserve_index=False)
+    buffer = io.BytesIO()
+    with pq.ParquetWriter(buffer, schema) as writer:
+        for chunk in _chunks(df, chunk_rows):
+            writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+    return buffer.getvalue()
+
+
+ENCODERS = {'csv': to_csv_bytes, 'xlsx': to_xlsx_bytes, 'parquet': to_parquet_bytes}
+
+
+class ExportCache:
+    def __init__(self, max_bytes=MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def nbytes(self):
+        return sum(len(data) for data in self.entries.values())
+
+    def get(self, key):
+        with self.lock:
+            data = self.entries.get(key)
+            if data is not None:
+                self.entries.move_to_end(key)
+            return data
+
+    def put(self, key, data):
+        with self.lock:
+            self.entries[key] = data
+            self.entries.move_to_end(key)
+            while len(self.entries) > 1 and self.nbytes() > self.max_bytes:
+                self.entries.popitem(last=False)
+
+
+# One cache per server process, shared by every session
+@lru_cache(maxsize=1)
+def shared_export_cache():
+    return ExportCache()
+
+
+def export_bytes(df, fmt, cache=None):
+    cache = shared_export_cache() if cache is None else cache
+    key = (table_hash(df), fmt)
+    data = cache.get(key)
+    if data is None:
+        data = ENCODERS[fmt](df)
+        cache.put(key, data)
+    return data
+
+
+# One download button per format; nothing is encoded until a button is clicked
+def render_downloads(df, file_stem, label, key=None):
+    import streamlit as st
+
+    formats = available_formats()
+    for column, fmt in zip(st.columns(len(formats)), formats):
+        name, extension, mime = FORMATS[fmt]
+        column.download_button(
+            label=f"{label} as {name}",
+            data=lambda fmt=fmt: export_bytes(df, fmt),
+            file_name=f"{file_stem}.{extension}",
+            mime=mime,
+            key=f"{key or file_stem}_{fmt}",
+            on_click="ignore",
+            disabled=df.empty,
+        )
@@ -0,0 +1,125 @@
+import json
+import os
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+# Per-stage wall time / peak memory / row counts for the Streamlit pages.
+# Each page run is appended to a JSONL log so latencies can be tracked over time:
+#
+#   python instrumentation.py run_log.jsonl     -> p50/p95 per page and stage
+#
+# Every stage records its resident-memory change (rss_delta_mb: RSS at the end
+# minus RSS at the start, read from /proc on Linux; left out elsewhere). It is
+# cheap but not a peak: memory freed before the stage ends does not show.
+# The true peak per stage (peak_mb) is opt-in (EVALUATOR_TRACE_MEMORY=1):
+# tracemalloc slows every allocation, so it only runs inside a profiled stage
+# and stops after it. Both are process-wide, so on a server with several
+# sessions running at once a stage's numbers also count the other sessions'
+# allocations; use a quiet server or a local run for exact figures.
+
+RUN_LOG = os.environ.get("EVALUATOR_RUN_LOG", "run_log.jsonl")
+TRACE_MEMORY = os.environ.get("EVALUATOR_TRACE_MEMORY", "").strip().lower() in ("1", "true", "yes")
+
+
+# Resident set size of this process in bytes (None where /proc is missing)
+def rss_bytes():
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError, IndexError):
+        return None
+
+
+class RunProfiler:
+    def __init__(self, page, trace_memory=TRACE_MEMORY):
+        self.page = page
+        self.trace_memory = trace_memory
+        self.stages = []
+        self.info = {}
+        self.started = time.perf_counter()
+
+    # Time a block; the yielded dict takes extra fields such as rows
+    @contextmanager
+    def stage(self, name):
+        entry = {'stage': name}
+        # Only the stage that started tracing stops it (stages may nest)
+        owns_trace = self.trace_memory and not tracemalloc.is_tracing()
+        if owns_trace:
+            tracemalloc.start()
+        if self.trace_memory:
+            tracemalloc.reset_peak()
+            base, _ = tracemalloc.get_traced_memory()
+        rss_start = rss_bytes()
+        start = time.perf_counter()
+        try:
+            yield entry
+        finally:
+            entry['seconds'] = round(time.perf_counter() - start, 6)
+            rss_end = rss_bytes()
+            if rss_start is not None and rss_end is not None:
+                entry['rss_delta_mb'] = round((rss_end - rss_start) / 2 ** 20, 3)
+            if self.trace_memory and tracemalloc.is_tracing():
+                _, peak = tracemalloc.get_traced_memory()
+                entry['peak_mb'] = round(max(peak - base, 0) / 2 ** 20, 3)
+            if owns_trace:
+                tracemalloc.stop()
+            self.stages.append(entry)
+
+    # Run-level facts (model size, status, ...)
+    def record(self, **info):
+        self.info.update(info)
+
+    def to_record(self):
+        return {
+            'timestamp': datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            'page': self.page,
+            'total_seconds': round(time.perf_counter() - self.started, 6),
+            'stages': self.stages,
+            **self.info,
+        }
+
+    def append_log(self, path=None):
+        record = self.to_record()
+        try:
+            with open(path or RUN_LOG, "a") as f:
+                f.write(json.dumps(record, default=str) + "\n")
+        except OSError:
+            pass
+        return record
+
+
+# Collapsible debug panel with the stage table and run facts
+def render_debug_panel(profiler):
+    import pandas as pd
+    import streamlit as st
+
+    with st.expander("Debug: stage timings", expanded=False):
+        record = profiler.to_record()
+        stages_df = pd.DataFrame(record['stages'])
+        st.dataframe(stages_df, use_container_width=True)
+        st.write(f"Total: {record['total_seconds']:.3f}s")
+        if profiler.info:
+            st.json(profiler.info)
+
+
+# p50/p95 seconds per page and stage from the run log
+def latency_summary(path=None):
+    import pandas as pd
+
+    with open(path or RUN_LOG) as f:
+        records = [json.loads(line) for line in f if line.strip()]
+    rows = []
+    for record in records:
+        rows.append({'page': record['page'], 'stage': 'total', 'seconds': record['total_seconds']})
+        rows += [{'page': record['page'], 'stage': s['stage'], 'seconds': s['seconds']} for s in record['stages']]
+    runs_df = pd.DataFrame(rows)
+    return runs_df.groupby(['page', 'stage'], sort=False)['seconds'].describe(percentiles=[0.5, 0.95])[
+        ['count', '50%', '95%', 'max']
+    ].rename(columns={'50%': 'p50', '95%': 'p95'})
+
+
+if __name__ == "__main__":
+    print(latency_summary(sys.argv[1] if len(sys.argv) > 1 else None).to_string())
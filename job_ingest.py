@@ -0,0 +1,78 @@
+import numpy as np
+import pandas as pd
+
+# Streaming reader for uploaded job workbooks. Rows are pulled one at a time
+# from openpyxl's read-only parser and only the columns the pipeline uses are
+# kept, so large job files never load the whole workbook into memory.
+
+REQUIRED_COLUMNS = ['Job number', 'Customer Company', 'Assignee(s)']
+OPTIONAL_COLUMNS = ['Job Date']
+
+
+def _blank(value):
+    return value is None or (isinstance(value, str) and not value.strip())
+
+
+# Job numbers are integers in the exports; fall back to text if any are not,
+# with whole numbers written as integers (12345, not 12345.0). Blanks are
+# dropped by read_jobs before this runs.
+def _job_numbers(values):
+    raw = pd.Series(values, dtype=object)
+    numbers = pd.to_numeric(raw, errors='coerce')
+    whole = numbers.notna() & (numbers == numbers.round())
+    if whole.all():
+        return numbers.astype('int64')
+    text = raw.astype(str).str.strip()
+    typed = whole & ~raw.map(lambda value: isinstance(value, str))
+    text[typed] = numbers[typed].astype('int64').astype(str)
+    return text
+
+
+def read_jobs(job_file, columns=REQUIRED_COLUMNS, optional=OPTIONAL_COLUMNS):
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(job_file, read_only=True, data_only=True)
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        header = [str(cell).strip() if cell is not None else "" for cell in next(rows, ())]
+        missing = [name for name in columns if name not in header]
+        if missing:
+            raise ValueError(f"Job file is missing column(s): {', '.join(missing)}")
+        wanted = list(columns) + [name for name in optional if name in header]
+        positions = [header.index(name) for name in wanted]
+        values = {name: [] for name in wanted}
+        number_position = header.index('Job number')
+        for row in rows:
+            # Rows without a job number cannot be assigned or reported
+            if row is None or number_position >= len(row) or _blank(row[number_position]):
+                continue
+            for name, position in zip(wanted, positions):
+                values[name].append(row[position] if position < len(row) else None)
+    finally:
+        workbook.close()
+
+    jobs_df = pd.DataFrame({
+        'Job number': _job_numbers(values['Job number']),
+        'Customer Company': pd.Series(values['Customer Company'], dtype=object).fillna("")
+                              .astype(str).str.strip().str.lower(),
+        'Assignee(s)': pd.Series(values['Assignee(s)'], dtype='string'),
+    })
+    if 'Job Date' in values:
+        jobs_df['Job Date'] = pd.to_datetime(pd.Series(values['Job Date'], dtype=object), errors='coerce')
+    jobs_df['Evaluators Needed'] = evaluators_needed(jobs_df['Assignee(s)'])
+    return jobs_df
+
+
+# One evaluator per comma-separated assignee, one when the cell is empty
+def evaluators_needed(assignees):
+    return (assignees.astype('string').str.count(',').fillna(0) + 1).astype('int64')
+
+
+# Job slots as parallel arrays (job number and customer code repeated once per
+# evaluator needed); unmatched jobs are skipped
+def job_slot_arrays(jobs_df):
+    matched = jobs_df['Matched Customer'].notna().to_numpy()
+    needed = jobs_df['Evaluators Needed'].to_numpy()[matched]
+    job_numbers = np.repeat(jobs_df['Job number'].to_numpy()[matched], needed)
+    customer_codes = np.repeat(jobs_df['Matched Customer'].cat.codes.to_numpy()[matched], needed)
+    return job_numbers, customer_codes
@@ -0,0 +1,164 @@
+import os
+import shutil
+import sys
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+import evaluator_core as core
+
+# Delta files for the mileage matrix, so onboarding a customer or evaluator does
+# not mean regenerating Evaluator_Customer_Mileage.csv. Drop CSVs into
+# EVALUATOR_MILEAGE_DELTAS (default mileage_deltas/); they are applied in file
+# name order on top of the base CSV:
+#
+#   Evaluator,Customer,One-Way Miles,Round-Trip Miles,Drive Time (min),Action
+#   Barnhart,New Customer Inc,40,80,75,upsert      new pair or updated miles
+#   Barnhart,Old Customer Co,,,,delete             drop one pair
+#   Sherman,,,,,retire                             drop every pair for an evaluator
+#
+# Within one file, retires apply first, then deletes, then upserts, whatever
+# the row order (so an upsert re-adds a pair the same file deletes). The live
+# model and compaction follow the same rule.
+#
+# An optional Estimated column (true/false) marks pairs filled in by
+# distance_engine.py; measured upserts clear the flag.
+#
+# Action defaults to upsert. The running model merges new deltas incrementally
+# (mileage_model.shared_mileage_model); compaction folds them into the base CSV:
+#
+#   python mileage_delta.py compact
+
+DELTA_DIR = os.environ.get("EVALUATOR_MILEAGE_DELTAS", "mileage_deltas")
+ACTIONS = ["upsert", "delete", "retire"]
+MILE_COLS = ['One-Way Miles', 'Round-Trip Miles', 'Drive Time (min)']
+
+
+# Pending delta files as (path, mtime, size), in the order they apply
+def list_deltas(delta_dir=DELTA_DIR):
+    if not os.path.isdir(delta_dir):
+        return []
+    names = sorted(name for name in os.listdir(delta_dir) if name.lower().endswith(".csv"))
+    paths = [os.path.join(delta_dir, name) for name in names]
+    return [(path, os.path.getmtime(path), os.path.getsize(path)) for path in paths]
+
+
+def read_delta(path):
+    delta_df = pd.read_csv(path)
+    delta_df.columns = delta_df.columns.str.strip()
+    if 'Evaluator' not in delta_df.columns:
+        raise ValueError(f"{path}: delta files need an Evaluator column")
+    if 'Action' not in delta_df.columns:
+        delta_df['Action'] = "upsert"
+    delta_df['Action'] = delta_df['Action'].fillna("upsert").astype(str).str.strip().str.lower()
+    unknown = sorted(set(delta_df['Action']) - set(ACTIONS))
+    if unknown:
+        raise ValueError(f"{path}: unknown action(s) {', '.join(unknown)}")
+    if 'Customer' not in delta_df.columns:
+        delta_df['Customer'] = np.nan
+    for name in ['Evaluator', 'Customer']:
+        delta_df[name] = delta_df[name].astype('string').str.strip()
+    if (delta_df['Action'] != "retire").any() and delta_df.loc[delta_df['Action'] != "retire", 'Customer'].isna().any():
+        raise ValueError(f"{path}: upsert and delete rows need a Customer")
+    for name in MILE_COLS:
+        delta_df[name] = pd.to_numeric(delta_df[name], errors='coerce') if name in delta_df.columns else np.nan
+    delta_df['Estimated'] = core.parse_flag(delta_df['Estimated']) if 'Estimated' in delta_df.columns else False
+    return delta_df
+
+
+def _pair_keys(mileage_df):
+    return (mileage_df['Evaluator'].astype(str).str.strip().str.lower() + "\x1f" +
+            mileage_df['Customer'].astype(str).str.strip().str.lower())
+
+
+def _money(values):
+    return pd.Series(values).map(lambda v: f"${v:,.2f} " if v else " $-   ")
+
+
+def _parse_money(values):
+    cleaned = pd.Series(values).astype(str).str.replace(r"[$,\s]", "", regex=True).replace("-", "0")
+    return pd.to_numeric(cleaned, errors='coerce').fillna(0).to_numpy()
+
+
+def _raw_column(mileage_df, name):
+    return next((c for c in mileage_df.columns if c.strip() == name), None)
+
+
+# Apply one delta to the raw mileage CSV layout (used by compaction). Rows the
+# delta adds or changes get their export cost columns refreshed from the miles.
+def apply_to_frame(mileage_df, delta_df, mile_rate=core.MILE_RATE):
+    mileage_df = mileage_df.copy()
+    touched = np.zeros(len(mileage_df), dtype=bool)
+    for action in ["retire", "delete", "upsert"]:
+        rows = delta_df[delta_df['Action'] == action]
+        if rows.empty:
+            continue
+        if action == "retire":
+            retired = set(rows['Evaluator'].str.lower())
+            keep = ~mileage_df['Evaluator'].astype(str).str.strip().str.lower().isin(retired).to_numpy()
+        elif action == "delete":
+            keep = ~_pair_keys(mileage_df).isin(set(_pair_keys(rows))).to_numpy()
+        else:
+            rows = rows.drop_duplicates(subset=['Evaluator', 'Customer'], keep='last')
+            position = pd.Index(_pair_keys(mileage_df)).get_indexer(_pair_keys(rows))
+            update = position >= 0
+            if 'Estimated' not in mileage_df.columns and rows['Estimated'].any():
+                mileage_df['Estimated'] = False
+            for name in MILE_COLS + ['Estimated']:
+                if name in mileage_df.columns:
+                    mileage_df.iloc[position[update], mileage_df.columns.get_loc(name)] = rows.loc[update, name].to_numpy()
+            touched[position[update]] = True
+            added = rows.loc[~update, ['Evaluator', 'Customer'] + MILE_COLS + ['Estimated']]
+            added = added[[c for c in added.columns if c in mileage_df.columns]].astype({'Evaluator': object, 'Customer': object})
+            mileage_df = pd.concat([mileage_df, added], ignore_index=True)
+            touched = np.concatenate([touched, np.ones(len(added), dtype=bool)])
+            continue
+        mileage_df = mileage_df[keep].reset_index(drop=True)
+        touched = touched[keep]
+
+    cost_col, bonus_col, total_col = (_raw_column(mileage_df, name) for name in ["2026 Cost", "Bonus", "Total"])
+    if cost_col and touched.any():
+        cost = pd.to_numeric(mileage_df.loc[touched, 'Round-Trip Miles'], errors='coerce').fillna(0).to_numpy() * mile_rate
+        bonus = _parse_money(mileage_df.loc[touched, bonus_col]) if bonus_col else 0
+        mileage_df.loc[touched, cost_col] = _money(cost).to_numpy()
+        if bonus_col:
+            mileage_df.loc[touched, bonus_col] = _money(bonus).to_numpy()
+        if total_col:
+            mileage_df.loc[touched, total_col] = _money(cost + bonus).to_numpy()
+    return mileage_df
+
+
+# Fold every pending delta into the base CSV (written atomically) and move the
+# applied files to DELTA_DIR/applied
+def compact(mileage_path=core.MILEAGE_FILE, delta_dir=DELTA_DIR):
+    deltas = list_deltas(delta_dir)
+    if not deltas:
+        return 0
+    mileage_df = pd.read_csv(mileage_path)
+    columns = list(mileage_df.columns)
+    mileage_df.columns = mileage_df.columns.str.strip()
+    for path, _, _ in deltas:
+        mileage_df = apply_to_frame(mileage_df, read_delta(path))
+    mileage_df.columns = [next((c for c in columns if c.strip() == name), name) for name in mileage_df.columns]
+
+    directory = os.path.dirname(os.path.abspath(mileage_path))
+    handle, staging = tempfile.mkstemp(prefix=".mileage_", suffix=".csv", dir=directory)
+    with os.fdopen(handle, "w", newline="") as f:
+        mileage_df.to_csv(f, index=False)
+    os.replace(staging, mileage_path)
+
+    applied = os.path.join(delta_dir, "applied")
+    os.makedirs(applied, exist_ok=True)
+    for path, _, _ in deltas:
+        shutil.move(path, os.path.join(applied, os.path.basename(path)))
+    return len(deltas)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2 or sys.argv[1] != "compact":
+        sys.exit("usage: python mileage_delta.py compact [MILEAGE_CSV] [DELTA_DIR]")
+    mileage_path = sys.argv[2] if len(sys.argv) > 2 else core.MILEAGE_FILE
+    delta_dir = sys.argv[3] if len(sys.argv) > 3 else DELTA_DIR
+    count = compact(mileage_path, delta_dir)
+    print(f"Folded {count} delta file(s) into {mileage_path}")
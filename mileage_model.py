@@ -0,0 +1,505 @@
+import hashlib
+import json
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+import evaluator_core as core
+import mileage_delta
+
+# Enriched mileage matrix held once per server as read-only NumPy arrays.
+# Evaluator and Customer are stored as int32 codes into name arrays; sessions
+# get lightweight DataFrame views over the same buffers instead of their own
+# copy of mileage_df plus derived columns.
+#
+# With EVALUATOR_MODEL_DIR set, the arrays are published once as .npy files and
+# every server process memory-maps them read-only instead of parsing the CSV:
+#
+#   python mileage_model.py publish .mileage_model   (optional ingest step)
+#
+# Each publish writes a new version directory inside EVALUATOR_MODEL_DIR and
+# then replaces the CURRENT file naming it, so readers always find a complete
+# model. The previous version is kept for readers that resolved it just before
+# the swap; older ones are removed.
+
+MODEL_DIR = os.environ.get("EVALUATOR_MODEL_DIR")
+CODE_ARRAYS = ['evaluator_codes', 'customer_codes', 'full_time']
+POINTER = "CURRENT"
+KEEP_VERSIONS = 2
+
+NUMERIC_COLS = [
+    'One-Way Miles', 'Round-Trip Miles', 'Drive Time (min)',
+    '2026 Cost', 'Per Diem', 'Mileage Bonus', 'Total Cost', 'Estimated'
+]
+
+
+def _pair_keys(evaluator_codes, customer_codes):
+    return np.asarray(evaluator_codes, dtype=np.int64) << 32 | np.asarray(customer_codes, dtype=np.int64)
+
+
+# Codes for names against an existing lookup; unknown names are appended to names
+def _extend_codes(values, lookup, names):
+    added = {}
+    codes = np.empty(len(values), dtype=np.int32)
+    for i, name in enumerate(values):
+        code = lookup(name)
+        if code is None:
+            code = added.setdefault(name.lower(), len(names))
+            if code == len(names):
+                names.append(name)
+        codes[i] = code
+    return codes
+
+
+def _read_only(array):
+    array = np.ascontiguousarray(array)
+    array.setflags(write=False)
+    return array
+
+
+class MileageModel:
+    def __init__(self, evaluator_names, customer_names, evaluator_codes, customer_codes,
+                 full_time, columns):
+        self.evaluator_names = _read_only(np.asarray(evaluator_names, dtype=object))
+        self.customer_names = _read_only(np.asarray(customer_names, dtype=object))
+        self.evaluator_codes = _read_only(np.asarray(evaluator_codes, dtype=np.int32))
+        self.customer_codes = _read_only(np.asarray(customer_codes, dtype=np.int32))
+        # Full-time flag per evaluator code
+        self.full_time = _read_only(np.asarray(full_time, dtype=bool))
+        self.columns = {name: _read_only(np.asarray(values, dtype=np.float64)) for name, values in columns.items()}
+
+    @classmethod
+    def from_frame(cls, mileage_df):
+        evaluators = pd.Categorical(mileage_df['Evaluator'])
+        customers = pd.Categorical(mileage_df['Customer'])
+        status = pd.Series(mileage_df['Status'].to_numpy()).groupby(evaluators.codes).first()
+        full_time = np.zeros(len(evaluators.categories), dtype=bool)
+        full_time[status.index.to_numpy()] = (status == 'Full-Time').to_numpy()
+        columns = {name: mileage_df[name].to_numpy() for name in NUMERIC_COLS if name in mileage_df.columns}
+        return cls(evaluators.categories.to_numpy(), customers.categories.to_numpy(),
+                   evaluators.codes, customers.codes, full_time, columns)
+
+    # Parse and enrich the mileage CSV (same rules as evaluator_core.enrich_mileage)
+    @classmethod
+    def load(cls, mileage_path=core.MILEAGE_FILE, full_time_path=core.FULL_TIME_FILE, **cost_rules):
+        mileage_df = core.enrich_mileage(core.read_mileage(mileage_path),
+                                         core.read_full_time_names(full_time_path), **cost_rules)
+        return cls.from_frame(mileage_df)
+
+    # Zero-copy attach to a published model (numeric arrays are read-only memmaps).
+    # A version removed between resolving CURRENT and opening its files is retried.
+    @classmethod
+    def attach(cls, directory, retries=3):
+        for attempt in range(retries):
+            try:
+                return cls._attach_version(_current_version(directory))
+            except FileNotFoundError:
+                if attempt == retries - 1:
+                    raise
+                time.sleep(0.05)
+
+    @classmethod
+    def _attach_version(cls, directory):
+        with open(os.path.join(directory, "names.json")) as f:
+            names = json.load(f)
+        with open(os.path.join(directory, "manifest.json")) as f:
+            manifest = json.load(f)
+        arrays = {name: np.load(os.path.join(directory, f"{name}.npy"), mmap_mode="r")
+                  for name in CODE_ARRAYS + manifest['columns']}
+        return cls(names['evaluators'], names['customers'],
+                   arrays['evaluator_codes'], arrays['customer_codes'], arrays['full_time'],
+                   {name: arrays[name] for name in manifest['columns']})
+
+    # Write the arrays where other processes can attach to them: a new version
+    # directory, made current by replacing the pointer file (os.replace is atomic)
+    def publish(self, directory, sources=None):
+        os.makedirs(directory, exist_ok=True)
+        staging = tempfile.mkdtemp(prefix="v", dir=directory)
+        os.chmod(staging, 0o755)
+        for name in CODE_ARRAYS:
+            np.save(os.path.join(staging, f"{name}.npy"), getattr(self, name))
+        for name, values in self.columns.items():
+            np.save(os.path.join(staging, f"{name}.npy"), values)
+        with open(os.path.join(staging, "names.json"), "w") as f:
+            json.dump({'evaluators': self.evaluator_names.tolist(),
+                       'customers': self.customer_names.tolist()}, f)
+        with open(os.path.join(staging, "manifest.json"), "w") as f:
+            json.dump({'rows': len(self), 'columns': list(self.columns), 'sources': sources or {}}, f)
+
+        version = f"{time.time_ns():020d}"
+        os.replace(staging, os.path.join(directory, version))
+        pointer = os.path.join(directory, f".{POINTER}.{version}")
+        with open(pointer, "w") as f:
+            f.write(version)
+        os.replace(pointer, os.path.join(directory, POINTER))
+        versions = sorted(name for name in os.listdir(directory) if name.isdigit())
+        for name in versions[:-KEEP_VERSIONS]:
+            # On POSIX, processes still mapping these files keep them alive until
+            # they detach; where mapped files cannot be removed they stay until the next publish
+            shutil.rmtree(os.path.join(directory, name), ignore_errors=True)
+
+    def __len__(self):
+        return len(self.evaluator_codes)
+
+    # Case-insensitive name -> code lookups (None when unknown)
+    def evaluator_code(self, name):
+        if not hasattr(self, '_evaluator_lookup'):
+            self._evaluator_lookup = core.name_codes(self.evaluator_names)
+        return self._evaluator_lookup.get(str(name).strip().lower())
+
+    def customer_code(self, name):
+        if not hasattr(self, '_customer_lookup'):
+            self._customer_lookup = core.name_codes(self.customer_names)
+        return self._customer_lookup.get(str(name).strip().lower())
+
+    def arrays(self):
+        arrays = {
+            'evaluator_names': self.evaluator_names, 'customer_names': self.customer_names,
+            'evaluator_codes': self.evaluator_codes, 'customer_codes': self.customer_codes,
+            'full_time': self.full_time,
+        }
+        arrays.update(self.columns)
+        return arrays
+
+    # Bytes held by the shared buffers (name strings included)
+    def nbytes(self):
+        total = sum(a.nbytes for a in self.arrays().values())
+        total += sum(len(name) + 49 for name in self.evaluator_names)
+        total += sum(len(name) + 49 for name in self.customer_names)
+        return total
+
+    # New model with one delta file merged in (see mileage_delta.py). Codes of
+    # existing names never change: new evaluators/customers are appended to the
+    # name arrays, retired evaluators keep their name but lose their rows. Only
+    # the delta's rows are enriched and only the customers they touch are re-ranked.
+    def apply_delta(self, delta_df, full_time_names, **cost_rules):
+        evaluator_names, customer_names = list(self.evaluator_names), list(self.customer_names)
+        pair_index = pd.Index(_pair_keys(self.evaluator_codes, self.customer_codes))
+        keep = np.ones(len(self), dtype=bool)
+
+        retired = [self.evaluator_code(name) for name in delta_df.loc[delta_df['Action'] == "retire", 'Evaluator']]
+        keep &= ~np.isin(self.evaluator_codes, [code for code in retired if code is not None])
+
+        deletes = delta_df[delta_df['Action'] == "delete"]
+        pairs = [(self.evaluator_code(e), self.customer_code(c)) for e, c in zip(deletes['Evaluator'], deletes['Customer'])]
+        pairs = [pair for pair in pairs if None not in pair]
+        if pairs:
+            rows = pair_index.get_indexer(_pair_keys(*np.array(pairs).T))
+            keep[rows[rows >= 0]] = False
+
+        upserts = delta_df[delta_df['Action'] == "upsert"].drop_duplicates(subset=['Evaluator', 'Customer'], keep='last')
+        upsert_evaluators = _extend_codes(upserts['Evaluator'], self.evaluator_code, evaluator_names)
+        upsert_customers = _extend_codes(upserts['Customer'], self.customer_code, customer_names)
+        full_time = np.concatenate([self.full_time, np.isin(evaluator_names[len(self.full_time):], full_time_names)])
+        enriched = core.enrich_mileage(upserts.reset_index(drop=True), full_time_names, **cost_rules)
+        rows = pair_index.get_indexer(_pair_keys(upsert_evaluators, upsert_customers))
+        updated = (rows >= 0) & keep[np.maximum(rows, 0)]
+
+        columns = {}
+        for name, values in self.columns.items():
+            values = np.array(values)
+            delta_values = enriched[name].to_numpy(dtype=np.float64) if name in enriched.columns else np.full(len(upserts), np.nan)
+            values[rows[updated]] = delta_values[updated]
+            columns[name] = np.concatenate([values[keep], delta_values[~updated]])
+        model = MileageModel(
+            evaluator_names, customer_names,
+            np.concatenate([self.evaluator_codes[keep], upsert_evaluators[~updated]]),
+            np.concatenate([self.customer_codes[keep], upsert_customers[~updated]]),
+            full_time, columns
+        )
+
+        touched = np.zeros(len(customer_names), dtype=bool)
+        touched[self.customer_codes[~keep]] = True
+        touched[upsert_customers] = True
+        model._ranking = RankingIndex(model, previous=self.ranking, old_to_new=np.cumsum(keep) - 1,
+                                      touched_customers=touched)
+        return model
+
+    # Evaluators that still have rows (retired evaluators keep their code)
+    def active_evaluator_names(self):
+        return self.evaluator_names[np.diff(self.ranking.evaluator_offsets) > 0]
+
+    # Content hash of the model, for caches whose results depend on it
+    @property
+    def version(self):
+        if not hasattr(self, '_version'):
+            digest = hashlib.sha256(json.dumps([self.evaluator_names.tolist(), self.customer_names.tolist()]).encode())
+            for values in [self.evaluator_codes, self.customer_codes, self.full_time] + list(self.columns.values()):
+                digest.update(np.ascontiguousarray(values).tobytes())
+            self._version = digest.hexdigest()[:16]
+        return self._version
+
+    # Per-customer ranking index, built once per model
+    @property
+    def ranking(self):
+        if not hasattr(self, '_ranking'):
+            self._ranking = RankingIndex(self)
+        return self._ranking
+
+    # DataFrame view in the layout the pages expect; numeric columns are not copied.
+    # With rows (an array of row positions) only those rows are taken, in that order;
+    # with columns only those numeric columns (Evaluator, Customer and Status always).
+    def frame(self, rows=None, columns=None):
+        evaluator_codes, customer_codes = self.evaluator_codes, self.customer_codes
+        columns = self.columns if columns is None else {name: self.columns[name] for name in columns}
+        if rows is not None:
+            evaluator_codes, customer_codes = evaluator_codes[rows], customer_codes[rows]
+            columns = {name: values[rows] for name, values in columns.items()}
+        evaluators = pd.Categorical.from_codes(evaluator_codes, categories=self.evaluator_names)
+        customers = pd.Categorical.from_codes(customer_codes, categories=self.customer_names)
+        data = {'Evaluator': evaluators, 'Customer': customers}
+        data.update(columns)
+        view = pd.DataFrame(data, index=rows, copy=False)
+        view['Status'] = pd.Categorical.from_codes(
+            self.full_time[evaluator_codes].astype(np.int8), categories=['Contract', 'Full-Time']
+        )
+        if 'Estimated' in view.columns:
+            view['Estimated'] = view['Estimated'] > 0
+        return view
+
+
+RANK_KEYS = {'miles': 'Round-Trip Miles', 'cost': 'Total Cost'}
+
+
+def _offsets(codes, n):
+    return _read_only(np.concatenate([[0], np.cumsum(np.bincount(codes, minlength=n))]).astype(np.int64))
+
+
+# Row order grouped into blocks by group code, sorted by keys within each block.
+# With the previous order, blocks not marked touched are carried over (rows
+# renumbered through old_to_new) and only the touched blocks are sorted again.
+def _block_order(groups, offsets, keys, previous=None, previous_offsets=None, old_to_new=None, touched=None):
+    if previous is None:
+        return np.lexsort((keys, groups)).astype(np.int64)
+    order = np.empty(len(groups), dtype=np.int64)
+    old_groups = np.repeat(np.arange(len(previous_offsets) - 1), np.diff(previous_offsets))
+    carried = np.flatnonzero(~touched[old_groups])
+    block = old_groups[carried]
+    order[offsets[block] + carried - previous_offsets[block]] = old_to_new[previous[carried]]
+    rows = np.flatnonzero(touched[groups])
+    rows = rows[np.lexsort((keys[rows], groups[rows]))]
+    block = groups[rows]
+    order[offsets[block] + np.arange(len(rows)) - np.searchsorted(block, block)] = rows
+    return order
+
+
+# For each customer, row positions pre-sorted by round-trip miles and by total
+# cost (CSR layout: one offsets array, rows of customer c are
+# order[offsets[c]:offsets[c + 1]]), plus each row's rank within its customer.
+# "Closest evaluators to customer X" is then an O(k) slice instead of a
+# filter + sort over the whole frame.
+#
+# The reverse index answers "which customers is this evaluator the closest (or
+# second-closest) evaluator for?": per evaluator, their rows ordered by that rank,
+# so "rank < n" is a prefix of the evaluator's block.
+class RankingIndex:
+    # previous/old_to_new/touched_customers: incremental rebuild after a delta
+    # (see MileageModel.apply_delta), re-sorting only the touched customers
+    def __init__(self, model, previous=None, old_to_new=None, touched_customers=None):
+        customer_codes = model.customer_codes
+        evaluator_codes = model.evaluator_codes
+        self.offsets = _offsets(customer_codes, len(model.customer_names))
+        self.evaluator_offsets = _offsets(evaluator_codes, len(model.evaluator_names))
+        if previous is not None:
+            # Evaluators with a row in a touched customer, or whose row count changed
+            touched_evaluators = np.zeros(len(model.evaluator_names), dtype=bool)
+            touched_evaluators[evaluator_codes[touched_customers[customer_codes]]] = True
+            n_old = len(previous.evaluator_offsets) - 1
+            touched_evaluators[:n_old] |= np.diff(self.evaluator_offsets)[:n_old] != np.diff(previous.evaluator_offsets)
+        self.order = {}
+        self.rank = {}
+        self.evaluator_order = {}
+        for key, column in RANK_KEYS.items():
+            # Stable sort: ties keep file order, missing values go last
+            if previous is None:
+                order = _block_order(customer_codes, self.offsets, model.columns[column])
+            else:
+                order = _block_order(customer_codes, self.offsets, model.columns[column], previous.order[key],
+                                     previous.offsets, old_to_new, touched_customers)
+            rank = np.empty(len(order), dtype=np.int32)
+            rank[order] = np.arange(len(order)) - self.offsets[customer_codes[order]]
+            if previous is None:
+                evaluator_order = _block_order(evaluator_codes, self.evaluator_offsets, rank)
+            else:
+                evaluator_order = _block_order(evaluator_codes, self.evaluator_offsets, rank,
+                                               previous.evaluator_order[key], previous.evaluator_offsets,
+                                               old_to_new, touched_evaluators)
+            self.order[key] = _read_only(order)
+            self.rank[key] = _read_only(rank)
+            self.evaluator_order[key] = _read_only(evaluator_order)
+
+    # Number of evaluators competing for each customer
+    def competitors(self, customer_codes):
+        return self.offsets[np.asarray(customer_codes) + 1] - self.offsets[customer_codes]
+
+    # Rows for one customer, best first (optionally only the top k)
+    def customer_rows(self, customer_code, by="miles", k=None):
+        start, stop = self.offsets[customer_code], self.offsets[customer_code + 1]
+        if k is not None:
+            stop = min(stop, start + k)
+        return self.order[by][start:stop]
+
+    # Rows for several customers, each block best first; None means every customer
+    def rows_for_customers(self, customer_codes=None, by="miles"):
+        if customer_codes is None:
+            return self.order[by]
+        return np.concatenate([self.customer_rows(code, by) for code in customer_codes] or [np.empty(0, np.int64)])
+
+    # Best k rows for each of customer_codes (k per customer, or one k for all;
+    # fewer where a customer has fewer evaluators, none for -1), concatenated,
+    # plus the position in customer_codes each row belongs to
+    def top_rows(self, customer_codes, k, by="miles"):
+        codes = np.asarray(customer_codes, dtype=np.int64)
+        matched = codes >= 0
+        safe = np.where(matched, codes, 0)
+        starts = self.offsets[safe]
+        counts = np.where(matched, np.clip(np.broadcast_to(np.asarray(k, dtype=np.int64), codes.shape), 0,
+                                           self.offsets[safe + 1] - starts), 0)
+        owner = np.repeat(np.arange(len(codes)), counts)
+        positions = np.repeat(starts - np.cumsum(counts) + counts, counts) + np.arange(counts.sum())
+        return self.order[by][positions], owner
+
+    # Rows for one evaluator ordered by their rank at each customer; max_rank=1
+    # keeps only customers where they are the closest evaluator (ranks are 0-based)
+    def evaluator_rows(self, evaluator_code, by="miles", max_rank=None):
+        start, stop = self.evaluator_offsets[evaluator_code], self.evaluator_offsets[evaluator_code + 1]
+        rows = self.evaluator_order[by][start:stop]
+        if max_rank is not None:
+            rows = rows[:np.searchsorted(self.rank[by][rows], max_rank)]
+        return rows
+
+    # Row of the closest evaluator for every customer
+    def closest_rows(self, by="miles"):
+        starts = self.offsets[:-1]
+        return self.order[by][starts[self.offsets[1:] > starts]]
+
+
+def _source_stamp(mileage_path, full_time_path):
+    return {
+        os.path.abspath(path): [os.path.getmtime(path), os.path.getsize(path)]
+        for path in (mileage_path, full_time_path)
+    }
+
+
+# Version directory CURRENT points at (a model published before versioning
+# lives in the directory itself)
+def _current_version(directory):
+    try:
+        with open(os.path.join(directory, POINTER)) as f:
+            return os.path.join(directory, f.read().strip())
+    except FileNotFoundError:
+        return directory
+
+
+def _published_sources(directory):
+    try:
+        with open(os.path.join(_current_version(directory), "manifest.json")) as f:
+            return json.load(f)['sources']
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+# Exclusive lock on an open file: fcntl on POSIX, msvcrt on Windows (imported
+# here so that importing this module works on both)
+@contextmanager
+def _exclusive_lock(lock_file):
+    try:
+        import fcntl
+    except ImportError:
+        import msvcrt
+
+        while True:
+            try:
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+                break
+            except OSError:
+                # LK_LOCK gives up after ten one-second attempts; keep waiting
+                continue
+        try:
+            yield
+        finally:
+            lock_file.seek(0)
+            msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+    else:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+# Attach to the published model, publishing it first if it is missing or stale.
+# A lock file makes sure only one process parses the CSV; the rest wait and attach.
+def attach_or_publish(directory, mileage_path=core.MILEAGE_FILE, full_time_path=core.FULL_TIME_FILE):
+    stamp = json.loads(json.dumps(_source_stamp(mileage_path, full_time_path)))
+    if _published_sources(directory) != stamp:
+        os.makedirs(os.path.dirname(os.path.abspath(directory)), exist_ok=True)
+        with open(os.path.abspath(directory) + ".lock", "w") as lock, _exclusive_lock(lock):
+            if _published_sources(directory) != stamp:
+                MileageModel.load(mileage_path, full_time_path).publish(directory, sources=stamp)
+    return MileageModel.attach(directory)
+
+
+# One model per server process, shared by every session (and by the in-process
+# assignment service); reloaded when either CSV changes on disk
+@lru_cache(maxsize=2)
+def _cached_model(mileage_path, full_time_path, mileage_mtime, full_time_mtime):
+    if MODEL_DIR:
+        return attach_or_publish(MODEL_DIR, mileage_path, full_time_path)
+    return MileageModel.load(mileage_path, full_time_path)
+
+
+# Base model plus pending delta files. Deltas that appear while the server runs
+# are merged into the current model one at a time instead of reloading the CSV.
+_live_models = {}
+_live_lock = threading.Lock()
+
+
+def shared_mileage_model(mileage_path=core.MILEAGE_FILE, full_time_path=core.FULL_TIME_FILE, delta_dir=None):
+    base = _cached_model(mileage_path, full_time_path,
+                         os.path.getmtime(mileage_path), os.path.getmtime(full_time_path))
+    deltas = mileage_delta.list_deltas(delta_dir or mileage_delta.DELTA_DIR)
+    if not deltas:
+        return base
+    with _live_lock:
+        key = (mileage_path, full_time_path)
+        live_base, applied, model = _live_models.get(key, (None, [], None))
+        if live_base is not base or deltas[:len(applied)] != applied:
+            applied, model = [], base
+        if len(deltas) > len(applied):
+            full_time_names = core.read_full_time_names(full_time_path)
+            for path, _, _ in deltas[len(applied):]:
+                model = model.apply_delta(mileage_delta.read_delta(path), full_time_names)
+            _live_models[key] = (base, deltas, model)
+        return model
+
+
+# Memory accounting for the debug panel: shared buffers vs. what this session owns
+def memory_report(model, view=None):
+    report = {'shared_model_mb': round(model.nbytes() / 2 ** 20, 3), 'shared_rows': len(model)}
+    if view is not None:
+        owned = 0
+        for name in view.columns:
+            column = view[name]
+            if isinstance(column.dtype, pd.CategoricalDtype):
+                owned += column.cat.codes.to_numpy().nbytes
+            elif not (name in model.columns and np.shares_memory(column.to_numpy(), model.columns[name])):
+                owned += column.memory_usage(index=False, deep=True)
+        report['session_view_mb'] = round(owned / 2 ** 20, 3)
+    return report
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2 or sys.argv[1] != "publish":
+        sys.exit("usage: python mileage_model.py publish [DIRECTORY]")
+    target = sys.argv[2] if len(sys.argv) > 2 else (MODEL_DIR or ".mileage_model")
+    model = attach_or_publish(target)
+    print(f"Published {len(model)} rows to {target} ({model.nbytes() / 2 ** 20:.2f} MB)")
@@ -0,0 +1,215 @@
+import argparse
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+import evaluator_core as core
+from mileage_model import shared_mileage_model
+
+# Sensitivity of the optimized plan to the cost rules. A scenario is one set of
+# rule parameters; a sweep takes a grid of them, prices every candidate
+# evaluator/job pair under all scenarios at once (one broadcast over a
+# scenarios x pairs matrix) and re-solves the assignment per distinct cost
+# vector in a process pool (EVALUATOR_SWEEP_WORKERS, default one per CPU).
+#
+#   python scenario_sweep.py Jobs.xlsx --mile-rate 0.65 0.725 0.8 --per-diem 200 225
+#
+# Each scenario reports the re-optimized plan and, for comparison, what the
+# plan chosen under the current rules would cost under that scenario.
+#
+# Slots may stay open at a penalty above any pair's cost, so every scenario
+# fills as many slots as the candidate pairs allow (the same number in every
+# scenario) and the totals stay comparable. A scenario the solver does not
+# finish keeps its Status and gets no costs, so it never ranks as cheapest.
+
+WORKERS = int(os.environ.get("EVALUATOR_SWEEP_WORKERS", "0")) or os.cpu_count() or 1
+MAX_SCENARIOS = 500
+
+PARAMS = ['Mile Rate', 'Per Diem', 'Per Diem Miles', 'Bonus Tiers', 'Manager Penalty']
+CURRENT_RULES = {
+    'Mile Rate': core.MILE_RATE,
+    'Per Diem': core.PER_DIEM,
+    'Per Diem Miles': core.PER_DIEM_MILES,
+    'Bonus Tiers': tuple(sorted(core.BONUS_TIERS)),
+    'Manager Penalty': core.MANAGER_PENALTY,
+}
+
+
+# "400:250, 800:500" -> ((400, 250), (800, 500)); "" -> no bonus
+def parse_tiers(text):
+    tiers = []
+    for part in str(text).split(","):
+        if part.strip():
+            threshold, _, amount = part.partition(":")
+            if not amount.strip():
+                raise ValueError(f"bonus tier {part.strip()!r} should be miles:amount")
+            tiers.append((float(threshold), float(amount)))
+    return tuple(sorted(tiers))
+
+
+def format_tiers(tiers):
+    return ", ".join(f"{threshold:g}:{amount:g}" for threshold, amount in tiers) or "none"
+
+
+# Every combination of the given parameter values (missing parameters keep the
+# current rules); the current rules are always the first scenario
+def scenario_grid(values=None):
+    values = values or {}
+    axes = [list(values.get(name) or [CURRENT_RULES[name]]) for name in PARAMS]
+    axes[PARAMS.index('Bonus Tiers')] = [tuple(sorted(t)) for t in axes[PARAMS.index('Bonus Tiers')]]
+    combos = [tuple(CURRENT_RULES[name] for name in PARAMS)]
+    combos += [c for c in itertools.product(*axes) if c != combos[0]]
+    if len(combos) > MAX_SCENARIOS:
+        raise ValueError(f"{len(combos)} scenarios requested, the limit is {MAX_SCENARIOS}")
+    scenarios = pd.DataFrame(combos, columns=PARAMS)
+    scenarios.insert(0, 'Current Rules', np.arange(len(scenarios)) == 0)
+    scenarios.insert(0, 'Scenario', [
+        f"${rate:g}/mi, per diem ${per_diem:g} > {miles:g} mi, bonus {format_tiers(tiers)}, penalty ${penalty:g}"
+        for rate, per_diem, miles, tiers, penalty in combos
+    ])
+    return scenarios
+
+
+# Candidate evaluator/job pairs with what the cost rules need (one row per pair,
+# as in core.build_cost_matrix)
+def sweep_pairs(mileage_df, job_slots, last_resort_managers=core.LAST_RESORT_MANAGERS):
+    slots_df = pd.DataFrame(job_slots, columns=['Job number', 'Customer']).drop_duplicates()
+    slots_df['Customer'] = core.intern_names(slots_df['Customer'], mileage_df['Customer'].cat.categories)
+    columns = ['Evaluator', 'Customer', 'Round-Trip Miles', 'Drive Time (min)', 'Status']
+    pairs = slots_df.merge(mileage_df[[c for c in columns if c in mileage_df.columns]], on='Customer')
+    pairs = pairs.drop_duplicates(subset=['Evaluator', 'Job number']).reset_index(drop=True)
+    pairs['Evaluator'] = pairs['Evaluator'].astype(str)
+    pairs['Contract'] = (pairs['Status'] == "Contract").to_numpy()
+    pairs['Last Resort'] = pairs['Evaluator'].isin(last_resort_managers).to_numpy()
+    return pairs
+
+
+# Cost components per scenario and pair, each a scenarios x pairs array (same
+# rules as core.enrich_mileage plus the manager penalty)
+def scenario_costs(pairs, scenarios):
+    miles = pairs['Round-Trip Miles'].to_numpy(dtype=float)[None, :]
+    contract = pairs['Contract'].to_numpy()[None, :]
+    rate, per_diem, per_diem_miles, penalty = (
+        scenarios[name].to_numpy(dtype=float)[:, None]
+        for name in ['Mile Rate', 'Per Diem', 'Per Diem Miles', 'Manager Penalty']
+    )
+
+    # Tiers padded to a common count (missing tiers never trigger); higher
+    # thresholds overwrite lower ones
+    n_tiers = max((len(t) for t in scenarios['Bonus Tiers']), default=0)
+    thresholds = np.full((len(scenarios), n_tiers), np.inf)
+    amounts = np.zeros((len(scenarios), n_tiers))
+    for i, tiers in enumerate(scenarios['Bonus Tiers']):
+        for t, (threshold, amount) in enumerate(sorted(tiers)):
+            thresholds[i, t], amounts[i, t] = threshold, amount
+    bonus = np.zeros((len(scenarios), miles.shape[1]))
+    for t in range(n_tiers):
+        bonus = np.where(miles > thresholds[:, t:t + 1], amounts[:, t:t + 1], bonus)
+
+    return {
+        'Mileage Cost': np.nan_to_num(miles * rate),
+        'Per Diem': np.where(contract & (miles > per_diem_miles), per_diem, 0.0),
+        'Mileage Bonus': np.where(contract, bonus, 0.0),
+        'Penalty': np.where(pairs['Last Resort'].to_numpy()[None, :], penalty, 0.0),
+    }
+
+
+# One solve (runs in a worker process): chosen pair positions and solver status
+def _solve(evaluators, job_numbers, costs, job_slots, time_limit=None, unfilled_penalty=None):
+    cost_matrix = dict(zip(zip(evaluators, job_numbers), costs))
+    prob, x = core.build_assignment_model(cost_matrix, job_slots, unfilled_penalty)
+    assignments, status = core.solve_assignment_model(prob, x, time_limit=time_limit)
+    position = {key: i for i, key in enumerate(cost_matrix)}
+    return [position[key] for key in assignments], status
+
+
+def _solve_all(pairs, objective, job_slots, workers, time_limit, unfilled_penalty):
+    evaluators, job_numbers = pairs['Evaluator'].tolist(), pairs['Job number'].tolist()
+    jobs = [(evaluators, job_numbers, row.tolist(), job_slots, time_limit, unfilled_penalty) for row in objective]
+    if workers <= 1 or len(jobs) <= 1:
+        return [_solve(*job) for job in jobs]
+    with ProcessPoolExecutor(max_workers=min(workers, len(jobs))) as pool:
+        return list(pool.map(_solve, *zip(*jobs)))
+
+
+def sweep(jobs_df, mileage_df, scenarios, workers=WORKERS, time_limit=None, unfilled_penalty=None):
+    job_slots = core.build_job_slots(jobs_df)
+    pairs = sweep_pairs(mileage_df, job_slots)
+    costs = scenario_costs(pairs, scenarios)
+    spend = costs['Mileage Cost'] + costs['Per Diem'] + costs['Mileage Bonus']
+    objective = spend + costs['Penalty']
+    if unfilled_penalty is None:
+        unfilled_penalty = 2 * max(core.MANAGER_PENALTY, float(objective.max(initial=0)))
+
+    # Scenarios that price every pair the same share one solve
+    distinct, inverse = np.unique(objective, axis=0, return_inverse=True)
+    solved = _solve_all(pairs, distinct, job_slots, workers, time_limit, unfilled_penalty)
+    plans = [np.asarray(solved[i][0], dtype=np.int64) for i in inverse.ravel()]
+    statuses = [solved[i][1] for i in inverse.ravel()]
+
+    current = None
+    if scenarios['Current Rules'].any():
+        first = int(np.flatnonzero(scenarios['Current Rules'])[0])
+        current = plans[first] if statuses[first] == "Optimal" else None
+    miles = pairs['Round-Trip Miles'].to_numpy(dtype=float)
+    minutes = pairs['Drive Time (min)'].to_numpy(dtype=float) if 'Drive Time (min)' in pairs else None
+    rows = []
+    for i, (plan, status) in enumerate(zip(plans, statuses)):
+        if status != "Optimal":
+            rows.append({'Status': status})
+            continue
+        row = {
+            'Status': status,
+            'Assigned': len(plan),
+            'Unfilled': len(job_slots) - len(plan),
+            'Total Cost': spend[i, plan].sum(),
+            'Mileage Cost': costs['Mileage Cost'][i, plan].sum(),
+            'Per Diem Paid': costs['Per Diem'][i, plan].sum(),
+            'Bonus Paid': costs['Mileage Bonus'][i, plan].sum(),
+            'Last Resort': int(pairs['Last Resort'].to_numpy()[plan].sum()),
+            'Round-Trip Miles': np.nansum(miles[plan]),
+        }
+        if minutes is not None:
+            row['Drive Time (min)'] = np.nansum(minutes[plan])
+        if current is not None:
+            row['Current Plan Cost'] = spend[i, current].sum()
+            row['Savings vs Current Plan'] = row['Current Plan Cost'] - row['Total Cost']
+            row['Changed Assignments'] = len(np.setdiff1d(plan, current))
+        rows.append(row)
+    results = pd.concat([scenarios.reset_index(drop=True), pd.DataFrame(rows)], axis=1)
+    money = [c for c in results.columns if 'Cost' in c or 'Paid' in c or 'Savings' in c]
+    results[money] = results[money].round(2)
+    return results, {'job_slots': len(job_slots), 'pairs': len(pairs), 'solves': len(distinct)}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Re-optimize a job file under a grid of cost rules.")
+    parser.add_argument("jobs", help="job file (.xlsx)")
+    parser.add_argument("--mile-rate", nargs="+", type=float)
+    parser.add_argument("--per-diem", nargs="+", type=float)
+    parser.add_argument("--per-diem-miles", nargs="+", type=float)
+    parser.add_argument("--bonus-tiers", nargs="+", type=parse_tiers, help='e.g. "400:250,800:500"')
+    parser.add_argument("--manager-penalty", nargs="+", type=float)
+    parser.add_argument("--workers", type=int, default=WORKERS)
+    parser.add_argument("--time-limit", type=float, default=None, help="CBC time limit per solve in seconds")
+    parser.add_argument("--output", default="scenario_sweep.csv")
+    args = parser.parse_args(argv)
+
+    scenarios = scenario_grid({
+        'Mile Rate': args.mile_rate, 'Per Diem': args.per_diem, 'Per Diem Miles': args.per_diem_miles,
+        'Bonus Tiers': args.bonus_tiers, 'Manager Penalty': args.manager_penalty,
+    })
+    mileage_df = shared_mileage_model().frame()
+    jobs_df = core.match_customers(core.read_jobs(args.jobs), mileage_df['Customer'])
+    results, stats = sweep(jobs_df, mileage_df, scenarios, args.workers, args.time_limit)
+    results.assign(**{'Bonus Tiers': results['Bonus Tiers'].map(format_tiers)}).to_csv(args.output, index=False)
+    print(f"{len(results)} scenarios, {stats['solves']} solves over {stats['pairs']} pairs "
+          f"({stats['job_slots']} job slots)")
+    print(results[['Scenario', 'Total Cost', 'Current Plan Cost', 'Changed Assignments']].to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+import json
+import os
+import time
+import urllib.error
+import urllib.request
+
+# Calls the local assignment service when EVALUATOR_SERVICE_URL is set
+# (e.g. http://127.0.0.1:8502), otherwise runs the same handlers in-process.
+# Either way a failed request (busy, unreachable, or rejected by a handler)
+# raises ServiceUnavailable with the service's message.
+
+SERVICE_URL = os.environ.get("EVALUATOR_SERVICE_URL")
+
+
+class ServiceUnavailable(Exception):
+    pass
+
+
+def call(path, payload, timeout=300, retries=3):
+    if not SERVICE_URL:
+        from assignment_service import ROUTES, ServiceError
+        try:
+            return ROUTES[('POST', path)](payload)
+        except ServiceError as exc:
+            raise ServiceUnavailable(exc.message) from exc
+
+    data = json.dumps(payload, default=str).encode("utf-8")
+    for attempt in range(retries + 1):
+        request = urllib.request.Request(
+            SERVICE_URL.rstrip("/") + path, data=data, headers={'Content-Type': "application/json"}
+        )
+        try:
+            with urllib.request.urlopen(request, timeout=timeout) as response:
+                return json.loads(response.read())
+        except urllib.error.HTTPError as exc:
+            if exc.code == 503 and attempt < retries:
+                time.sleep(float(exc.headers.get('Retry-After', 1)) * (attempt + 1))
+                continue
+            raise ServiceUnavailable(json.loads(exc.read() or b"{}").get('error', str(exc))) from exc
+        except urllib.error.URLError as exc:
+            raise ServiceUnavailable(f"Assignment service not reachable at {SERVICE_URL}: {exc.reason}") from exc
+    raise ServiceUnavailable("Assignment service is busy")
+
+
+def match(companies, threshold=85):
+    return call("/match", {'companies': list(companies), 'threshold': threshold})['matches']
+
+
+def _jobs_payload(jobs_df):
+    matched = jobs_df.dropna(subset=['Matched Customer'])
+    return [
+        {'job_number': job_num, 'customer': customer, 'evaluators_needed': int(needed)}
+        for job_num, customer, needed in zip(matched['Job number'], matched['Matched Customer'],
+                                             matched['Evaluators Needed'])
+    ]
+
+
+# engine None lets the service pick one from the measured engine policy;
+# unfilled_penalty lets slots stay open at that cost each (None: every slot
+# must be filled or the solve is infeasible)
+def optimize(jobs_df, available_evaluators=None, engine=None, time_limit=None, candidates_k=None,
+             unfilled_penalty=None):
+    payload = {'jobs': _jobs_payload(jobs_df), 'engine': engine, 'time_limit': time_limit,
+               'candidates_k': candidates_k, 'unfilled_penalty': unfilled_penalty}
+    if available_evaluators is not None:
+        payload['available_evaluators'] = list(available_evaluators)
+    return call("/optimize", payload)
+
+
+def frontier(jobs_df, available_evaluators=None, points=8, time_limit=None, candidates_k=None,
+             unfilled_penalty=None):
+    payload = {'jobs': _jobs_payload(jobs_df), 'points': points, 'time_limit': time_limit,
+               'candidates_k': candidates_k, 'unfilled_penalty': unfilled_penalty}
+    if available_evaluators is not None:
+        payload['available_evaluators'] = list(available_evaluators)
+    return call("/frontier", payload)
+
+
+def contingency(jobs_df, available_evaluators=None, assignments=None, candidates_k=None, unfilled_penalty=None):
+    payload = {'jobs': _jobs_payload(jobs_df), 'assignments': assignments, 'candidates_k': candidates_k,
+               'unfilled_penalty': unfilled_penalty}
+    if available_evaluators is not None:
+        payload['available_evaluators'] = list(available_evaluators)
+    return call("/contingency", payload)['evaluators']
+
+
+def rank(customer, top_n=5, by="Total Cost"):
+    return call("/rank", {'customer': customer, 'top_n': top_n, 'by': by})['evaluators']
+
+
+def coverage(evaluator, max_rank=None, by="Round-Trip Miles"):
+    return call("/coverage", {'evaluator': evaluator, 'max_rank': max_rank, 'by': by})['customers']
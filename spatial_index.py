@@ -0,0 +1,150 @@
+import os
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+import distance_engine as de
+import evaluator_core as core
+
+# KD-tree over evaluator home locations (ZIP centroids as 3D unit vectors, so
+# straight-line distances are exact on the sphere). k-nearest and radius
+# queries are O(log n) instead of a scan over the mileage matrix; they back the
+# ad-hoc address lookup in app.py and the optimizer's candidate lists.
+#
+# Needs the location files described in distance_engine.py; without
+# Zip_Centroids.csv shared_locator() returns None. EVALUATOR_CANDIDATES_K limits
+# the optimizer to the k nearest evaluators per located customer (plus the
+# last-resort managers); unset, every pair in the matrix is considered.
+
+CANDIDATES_K = int(os.environ.get("EVALUATOR_CANDIDATES_K", "0")) or None
+
+
+def unit_vectors(lat, lon):
+    lat, lon = np.radians(lat), np.radians(lon)
+    return np.column_stack([np.cos(lat) * np.cos(lon), np.cos(lat) * np.sin(lon), np.sin(lat)])
+
+
+def chord_to_miles(chord):
+    return 2 * de.EARTH_RADIUS_MILES * np.arcsin(np.clip(np.asarray(chord) / 2, 0, 1))
+
+
+def miles_to_chord(miles):
+    return 2 * np.sin(np.minimum(np.asarray(miles) / (2 * de.EARTH_RADIUS_MILES), np.pi / 2))
+
+
+class EvaluatorLocator:
+    def __init__(self, model, locations, road_model=None):
+        from scipy.spatial import cKDTree
+
+        self.model = model
+        self.centroids = locations['centroids']
+        self.customer_coords = locations['customers']
+        self.road_model = road_model
+        coords = locations['evaluators']
+        active = np.diff(model.ranking.evaluator_offsets) > 0
+        # Evaluator code per tree point (active evaluators with a known ZIP)
+        self.codes = np.flatnonzero(active & np.isfinite(coords).all(axis=1))
+        self.tree = cKDTree(unit_vectors(coords[self.codes, 0], coords[self.codes, 1]))
+
+    def __len__(self):
+        return len(self.codes)
+
+    def zip_coordinates(self, zip_code):
+        zip_code = de.normalize_zip([zip_code]).iloc[0]
+        if not isinstance(zip_code, str) or zip_code not in self.centroids.index:
+            return None
+        return tuple(self.centroids.loc[zip_code, ['Latitude', 'Longitude']].to_numpy(dtype=float))
+
+    # k closest evaluators to one point: (evaluator codes, straight-line miles)
+    def nearest(self, lat, lon, k=5):
+        k = min(k, len(self))
+        if k == 0:
+            return np.empty(0, dtype=np.int64), np.empty(0)
+        chord, index = self.tree.query(unit_vectors([lat], [lon])[0], k=k)
+        return self.codes[np.atleast_1d(index)], chord_to_miles(np.atleast_1d(chord))
+
+    # Every evaluator within miles of a point, closest first
+    def within(self, lat, lon, miles):
+        point = unit_vectors([lat], [lon])[0]
+        index = np.asarray(self.tree.query_ball_point(point, miles_to_chord(miles)), dtype=np.int64)
+        distance = chord_to_miles(np.linalg.norm(self.tree.data[index] - point, axis=1))
+        order = np.argsort(distance, kind='stable')
+        return self.codes[index[order]], distance[order]
+
+    # k nearest evaluator codes per customer code, -1 where the customer has no
+    # location (one batched tree query). With available (a boolean mask over
+    # evaluator codes) only available evaluators count: the query over-fetches,
+    # doubling until every row has k of them, and rows with fewer are padded
+    # with -1.
+    def candidates(self, customer_codes, k, available=None):
+        customer_codes = np.asarray(customer_codes)
+        k = min(k, len(self))
+        result = np.full((len(customer_codes), k), -1, dtype=np.int64)
+        coords = self.customer_coords[customer_codes] if len(customer_codes) else np.empty((0, 2))
+        located = np.isfinite(coords).all(axis=1)
+        if not (located.any() and k):
+            return result
+        points = unit_vectors(coords[located, 0], coords[located, 1])
+        if available is None:
+            _, index = self.tree.query(points, k=k)
+            result[located] = self.codes[np.asarray(index).reshape(-1, k)]
+            return result
+        usable = np.asarray(available, dtype=bool)[self.codes]
+        fetch = k
+        while True:
+            _, index = self.tree.query(points, k=fetch)
+            index = np.asarray(index).reshape(-1, fetch)
+            keep = usable[index]
+            if fetch == len(self) or (keep.sum(axis=1) >= k).all():
+                break
+            fetch = min(fetch * 2, len(self))
+        # First k available per row, in distance order
+        slot = np.cumsum(keep, axis=1) - 1
+        keep &= slot < k
+        rows = np.repeat(np.arange(len(index)), keep.sum(axis=1))
+        nearest = np.full((len(index), k), -1, dtype=np.int64)
+        nearest[rows, slot[keep]] = self.codes[index[keep]]
+        result[located] = nearest
+        return result
+
+    # Evaluators for an ad-hoc site in mileage layout, with estimated road miles,
+    # drive time and the usual cost rules applied
+    def site_table(self, lat, lon, k=10, radius=None):
+        codes, straight = self.within(lat, lon, radius) if radius else self.nearest(lat, lon, k)
+        detour = self.road_model['detour'] if self.road_model else 1.0
+        one_way = np.round(straight * detour)
+        site_df = pd.DataFrame({
+            'Evaluator': self.model.evaluator_names[codes],
+            'Customer': "Ad-hoc site",
+            'Straight-Line Miles': np.round(straight, 1),
+            'One-Way Miles': one_way,
+            'Round-Trip Miles': 2 * one_way,
+        })
+        if self.road_model:
+            site_df['Drive Time (min)'] = np.round(self.road_model['minutes_intercept'] +
+                                                   self.road_model['minutes_per_mile'] * site_df['Round-Trip Miles'])
+        full_time_names = self.model.evaluator_names[self.model.full_time]
+        return core.enrich_mileage(site_df, full_time_names).assign(Estimated=True)
+
+
+def _stamp(*paths):
+    return tuple((path, os.path.getmtime(path)) for path in paths if os.path.exists(path))
+
+
+@lru_cache(maxsize=2)
+def _cached_locator(model, stamp):
+    locations = de.load_locations(model)
+    try:
+        road_model = de.fit_road_model(model, locations['evaluators'], locations['customers'])
+    except (ValueError, np.linalg.LinAlgError):
+        road_model = None
+    return EvaluatorLocator(model, locations, road_model)
+
+
+# One locator per mileage model and location files, or None without ZIP centroids
+def shared_locator(model):
+    if not os.path.exists(de.ZIP_CENTROIDS_FILE):
+        return None
+    return _cached_locator(model, _stamp(de.ZIP_CENTROIDS_FILE, de.CUSTOMER_LOCATIONS_FILE,
+                                         de.EVALUATOR_LOCATIONS_FILE, core.FULL_TIME_FILE))
@@ -0,0 +1,116 @@
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+from datetime import datetime, timezone
+
+from benchmark import git_revision
+
+# Cold-start time of each Streamlit entry point: a fresh interpreter per page
+# renders it once through streamlit.testing (no upload, so the page stops at
+# its first prompt) and reports how long that took and which heavy modules it
+# loaded on the way. Pages should only import pulp, rapidfuzz, openpyxl and
+# scipy once a stage that needs them runs.
+#
+#   python startup_benchmark.py --budget 3.0
+#
+# Appends one JSON record per page to startup_results.jsonl and exits non-zero
+# when a page renders over budget, raises, or loads a heavy module before its
+# first prompt.
+
+ENTRY_POINTS = [
+    "app.py", "evaluator_app.py", "evaluator_app2.py", "evaluator_app3.py", "evaulator_app4.py",
+    "evaluator_app5.py", "evaluator_app6.py", "evaluator_app7.py", "evaluator_optomization_app.py",
+    "evaluator_optomization_app2.py", "evaluator_optomization_app3.py", "evaluator_optomization_app4.py",
+    "evaluator_scenario_app.py", "evaluator_history_app.py",
+]
+HEAVY_MODULES = ["pulp", "rapidfuzz", "openpyxl", "scipy"]
+DEFAULT_BUDGET = float(os.environ.get("EVALUATOR_STARTUP_BUDGET", "3.0"))
+DEFAULT_OUTPUT = "startup_results.jsonl"
+
+# Runs in the child interpreter: argv[1] is the page, argv[2] the heavy modules
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+imported = time.perf_counter()
+at = AppTest.from_file(sys.argv[1], default_timeout=120).run()
+rendered = time.perf_counter()
+print(json.dumps({
+    'import_seconds': round(imported - start, 4),
+    'render_seconds': round(rendered - imported, 4),
+    'total_seconds': round(rendered - start, 4),
+    'exceptions': [e.value for e in at.exception],
+    'heavy_modules': [m for m in sys.argv[2].split(",") if m in sys.modules],
+}))
+"""
+
+
+def measure(page, heavy_modules=HEAVY_MODULES, env=None):
+    result = subprocess.run(
+        [sys.executable, "-c", PROBE, page, ",".join(heavy_modules)],
+        capture_output=True, text=True, env=env,
+    )
+    lines = result.stdout.strip().splitlines()
+    if result.returncode != 0 or not lines:
+        # Last stderr line (the exception message); a crash without one still counts
+        exceptions = result.stderr.strip().splitlines()[-1:] or [f"exit code {result.returncode}, no output"]
+        return {'total_seconds': None, 'exceptions': exceptions, 'heavy_modules': []}
+    return json.loads(lines[-1])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure cold-start time of each Streamlit page.")
+    parser.add_argument("pages", nargs="*", default=ENTRY_POINTS)
+    parser.add_argument("--budget", type=float, default=DEFAULT_BUDGET, help="seconds per page")
+    parser.add_argument("--repeat", type=int, default=1, help="runs per page (the fastest counts)")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT, help="JSONL file to append results to")
+    args = parser.parse_args(argv)
+
+    revision = git_revision()
+    failed = []
+    # Keep pages that write state (the assignment history) out of the working tree
+    with tempfile.TemporaryDirectory() as tmp, open(args.output, "a") as out:
+        env = dict(os.environ, EVALUATOR_HISTORY_DB=os.path.join(tmp, "history.sqlite3"),
+                   EVALUATOR_RUN_LOG=os.path.join(tmp, "run_log.jsonl"))
+        for page in args.pages:
+            runs = [measure(page, env=env) for _ in range(max(args.repeat, 1))]
+            timed = [run for run in runs if run['total_seconds'] is not None]
+            best = min(timed, key=lambda run: run['total_seconds']) if timed else runs[0]
+            within = best['total_seconds'] is not None and best['total_seconds'] <= args.budget
+            problems = []
+            if not within:
+                problems.append("OVER BUDGET")
+            if best['exceptions']:
+                problems.append("RAISED")
+            if best['heavy_modules']:
+                problems.append("HEAVY IMPORTS")
+            record = {
+                'timestamp': datetime.now(timezone.utc).isoformat(timespec="seconds"),
+                'git_revision': revision,
+                'python': platform.python_version(),
+                'page': page,
+                'budget_seconds': args.budget,
+                'within_budget': within,
+                'passed': not problems,
+                **best,
+            }
+            out.write(json.dumps(record) + "\n")
+            out.flush()
+            if problems:
+                failed.append(page)
+            seconds = "failed" if best['total_seconds'] is None else f"{best['total_seconds']:.2f}s"
+            heavy = ",".join(best['heavy_modules']) or "-"
+            print(f"{page:36} {seconds:>8}  heavy={heavy}{''.join('  ' + p for p in problems)}")
+
+    if failed:
+        print(f"{len(failed)} page(s) failed (budget {args.budget:.2f}s, no exceptions, no heavy imports): "
+              f"{', '.join(failed)}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,143 @@
+import os
+import numpy as np
+import pandas as pd
+
+from evaluator_core import LAST_RESORT_MANAGERS
+
+# Seeded generator for mileage matrices, full-time rosters and job files that
+# follow the real column layout, for benchmarks and engine comparisons
+
+STATES = ["NH", "NY", "NJ", "MA", "CT", "VT", "ME", "PA", "RI"]
+COMPANY_WORDS = [
+    "Industrial", "Construction", "Energy", "Power", "Services", "Utilities", "Steel",
+    "Marine", "Bridge", "Pipeline", "Water", "Coatings", "Fabrication", "Transit", "Gas"
+]
+COMPANY_SUFFIXES = ["Inc", "LLC", "Corp", "Co", "Group", "Ma", "Ny", "Ct", "Nj"]
+
+# Rough lat/lon box around the current service area
+LAT_RANGE = (39.5, 45.0)
+LON_RANGE = (-76.5, -69.5)
+ROAD_FACTOR = 1.25
+AVG_MPH = 55
+
+
+def evaluator_names(n_evaluators):
+    names = list(LAST_RESORT_MANAGERS[:n_evaluators])
+    names += [f"Evaluator{i:04d}" for i in range(len(names), n_evaluators)]
+    return names
+
+
+def customer_names(n_customers, seed=0):
+    rng = np.random.default_rng(seed)
+    words = rng.choice(COMPANY_WORDS, size=(n_customers, 2))
+    suffixes = rng.choice(COMPANY_SUFFIXES, size=n_customers)
+    return [f"{a} {b} {s} {i:05d}" for i, ((a, b), s) in enumerate(zip(words, suffixes))]
+
+
+def _coords(rng, n):
+    return rng.uniform(*LAT_RANGE, size=n), rng.uniform(*LON_RANGE, size=n)
+
+
+def _haversine_miles(lat1, lon1, lat2, lon2):
+    lat1, lon1, lat2, lon2 = map(np.radians, (lat1, lon1, lat2, lon2))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 3958.8 * 2 * np.arcsin(np.sqrt(a))
+
+
+def _money(values):
+    return pd.Series(values).map(lambda v: f"${v:,.2f} ")
+
+
+# Full-time roster ('Last Name', 'Street', 'City', 'State', 'Zip')
+def make_roster(n_evaluators, full_time_share=0.3, seed=0):
+    rng = np.random.default_rng(seed)
+    names = evaluator_names(n_evaluators)
+    n_full_time = max(1, int(n_evaluators * full_time_share))
+    picked = sorted(rng.choice(n_evaluators, size=n_full_time, replace=False))
+    return pd.DataFrame({
+        'Last Name': [names[i] for i in picked],
+        'Street': [f"{rng.integers(1, 999)} Main St" for _ in picked],
+        'City': [f"Town{i:04d}" for i in picked],
+        'State': rng.choice(STATES, size=n_full_time),
+        'Zip': rng.integers(1000, 19999, size=n_full_time),
+    })
+
+
+# Evaluator x customer mileage matrix in the Evaluator_Customer_Mileage.csv layout
+def make_mileage(n_evaluators, n_customers, density=1.0, seed=0):
+    rng = np.random.default_rng(seed)
+    eval_lat, eval_lon = _coords(rng, n_evaluators)
+    cust_lat, cust_lon = _coords(rng, n_customers)
+
+    eval_idx = np.repeat(np.arange(n_evaluators), n_customers)
+    cust_idx = np.tile(np.arange(n_customers), n_evaluators)
+    if density < 1.0:
+        keep = rng.random(len(eval_idx)) < density
+        eval_idx, cust_idx = eval_idx[keep], cust_idx[keep]
+
+    one_way = _haversine_miles(eval_lat[eval_idx], eval_lon[eval_idx],
+                               cust_lat[cust_idx], cust_lon[cust_idx]) * ROAD_FACTOR
+    one_way = np.maximum(np.round(one_way), 1)
+    round_trip = one_way * 2
+    drive_time = np.round(one_way / AVG_MPH * 60 * rng.uniform(0.9, 1.2, size=len(one_way)))
+    cost = _money(round_trip * 0.725).to_numpy()
+
+    names = np.array(evaluator_names(n_evaluators), dtype=object)
+    customers = np.array(customer_names(n_customers, seed), dtype=object)
+    return pd.DataFrame({
+        'Evaluator': names[eval_idx],
+        'Customer': customers[cust_idx],
+        'One-Way Miles': one_way,
+        'Round-Trip Miles': round_trip,
+        'Drive Time (min)': drive_time,
+        '2026 Cost ': cost,
+        ' Bonus ': " $-   ",
+        ' Total ': cost,
+    })
+
+
+# Job file rows with 'Job number', 'Customer Company' and 'Assignee(s)';
+# company names get case, spacing and typo noise so fuzzy matching has work to do
+def make_jobs(n_jobs, customers, max_assignees=3, noise=0.3, unknown_share=0.02, seed=0):
+    rng = np.random.default_rng(seed)
+    picked = rng.choice(np.asarray(customers, dtype=object), size=n_jobs)
+    companies = []
+    for name in picked:
+        roll = rng.random()
+        if roll < unknown_share:
+            name = f"Unknown Prospect {rng.integers(1, 10 ** 6)}"
+        elif roll < noise:
+            chars = list(name.upper() if rng.random() < 0.5 else name)
+            pos = int(rng.integers(0, len(chars)))
+            chars[pos] = chars[pos] * 2
+            name = "  " + "".join(chars) + " "
+        companies.append(name)
+
+    needed = rng.integers(1, max_assignees + 1, size=n_jobs)
+    assignees = [", ".join(f"Tech{j}" for j in range(k)) for k in needed]
+    # Some jobs have no assignee listed yet (counted as one evaluator)
+    assignees = [a if rng.random() > 0.1 else None for a in assignees]
+    return pd.DataFrame({
+        'Job number': np.arange(100000, 100000 + n_jobs),
+        'Customer Company': companies,
+        'Assignee(s)': assignees,
+        'Job Date': pd.Timestamp("2026-01-05") + pd.to_timedelta(rng.integers(0, 60, size=n_jobs), unit="D"),
+    })
+
+
+# Write a full dataset (mileage CSV, roster CSV, jobs .xlsx) into out_dir
+def write_dataset(out_dir, n_evaluators, n_customers, n_jobs, density=1.0, seed=0):
+    os.makedirs(out_dir, exist_ok=True)
+    mileage_df = make_mileage(n_evaluators, n_customers, density=density, seed=seed)
+    roster_df = make_roster(n_evaluators, seed=seed)
+    jobs_df = make_jobs(n_jobs, mileage_df['Customer'].unique(), seed=seed)
+
+    paths = {
+        'mileage': os.path.join(out_dir, "Evaluator_Customer_Mileage.csv"),
+        'roster': os.path.join(out_dir, "Evaluators_FullTime.csv"),
+        'jobs': os.path.join(out_dir, "Jobs.xlsx"),
+    }
+    mileage_df.to_csv(paths['mileage'], index=False)
+    roster_df.to_csv(paths['roster'], index=False)
+    jobs_df.to_excel(paths['jobs'], index=False)
+    return paths
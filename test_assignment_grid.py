@@ -0,0 +1,57 @@
+import numpy as np
+
+from assignment_grid import AssignmentGrid
+
+
+def _codes(model, *names):
+    return np.array([model.evaluator_code(name) if name else -1 for name in names])
+
+
+def _grid(model, *customers):
+    return AssignmentGrid(model, [model.customer_code(c) if c else -1 for c in customers])
+
+
+def test_defaults_take_cheapest_unused(small_model):
+    grid = _grid(small_model, "Xavier Inc", "Yates Co")
+    assert grid.default_codes.tolist() == _codes(small_model, "Adams", "Baker").tolist()
+    assert grid.total == 60.0 and grid.open_jobs() == []
+
+
+def test_swap_resolves_through_waiting_queue(small_model):
+    grid = _grid(small_model, "Xavier Inc", "Yates Co")
+    baker, adams = _codes(small_model, "Baker", "Adams")
+
+    grid.update(_codes(small_model, "Baker", "Baker"))
+    assert grid.conflicts() == [(0, baker, 1)]
+    assert grid.assigned_jobs().tolist() == [1]
+
+    changed = grid.update(_codes(small_model, "Baker", "Adams"))
+    assert changed.tolist() == [1]
+    assert grid.conflicts() == []
+    assert grid.total == 25.0
+    assert small_model.evaluator_codes[grid.rows].tolist() == [baker, adams]
+
+
+def test_open_jobs_follow_current_requests(small_model):
+    grid = _grid(small_model, "Yates Co", "Yates Co", "Xavier Inc", None)
+    assert grid.open_jobs() == [(3, False, False)]
+
+    # Cleared, Baker still free
+    grid.update(_codes(small_model, "Adams", "", "Carter", ""))
+    assert grid.open_jobs() == [(1, True, True), (3, False, False)]
+
+    # Cleared, both Yates evaluators held by other jobs
+    grid.update(_codes(small_model, "Adams", "", "Baker", ""))
+    assert grid.open_jobs() == [(1, True, False), (3, False, False)]
+
+    # Assigned again: no longer reported
+    grid.update(_codes(small_model, "Baker", "Adams", "Carter", ""))
+    assert grid.open_jobs() == [(3, False, False)]
+    assert grid.total == 85.0
+
+
+def test_unpriced_request(small_model):
+    grid = _grid(small_model, "Yates Co")
+    grid.update(_codes(small_model, "Carter"))
+    assert grid.unpriced() == [0]
+    assert len(grid.assigned_jobs()) == 0 and grid.total == 0.0
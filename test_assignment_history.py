@@ -0,0 +1,143 @@
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import assignment_history as history
+
+EVALUATORS = ["Avery", "Baker", "Cole", "Diaz"]
+CUSTOMERS = ["acme corp", "baker llc", "coastal inc"]
+
+
+# Final tables in the pages' layout plus their job files, two plans that share
+# nothing but evaluators and customers
+def _plan(seed, first_job):
+    rng = np.random.default_rng(seed)
+    n_jobs = 30
+    jobs_df = pd.DataFrame({
+        'Job number': np.arange(first_job, first_job + n_jobs),
+        'Customer Company': rng.choice(CUSTOMERS, n_jobs),
+        'Job Date': pd.Timestamp("2026-01-05") + pd.to_timedelta(rng.integers(0, 110, n_jobs), unit="D"),
+    })
+    # Some jobs need two evaluators
+    slots = jobs_df.loc[np.repeat(jobs_df.index, rng.integers(1, 3, n_jobs))].reset_index(drop=True)
+    final_df = pd.DataFrame({
+        'Job number': slots['Job number'],
+        'Customer Company': slots['Customer Company'],
+        'Evaluator': rng.choice(EVALUATORS, len(slots)),
+        'Round-Trip Miles': rng.integers(10, 400, len(slots)) / 2,
+        'Total Cost': rng.integers(2000, 90000, len(slots)) / 100,
+        'Status': "Contract",
+    })
+    return final_df, jobs_df
+
+
+# The same rows as the assignments table, built in pandas
+def _expected_rows(plans):
+    frames = []
+    for final_df, jobs_df in plans:
+        dates = final_df['Job number'].map(jobs_df.set_index('Job number')['Job Date'])
+        frames.append(pd.DataFrame({
+            'job_date': dates, 'job_number': final_df['Job number'].astype(str),
+            'customer': final_df['Customer Company'].str.title(), 'evaluator': final_df['Evaluator'],
+            'round_trip_miles': final_df['Round-Trip Miles'], 'total_cost': final_df['Total Cost'],
+        }))
+    return pd.concat(frames, ignore_index=True)
+
+
+@pytest.fixture
+def db(tmp_path):
+    plans = [_plan(1, 1000), _plan(2, 2000)]
+    path = str(tmp_path / "history.sqlite3")
+    for final_df, jobs_df in plans:
+        history.record_plan(final_df, jobs_df, page="test", path=path)
+    return path, _expected_rows(plans)
+
+
+def test_same_plan_is_stored_once(tmp_path):
+    path = str(tmp_path / "history.sqlite3")
+    final_df, jobs_df = _plan(1, 1000)
+    plan_id, created = history.record_plan(final_df, jobs_df, path=path)
+    # Row order does not change the plan
+    again, created_again = history.record_plan(final_df.iloc[::-1], jobs_df, path=path)
+
+    assert created and not created_again and again == plan_id
+    summary = history.history_summary(path)
+    assert summary['plans'] == 1 and summary['assignments'] == len(final_df)
+
+    _, created_changed = history.record_plan(final_df.assign(Evaluator="Avery"), jobs_df, path=path)
+    assert created_changed and history.history_summary(path)['plans'] == 2
+
+
+def test_missing_job_dates_fall_back_to_today(tmp_path):
+    path = str(tmp_path / "history.sqlite3")
+    today = datetime.now(timezone.utc).date().isoformat()
+    final_df, jobs_df = _plan(1, 1000)
+    history.record_plan(final_df, jobs_df.drop(columns='Job Date'), path=path)
+    assert history.query("SELECT DISTINCT job_date FROM assignments", path=path)['job_date'].tolist() == [today]
+
+    # Per job: a blank date, or a job missing from the job file
+    jobs_df.loc[0, 'Job Date'] = pd.NaT
+    partial = jobs_df[jobs_df['Job number'] != 1001]
+    history.record_plan(final_df.assign(Status="Retainer"), partial, path=path)
+    stored = history.query("SELECT job_number, job_date FROM assignments WHERE status = 'Retainer'", path=path)
+    stored = stored.drop_duplicates().set_index('job_number')['job_date']
+    assert stored['1000'] == today and stored['1001'] == today
+    expected = jobs_df.set_index('Job number')['Job Date'].dt.strftime("%Y-%m-%d")
+    assert stored.drop(['1000', '1001']).to_dict() == {str(k): v for k, v in expected.drop([1000, 1001]).items()}
+
+
+def test_evaluator_workload_matches_pandas(db):
+    path, rows = db
+    start, end = "2026-02-01", "2026-03-31"
+    result = history.evaluator_workload(start, end, path=path)
+
+    within = rows[(rows['job_date'] >= start) & (rows['job_date'] <= end)]
+    expected = within.groupby('evaluator').agg(
+        Assignments=('job_number', 'size'), Jobs=('job_number', 'nunique'),
+        miles=('round_trip_miles', 'sum'), cost=('total_cost', 'sum'),
+        first=('job_date', 'min'), last=('job_date', 'max'),
+    ).reset_index().sort_values(['Assignments', 'evaluator'], ascending=[False, True])
+
+    assert result['Evaluator'].tolist() == expected['evaluator'].tolist()
+    assert result['Assignments'].tolist() == expected['Assignments'].tolist()
+    assert result['Jobs'].tolist() == expected['Jobs'].tolist()
+    np.testing.assert_allclose(result['Round-Trip Miles'], expected['miles'].round(1))
+    np.testing.assert_allclose(result['Total Cost'], expected['cost'], atol=0.005)
+    assert result['First Job'].tolist() == expected['first'].dt.strftime("%Y-%m-%d").tolist()
+    assert result['Last Job'].tolist() == expected['last'].dt.strftime("%Y-%m-%d").tolist()
+
+
+def test_repeat_pairings_match_pandas(db):
+    path, rows = db
+    result = history.repeat_pairings(min_count=5, path=path)
+
+    pairs = rows.groupby(['customer', 'evaluator']).agg(
+        Times=('total_cost', 'size'), average=('total_cost', 'mean'), last=('job_date', 'max'),
+    ).reset_index()
+    expected = pairs[pairs['Times'] >= 5].sort_values(['Times', 'customer', 'evaluator'],
+                                                      ascending=[False, True, True])
+
+    assert len(result) > 0
+    assert result[['Customer', 'Evaluator', 'Times']].values.tolist() == \
+        expected[['customer', 'evaluator', 'Times']].values.tolist()
+    np.testing.assert_allclose(result['Average Cost'], expected['average'], atol=0.005)
+    assert result['Last Job'].tolist() == expected['last'].dt.strftime("%Y-%m-%d").tolist()
+    assert len(history.repeat_pairings(min_count=1, limit=3, path=path)) == 3
+
+
+@pytest.mark.parametrize("period", ["week", "month"])
+def test_cost_trend_matches_pandas(db, period):
+    path, rows = db
+    result = history.cost_trend(period, path=path)
+
+    grouped = rows.groupby(rows['job_date'].dt.strftime(history.PERIODS[period]))
+    expected = grouped.agg(Assignments=('total_cost', 'size'), total=('total_cost', 'sum'),
+                           average=('total_cost', 'mean'), miles=('round_trip_miles', 'mean'))
+
+    assert result['Period'].tolist() == expected.index.tolist()
+    assert result['Assignments'].tolist() == expected['Assignments'].tolist()
+    np.testing.assert_allclose(result['Total Cost'], expected['total'], atol=0.005)
+    np.testing.assert_allclose(result['Average Cost'], expected['average'], atol=0.005)
+    np.testing.assert_allclose(result['Average Miles'], expected['miles'], atol=0.05)
@@ -0,0 +1,97 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from assignment_service import AssignmentService, local_request
+from evaluator_core import UNFILLED_PENALTY
+from mileage_model import shared_mileage_model
+
+
+@pytest.fixture
+def service():
+    # Threads instead of the process pool, so the test needs no worker start-up
+    service = AssignmentService(workers=2, queue_size=2, executor=ThreadPoolExecutor(max_workers=2))
+    yield service
+    service.shutdown()
+
+
+@pytest.fixture(scope="module")
+def customers():
+    return list(shared_mileage_model().frame()['Customer'].cat.categories[:3])
+
+
+def test_health_and_errors(service):
+    assert local_request(service, "GET", "/health")[0] == 200
+    assert local_request(service, "GET", "/nowhere")[0] == 404
+    status, result = local_request(service, "POST", "/rank", {'customer': "No Such Customer"})
+    assert status == 404 and "Unknown customer" in result['error']
+    status, result = local_request(service, "POST", "/optimize", {'jobs': [], 'engine': "quantum"})
+    assert status == 400 and "Unknown engine" in result['error']
+
+
+def test_busy_service_answers_503(service):
+    service.active = service.workers + service.queue_size
+    status, result = local_request(service, "POST", "/match", {'companies': ["x"]})
+    assert status == 503 and "busy" in result['error']
+
+
+def test_match_and_rank(service, customers):
+    status, result = local_request(service, "POST", "/match", {'companies': [customers[0].upper()]})
+    assert status == 200 and result['matches'] == {customers[0].lower(): customers[0]}
+
+    status, result = local_request(service, "POST", "/rank", {'customer': customers[0], 'top_n': 3})
+    costs = [row['Total Cost'] for row in result['evaluators']]
+    assert status == 200 and len(costs) == 3 and costs == sorted(costs)
+
+
+def test_coverage(service):
+    status, result = local_request(service, "POST", "/coverage", {'evaluator': "barnhart", 'max_rank': 2})
+    assert status == 200 and result['evaluator'] == "Barnhart"
+    ranks = [row['rank'] for row in result['customers']]
+    assert ranks and ranks == sorted(ranks) and set(ranks) <= {1, 2}
+    assert all(row['rank'] <= row['competitors'] for row in result['customers'])
+
+
+@pytest.mark.parametrize("engine", ["mip", "auction", "greedy"])
+def test_optimize(service, customers, engine):
+    jobs = [{'job_number': i + 1, 'customer': name, 'evaluators_needed': 1 + i % 2}
+            for i, name in enumerate(customers)]
+    jobs.append({'job_number': 99, 'customer': "No Such Customer", 'evaluators_needed': 1})
+    status, result = local_request(service, "POST", "/optimize", {'jobs': jobs, 'engine': engine})
+
+    assert status == 200 and result['engine'] == engine
+    assert result['job_slots'] == 4
+    assert [job['job_number'] for job in result['unassigned']] == [99]
+    evaluators = [a['evaluator'] for a in result['assignments']]
+    assert len(evaluators) == 4
+    if engine != "greedy":
+        assert result['status'] == "Optimal"
+    assert len(set(evaluators)) == len(evaluators)
+
+
+def test_unfilled_penalty_leaves_slots_open(service, customers):
+    frame = shared_mileage_model().frame()
+    serving = frame[frame['Customer'].isin(customers)].groupby('Evaluator', observed=True)['Customer'].nunique()
+    evaluators = sorted(serving[serving == len(customers)].index.astype(str))[:2]
+    jobs = [{'job_number': i + 1, 'customer': name, 'evaluators_needed': 1 + i % 2}
+            for i, name in enumerate(customers)]
+    payload = {'jobs': jobs, 'available_evaluators': evaluators, 'engine': "mip"}
+
+    status, result = local_request(service, "POST", "/optimize", payload)
+    assert status == 200 and result['status'] != "Optimal"
+
+    payload['unfilled_penalty'] = UNFILLED_PENALTY
+    status, result = local_request(service, "POST", "/optimize", payload)
+    assert status == 200 and result['status'] == "Optimal"
+    assert result['job_slots'] == 4 and result['unfilled_slots'] == 2 and len(result['assignments']) == 2
+
+    status, frontier = local_request(service, "POST", "/frontier", payload)
+    assert status == 200 and frontier['points']
+    assert all(point['Assigned'] == 2 for point in frontier['points'])
+
+    status, contingency = local_request(service, "POST", "/contingency",
+                                        {**payload, 'assignments': result['assignments']})
+    rows = contingency['evaluators']
+    assert status == 200 and len(rows) == 2
+    assert all(not row['Uncoverable'] and "left unfilled" in row['Moves'] for row in rows)
+    assert all(row['Cost Delta'] < UNFILLED_PENALTY for row in rows)
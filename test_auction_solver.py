@@ -0,0 +1,65 @@
+import numpy as np
+import pytest
+from scipy.optimize import linear_sum_assignment
+
+from auction_solver import auction_arrays, auction_phases, solve_auction
+
+
+# Random instance: cost_matrix over (evaluator, job) pairs and job slots
+def _instance(seed, n_evaluators=30, n_jobs=10, density=0.6):
+    rng = np.random.default_rng(seed)
+    job_slots = [(job, "Customer") for job in range(n_jobs) for _ in range(rng.integers(1, 3))]
+    cost_matrix = {(f"E{e}", job): float(rng.integers(50, 2000)) + rng.integers(0, 100) / 100
+                   for e in range(n_evaluators) for job in range(n_jobs) if rng.random() < density}
+    return cost_matrix, job_slots
+
+
+# Optimal total in dollars (Hungarian method on slots x evaluators)
+def _optimum(cost_matrix, job_slots, unfilled_penalty=None):
+    evaluators = sorted({e for e, _ in cost_matrix})
+    big = 1e9
+    costs = np.full((len(job_slots), len(evaluators)), big)
+    for i, (job, _) in enumerate(job_slots):
+        for k, evaluator in enumerate(evaluators):
+            costs[i, k] = cost_matrix.get((evaluator, job), big)
+    if unfilled_penalty is not None:
+        costs = np.hstack([costs, np.full((len(job_slots), len(job_slots)), big)])
+        costs[:, len(evaluators):][np.diag_indices(len(job_slots))] = unfilled_penalty
+    rows, cols = linear_sum_assignment(costs)
+    total = costs[rows, cols].sum()
+    return None if total >= big else round(total, 2)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_phases_bracket_the_optimum(seed):
+    cost_matrix, job_slots = _instance(seed)
+    optimum = _optimum(cost_matrix, job_slots)
+    phases = list(auction_phases(auction_arrays(cost_matrix, job_slots)))
+
+    assert phases
+    for phase in phases:
+        assert phase['lower_bound'] <= optimum + 1e-6 <= phase['objective'] + 2e-6
+        assert phase['gap'] == pytest.approx(phase['objective'] - phase['lower_bound'])
+    assert phases[-1]['objective'] == pytest.approx(optimum)
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_solve_matches_optimum(seed):
+    cost_matrix, job_slots = _instance(seed)
+    assignments, status, stats = solve_auction(cost_matrix, job_slots)
+
+    assert status == "Optimal" and stats['gap'] < 0.01
+    assert sum(cost_matrix[pair] for pair in assignments) == pytest.approx(_optimum(cost_matrix, job_slots))
+    assert len(assignments) == len(job_slots)
+    assert len({e for e, _ in assignments}) == len(assignments)
+
+
+def test_infeasible_without_penalty():
+    cost_matrix = {("E0", 1): 10.0, ("E1", 1): 20.0, ("E0", 2): 5.0}
+    job_slots = [(1, "C"), (1, "C"), (2, "C")]
+    assert solve_auction(cost_matrix, job_slots)[1] == "Infeasible"
+
+    assignments, status, stats = solve_auction(cost_matrix, job_slots, unfilled_penalty=1000)
+    assert status == "Optimal" and stats['unfilled'] == 1
+    assert sum(cost_matrix[pair] for pair in assignments) + 1000 == pytest.approx(
+        _optimum(cost_matrix, job_slots, unfilled_penalty=1000))
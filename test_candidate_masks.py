@@ -0,0 +1,38 @@
+import numpy as np
+
+from candidate_masks import JobCandidates, evaluator_mask
+
+
+def _names(model, rows):
+    return [model.evaluator_names[model.evaluator_codes[row]] if row >= 0 else None for row in np.atleast_1d(rows)]
+
+
+def test_next_best_skips_used_and_unavailable(small_model):
+    xavier, yates = small_model.customer_code("Xavier Inc"), small_model.customer_code("Yates Co")
+    available = evaluator_mask(small_model, ["Adams", "Baker", "Carter"])
+    available[small_model.evaluator_code("Baker")] = False
+    candidates = JobCandidates(small_model, [xavier, yates, -1], by="cost", available=available)
+
+    assert _names(small_model, candidates.candidates(0)) == ["Adams", "Carter"]
+    assert _names(small_model, candidates.next_best(0)) == ["Adams"]
+    candidates.use(small_model.evaluator_code("Adams"))
+    assert _names(small_model, candidates.next_best(0)) == ["Carter"]
+    # Yates Co: Adams used, Baker unavailable, Carter has no mileage
+    assert candidates.next_best(1) == -1
+    assert candidates.next_best(2) == -1 and len(candidates.candidates(2)) == 0
+    assert _names(small_model, candidates.candidates(0, unused=True)) == ["Carter"]
+
+
+def test_take_marks_evaluators_used(small_model):
+    xavier, yates = small_model.customer_code("Xavier Inc"), small_model.customer_code("Yates Co")
+    candidates = JobCandidates(small_model, [yates, xavier], by="miles")
+
+    assert _names(small_model, candidates.take(0, 3)) == ["Adams", "Baker"]
+    assert _names(small_model, candidates.take(1, 2)) == ["Carter"]
+    assert candidates.used.sum() == 3
+    assert len(candidates.take(1, 1)) == 0
+
+
+def test_evaluator_mask_ignores_unknown_names(small_model):
+    mask = evaluator_mask(small_model, ["Baker", "Nobody"])
+    assert small_model.evaluator_names[mask].tolist() == ["Baker"]
@@ -0,0 +1,101 @@
+import numpy as np
+import pandas as pd
+import pytest
+from scipy.optimize import linear_sum_assignment
+
+from contingency import PARALLEL_MIN, contingency_table
+
+
+# Sparse evaluator x job costs (inf where the pair is missing) as a cost matrix
+# dict, and its optimal plan
+def _instance(n_evaluators, n_jobs, seed, density=0.6):
+    rng = np.random.default_rng(seed)
+    cost = rng.integers(50, 500, size=(n_evaluators, n_jobs)).astype(float)
+    cost[rng.random(cost.shape) > density] = np.inf
+    # Keep the base plan feasible: evaluator j can always take job j
+    cost[np.arange(n_jobs), np.arange(n_jobs)] = rng.integers(50, 500, size=n_jobs)
+    cost_matrix = {(f"E{e:03d}", 1000 + j): cost[e, j]
+                   for e, j in zip(*np.nonzero(np.isfinite(cost)))}
+    return cost, cost_matrix, _solve(cost)
+
+
+def _solve(cost):
+    rows, cols = linear_sum_assignment(cost)
+    return [(f"E{e:03d}", 1000 + j) for e, j in zip(rows, cols)], cost[rows, cols].sum()
+
+
+def _table(cost_matrix, plan, workers=1, unfilled_penalty=None):
+    return contingency_table(cost_matrix, plan, workers=workers, unfilled_penalty=unfilled_penalty,
+                             last_resort_managers=())
+
+
+# Optimal total with open slots allowed: one extra row per job that only
+# "fills" it at the penalty
+def _solve_with_penalty(cost, penalty):
+    n_evaluators, n_jobs = cost.shape
+    open_rows = np.full((n_jobs, n_jobs), np.inf)
+    np.fill_diagonal(open_rows, penalty)
+    padded = np.vstack([cost, open_rows])
+    rows, cols = linear_sum_assignment(padded)
+    plan = [(f"E{e:03d}", 1000 + j) for e, j in zip(rows, cols) if e < n_evaluators]
+    return plan, padded[rows, cols].sum()
+
+
+def test_cost_delta_matches_resolve():
+    cost, cost_matrix, (plan, base) = _instance(12, 8, seed=5)
+    table = _table(cost_matrix, plan).set_index('Evaluator')
+
+    assert len(table) == len(plan)
+    for evaluator, job in plan:
+        without = cost.copy()
+        without[int(evaluator[1:])] = np.inf
+        try:
+            expected = _solve(without)[1] - base
+        except ValueError:
+            expected = np.nan
+        assert table.loc[evaluator, 'Job number'] == job
+        if np.isnan(expected):
+            assert table.loc[evaluator, 'Uncoverable']
+        else:
+            assert table.loc[evaluator, 'Cost Delta'] == pytest.approx(expected)
+            assert table.loc[evaluator, 'Reassigned'] >= 1
+
+
+def test_uncoverable_slot():
+    cost = np.array([[100.0, np.inf],
+                     [np.inf, 120.0],
+                     [np.inf, 300.0]])
+    cost_matrix = {(f"E{e:03d}", 1000 + j): cost[e, j] for e, j in zip(*np.nonzero(np.isfinite(cost)))}
+    table = _table(cost_matrix, _solve(cost)[0])
+
+    # Only E000 can take job 1000; E001's job falls to E002
+    assert table['Evaluator'].tolist() == ["E000", "E001"]
+    assert table['Uncoverable'].tolist() == [True, False]
+    assert np.isnan(table['Cost Delta'].iloc[0]) and table['Replacement'].iloc[0] == ""
+    assert table['Moves'].iloc[0] == "No available evaluator can cover this job"
+    assert table['Cost Delta'].iloc[1] == 180.0 and table['Replacement'].iloc[1] == "E002"
+
+
+def test_pool_matches_serial():
+    _, cost_matrix, (plan, _) = _instance(PARALLEL_MIN + 26, PARALLEL_MIN + 6, seed=11, density=0.3)
+    assert len(plan) >= PARALLEL_MIN
+
+    pd.testing.assert_frame_equal(_table(cost_matrix, plan, workers=2), _table(cost_matrix, plan, workers=1))
+
+
+def test_cost_delta_with_open_slots_matches_resolve():
+    cost, cost_matrix, _ = _instance(9, 8, seed=6, density=0.4)
+    penalty = 300.0
+    plan, base = _solve_with_penalty(cost, penalty)
+    # One slot is already open in the base plan
+    assert len(plan) == 7
+    table = _table(cost_matrix, plan, unfilled_penalty=penalty).set_index('Evaluator')
+
+    assert not table['Uncoverable'].any()
+    left_open = table['Moves'].str.contains("left unfilled")
+    assert left_open.any() and not left_open.all()
+    for evaluator, _ in plan:
+        without = cost.copy()
+        without[int(evaluator[1:])] = np.inf
+        expected = _solve_with_penalty(without, penalty)[1] - base
+        assert table.loc[evaluator, 'Cost Delta'] == pytest.approx(expected)
@@ -0,0 +1,21 @@
+import numpy as np
+import pandas as pd
+
+from display_grid import closest_mask, sorted_index
+
+
+def test_categorical_columns_sort_by_name():
+    df = pd.DataFrame({
+        'Evaluator': pd.Categorical(["Weiss", "barnhart", "Adams", None, "Weiss"],
+                                    categories=["Weiss", "barnhart", "Adams"]),
+        'Round-Trip Miles': [5.0, 1.0, np.nan, 3.0, 2.0],
+    }, index=[10, 11, 12, 13, 14])
+
+    assert sorted_index(df, 'Evaluator').tolist() == [12, 11, 10, 14, 13]
+    assert sorted_index(df, 'Evaluator', ascending=False).tolist() == [10, 14, 11, 12, 13]
+    assert sorted_index(df, 'Round-Trip Miles').tolist() == [11, 14, 13, 10, 12]
+
+
+def test_closest_mask_per_customer():
+    df = pd.DataFrame({'Customer': ["X", "X", "Y", "Y"], 'Round-Trip Miles': [4.0, 2.0, np.nan, 7.0]})
+    assert closest_mask(df).tolist() == [False, True, False, True]
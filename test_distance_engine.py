@@ -0,0 +1,46 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import distance_engine as engine
+from mileage_model import MileageModel
+
+EVALUATOR_COORDS = np.array([[42.0, -72.0], [43.0, -71.0]])
+CUSTOMER_COORDS = np.array([[41.0, -73.0], [44.0, -70.0], [42.5, -74.0]])
+
+
+def _model(estimated_detour):
+    rows = []
+    for e, (e_lat, e_lon) in enumerate(EVALUATOR_COORDS):
+        for c, (c_lat, c_lon) in enumerate(CUSTOMER_COORDS):
+            straight = engine.haversine_miles(e_lat, e_lon, c_lat, c_lon)
+            # The last customer's pairs are estimates from an earlier run
+            estimated = c == len(CUSTOMER_COORDS) - 1
+            one_way = straight * (estimated_detour if estimated else 1.3)
+            rows.append((f"E{e}", f"C{c}", one_way, 2 * one_way, 2 * one_way * 1.1 + 5, 2 * one_way, estimated))
+    frame = pd.DataFrame(rows, columns=['Evaluator', 'Customer', 'One-Way Miles', 'Round-Trip Miles',
+                                        'Drive Time (min)', 'Total Cost', 'Estimated'])
+    frame['Status'] = "Contract"
+    return MileageModel.from_frame(frame)
+
+
+def test_fit_ignores_earlier_estimates():
+    road_model = engine.fit_road_model(_model(estimated_detour=2.0), EVALUATOR_COORDS, CUSTOMER_COORDS)
+    assert road_model['pairs'] == 4
+    assert road_model['detour'] == pytest.approx(1.3)
+    assert road_model['mean_abs_error_miles'] == pytest.approx(0, abs=1e-9)
+    assert road_model['minutes_per_mile'] == pytest.approx(1.1)
+
+
+def test_duplicate_zip_centroids(tmp_path):
+    path = tmp_path / "zips.csv"
+    path.write_text("Zip,Latitude,Longitude\n3301,43.2,-71.5\n03301,43.3,-71.6\n10001,40.7,-74.0\n")
+    centroids = engine.read_zip_centroids(str(path))
+    assert centroids.index.tolist() == ["03301", "10001"]
+
+    names = np.array(["Adams", "Baker"], dtype=object)
+    lookup = {"adams": 0, "baker": 1}.get
+    zips = pd.Series(["03301", "99999"], index=["Adams", "Baker"])
+    coords = engine.coordinates(names, zips, centroids, lambda name: lookup(name.lower()))
+    assert coords[0].tolist() == [43.2, -71.5]
+    assert np.isnan(coords[1]).all()
@@ -0,0 +1,88 @@
+import itertools
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import evaluator_core as core
+from drive_time_frontier import cost_time_frontier
+from mileage_model import MileageModel
+
+N_EVALUATORS, CUSTOMERS = 7, ["North Co", "South Co", "East Co", "West Co"]
+
+
+# Cost and drive time pull in different directions: cheap pairs tend to be slow
+@pytest.fixture
+def instance():
+    rng = np.random.default_rng(3)
+    rows = []
+    for e in range(N_EVALUATORS):
+        for customer in CUSTOMERS:
+            minutes = float(rng.integers(20, 300))
+            rows.append((f"Evaluator{e}", customer, minutes / 2, minutes, float(rng.integers(100, 400)) - minutes / 2))
+    frame = pd.DataFrame(rows, columns=['Evaluator', 'Customer', 'Round-Trip Miles', 'Drive Time (min)', 'Total Cost'])
+    frame['Status'] = "Contract"
+    mileage_df = MileageModel.from_frame(frame).frame()
+    job_slots = [(i + 1, customer) for i, customer in enumerate(CUSTOMERS)]
+    return frame, mileage_df, job_slots
+
+
+# Every feasible plan's (cost, drive time), by brute force
+def _all_plans(frame, job_slots):
+    pairs = frame.set_index(['Evaluator', 'Customer'])
+    evaluators = frame['Evaluator'].unique()
+    plans = []
+    for chosen in itertools.permutations(evaluators, len(job_slots)):
+        keys = [(e, customer) for e, (_, customer) in zip(chosen, job_slots)]
+        plans.append((pairs.loc[keys, 'Total Cost'].sum(), pairs.loc[keys, 'Drive Time (min)'].sum()))
+    return np.array(plans)
+
+
+def test_frontier_spans_min_cost_to_min_time(instance):
+    frame, mileage_df, job_slots = instance
+    frontier, stats = cost_time_frontier(mileage_df, job_slots, points=8)
+    plans = _all_plans(frame, job_slots)
+
+    assert stats['status'] == "Optimal" and len(frontier) >= 3
+    assert frontier['Total Cost'].iloc[0] == pytest.approx(plans[:, 0].min(), abs=0.01)
+    assert frontier['Drive Time (min)'].iloc[-1] == pytest.approx(plans[:, 1].min(), abs=0.1)
+    # Cheapest plan at the minimum drive time
+    fastest = plans[np.isclose(plans[:, 1], plans[:, 1].min())]
+    assert frontier['Total Cost'].iloc[-1] == pytest.approx(fastest[:, 0].min(), abs=0.01)
+
+    cost, minutes = frontier['Total Cost'].to_numpy(), frontier['Drive Time (min)'].to_numpy()
+    assert (np.diff(cost) > 0).all() and (np.diff(minutes) < 0).all()
+    assert frontier['Point'].tolist() == list(range(1, len(frontier) + 1))
+    for point_cost, point_minutes in zip(cost, minutes):
+        dominated = ((plans[:, 0] <= point_cost - 0.01) & (plans[:, 1] <= point_minutes + 0.05)) | \
+                    ((plans[:, 0] <= point_cost + 0.005) & (plans[:, 1] < point_minutes - 0.05))
+        assert not dominated.any()
+
+
+def test_failed_drive_time_solve_keeps_cheapest_plan(instance, monkeypatch):
+    frame, mileage_df, job_slots = instance
+    solve = core.solve_assignment_model
+    calls = []
+
+    def flaky_solve(*args, **kwargs):
+        calls.append(1)
+        return ([], "Not Solved") if len(calls) == 2 else solve(*args, **kwargs)
+
+    monkeypatch.setattr(core, "solve_assignment_model", flaky_solve)
+    frontier, stats = cost_time_frontier(mileage_df, job_slots, points=8)
+
+    assert stats['status'] == "Not Solved" and stats['solves'] == 2
+    assert len(frontier) == 1
+    assert frontier['Total Cost'].iloc[0] == pytest.approx(_all_plans(frame, job_slots)[:, 0].min(), abs=0.01)
+    assert len(frontier['assignments'].iloc[0]) == len(job_slots)
+
+
+def test_open_slots_stay_at_the_cheapest_plans_count(instance):
+    frame, mileage_df, job_slots = instance
+    # Three evaluators for four slots
+    few = mileage_df[mileage_df['Evaluator'].isin(["Evaluator0", "Evaluator1", "Evaluator2"])]
+    frontier, stats = cost_time_frontier(few, job_slots, points=6, unfilled_penalty=5000)
+
+    assert stats['status'] == "Optimal" and len(frontier) >= 2
+    assert (frontier['Assigned'] == 3).all()
+    assert (np.diff(frontier['Drive Time (min)']) < 0).all()
@@ -0,0 +1,90 @@
+import json
+
+import pandas as pd
+import pytest
+
+import evaluator_core as core
+from engine_comparison import (UNFILLED_PENALTY, build_policy, choose_engine, pareto_frontier, run_engine,
+                               score_plan)
+from synthetic_data import write_dataset
+
+
+@pytest.fixture(scope="module")
+def inputs(tmp_path_factory):
+    paths = write_dataset(str(tmp_path_factory.mktemp("engines")), 36, 143, 15, seed=0)
+    mileage_df = core.enrich_mileage(core.read_mileage(paths['mileage']),
+                                     core.read_full_time_names(paths['roster']))
+    jobs_df = core.match_customers(core.read_jobs(paths['jobs']), mileage_df['Customer'].unique())
+    return jobs_df, mileage_df, core.build_job_slots(jobs_df)
+
+
+def test_score_plan_charges_double_booking(inputs):
+    jobs_df, mileage_df, job_slots = inputs
+    plan, _ = run_engine("mip", jobs_df, mileage_df, job_slots)
+    base = score_plan(plan, jobs_df, mileage_df, job_slots)
+    assert base['double_booked'] == 0
+
+    # The first evaluator also takes the second assignment's job
+    (evaluator, _), (_, job) = plan[0], plan[1]
+    doubled = score_plan([plan[0], (evaluator, job)] + plan[2:], jobs_df, mileage_df, job_slots)
+    assert doubled['double_booked'] == 1 and doubled['unfilled_slots'] == base['unfilled_slots']
+    assert doubled['effective_cost'] == pytest.approx(
+        doubled['total_cost'] + doubled['last_resort'] * core.MANAGER_PENALTY
+        + (base['unfilled_slots'] + 1) * UNFILLED_PENALTY)
+
+    dropped = score_plan(plan[1:], jobs_df, mileage_df, job_slots)
+    assert dropped['unfilled_slots'] == base['unfilled_slots'] + 1
+
+
+def _results(rows):
+    return pd.DataFrame(rows, columns=['size', 'engine', 'job_slots', 'wall_time', 'effective_cost'])
+
+
+def test_pareto_frontier_per_size():
+    results = pareto_frontier(_results([
+        ("small", "nearest", 10, 0.01, 900.0),
+        ("small", "greedy", 10, 0.02, 950.0),  # slower and dearer than nearest
+        ("small", "mip", 10, 0.50, 500.0),
+        ("small", "auction", 10, 0.50, 500.0),  # ties are not dominated
+        ("large", "greedy", 90, 0.90, 800.0),  # dominated by nearest here only
+        ("large", "nearest", 90, 0.05, 800.0),
+    ]))
+    assert results['pareto'].tolist() == [True, False, True, True, False, True]
+
+
+def test_build_policy_picks_exact_engines():
+    policy = build_policy(_results([
+        ("small", "nearest", 10, 0.01, 400.0),
+        ("small", "mip", 10, 0.40, 500.0),
+        ("small", "auction", 10, 0.20, 500.0),
+        ("large", "greedy", 90, 0.10, 900.0),
+        ("large", "mip", 90, 30.0, 700.0),
+        ("large", "auction", 90, 8.0, 700.0),
+        ("heuristic only", "greedy", 400, 0.10, 900.0),
+    ]), time_budget=5.0)
+
+    # Over budget everywhere, the fastest exact engine is kept
+    assert policy == {'time_budget': 5.0, 'thresholds': [
+        {'max_job_slots': 10, 'engine': "mip"},
+        {'max_job_slots': 90, 'engine': "auction"},
+    ]}
+
+
+def test_choose_engine_thresholds(tmp_path):
+    path = str(tmp_path / "engine_policy.json")
+    assert choose_engine(10, policy_path=path) == "mip"
+    assert choose_engine(10, policy_path=path, default="auction") == "auction"
+
+    with open(path, "w") as f:
+        json.dump({'time_budget': 5.0, 'thresholds': [
+            {'max_job_slots': 10, 'engine': "mip"},
+            {'max_job_slots': 50, 'engine': "greedy"},
+            {'max_job_slots': 90, 'engine': "auction"},
+        ]}, f)
+    assert [choose_engine(n, policy_path=path) for n in (1, 10, 11, 50, 90)] == \
+        ["mip", "mip", "auction", "auction", "auction"]
+    assert choose_engine(5000, policy_path=path) == "auction"
+
+    with open(path, "w") as f:
+        json.dump({'time_budget': 5.0, 'thresholds': [{'max_job_slots': 10, 'engine': "nearest"}]}, f)
+    assert choose_engine(5, policy_path=path) == "mip"
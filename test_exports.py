@@ -0,0 +1,92 @@
+import io
+import os
+import subprocess
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import distance_engine as de
+import evaluator_core as core
+import exports
+from exports import ExportCache, export_bytes, region_labels, to_csv_bytes, to_parquet_bytes, to_xlsx_bytes
+
+
+@pytest.fixture
+def table():
+    return pd.DataFrame({
+        'Job number': np.arange(101, 111),
+        'Customer Company': [f"Customer {i}" for i in range(10)],
+        'Evaluator': ["Avery", "Baker"] * 5,
+        'Round-Trip Miles': np.linspace(10.5, 100.25, 10),
+        'Total Cost': [None, 12.5] + [float(i) for i in range(8)],
+    })
+
+
+def test_csv_header_written_once(table):
+    data = to_csv_bytes(table, chunk_rows=3)
+    assert data.decode('utf-8').count("Job number") == 1
+    pd.testing.assert_frame_equal(pd.read_csv(io.BytesIO(data)), table)
+    assert pd.read_csv(io.BytesIO(to_csv_bytes(table.iloc[:0]))).columns.tolist() == table.columns.tolist()
+
+
+def test_xlsx_sheet_per_region(table):
+    regions = np.array(["NH", "VT", exports.OTHER_REGION, "NH", "MA", "VT", "NH", "MA", "VT", "NH"], dtype=object)
+    sheets = pd.read_excel(io.BytesIO(to_xlsx_bytes(table, regions, chunk_rows=2)), sheet_name=None)
+
+    assert list(sheets) == ["MA", "NH", "VT", exports.OTHER_REGION]
+    for label, sheet in sheets.items():
+        expected = table[regions == label].reset_index(drop=True)
+        pd.testing.assert_frame_equal(sheet, expected, check_dtype=False)
+
+
+def test_region_labels_from_location_files(tmp_path, monkeypatch, table):
+    (tmp_path / "customers.csv").write_text("Customer,State\nCustomer 1, vt\nCustomer 2,\n")
+    (tmp_path / "roster.csv").write_text("Last Name,State\navery,NH\n")
+    monkeypatch.setattr(de, "CUSTOMER_LOCATIONS_FILE", str(tmp_path / "customers.csv"))
+    monkeypatch.setattr(de, "EVALUATOR_LOCATIONS_FILE", str(tmp_path / "missing.csv"))
+    monkeypatch.setattr(core, "FULL_TIME_FILE", str(tmp_path / "roster.csv"))
+
+    # Customer state first, then the evaluator's
+    assert region_labels(table).tolist() == ["NH", "VT", "NH", "Other", "NH", "Other", "NH", "Other", "NH", "Other"]
+
+
+def test_parquet_round_trip(table):
+    pq = pytest.importorskip("pyarrow.parquet")
+    mixed = table.assign(**{'Job number': table['Job number'].astype(object).where(table.index != 3, "A-7")})
+    data = to_parquet_bytes(mixed, chunk_rows=4)
+
+    assert pq.ParquetFile(io.BytesIO(data)).num_row_groups == 3
+    expected = mixed.assign(**{'Job number': mixed['Job number'].astype(str)})
+    pd.testing.assert_frame_equal(pd.read_parquet(io.BytesIO(data)), expected)
+
+
+def test_export_cache_reuse_and_invalidation(monkeypatch, table):
+    calls = []
+
+    def encode(df):
+        calls.append(len(df))
+        return to_csv_bytes(df)
+
+    monkeypatch.setitem(exports.ENCODERS, 'csv', encode)
+    cache = ExportCache()
+    first = export_bytes(table, 'csv', cache)
+    assert export_bytes(table.copy(), 'csv', cache) is first and len(calls) == 1
+
+    changed = table.assign(Evaluator=table['Evaluator'].where(table.index != 0, "Cole"))
+    assert pd.read_csv(io.BytesIO(export_bytes(changed, 'csv', cache)))['Evaluator'][0] == "Cole"
+    assert len(calls) == 2 and len(cache) == 2
+
+    # Over the byte budget the least recently used table goes first
+    small = ExportCache(max_bytes=len(first) + 1)
+    export_bytes(table, 'csv', small)
+    export_bytes(changed, 'csv', small)
+    assert len(small) == 1 and small.get((exports.table_hash(changed), 'csv')) is not None
+
+
+def test_import_does_not_load_distance_engine():
+    code = "import sys, exports; print('distance_engine' in sys.modules)"
+    output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True,
+                            cwd=os.path.dirname(os.path.abspath(exports.__file__))).stdout
+    assert output.strip() == "False"
@@ -0,0 +1,36 @@
+import json
+import sys
+import tracemalloc
+
+import numpy as np
+
+from instrumentation import RunProfiler, latency_summary
+
+
+def test_stages_record_time_and_memory(tmp_path):
+    profiler = RunProfiler("page", trace_memory=True)
+    with profiler.stage("allocate") as stage:
+        data = np.ones(4 * 2 ** 20 // 8)
+        stage['rows'] = len(data)
+    with profiler.stage("idle"):
+        pass
+    allocate, idle = profiler.stages
+
+    assert allocate['rows'] == len(data) and allocate['seconds'] >= 0
+    assert allocate['peak_mb'] >= 3.9 and idle['peak_mb'] < 1
+    if sys.platform.startswith("linux"):
+        assert allocate['rss_delta_mb'] >= 3.9
+
+    log = tmp_path / "run_log.jsonl"
+    profiler.append_log(str(log))
+    profiler.append_log(str(log))
+    assert json.loads(log.read_text().splitlines()[0])['page'] == "page"
+    summary = latency_summary(str(log))
+    assert summary.loc[("page", "allocate"), 'count'] == 2
+
+
+def test_memory_tracing_is_opt_in():
+    profiler = RunProfiler("page", trace_memory=False)
+    with profiler.stage("work"):
+        assert not tracemalloc.is_tracing()
+    assert 'peak_mb' not in profiler.stages[0]
@@ -0,0 +1,81 @@
+import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+from openpyxl import Workbook
+
+from job_ingest import evaluators_needed, job_slot_arrays, read_jobs
+
+HEADER = ['Job number', 'Notes', 'Customer Company', 'Assignee(s)', 'Job Date']
+
+
+def _workbook(path, rows, header=HEADER):
+    workbook = Workbook()
+    sheet = workbook.active
+    sheet.append(header)
+    for row in rows:
+        sheet.append(row)
+    workbook.save(path)
+    return str(path)
+
+
+def test_read_jobs_types_and_drops_blank_numbers(tmp_path):
+    path = _workbook(tmp_path / "jobs.xlsx", [
+        [101, "x", "  Acme Corp ", "Smith, Jones", datetime.datetime(2026, 3, 2)],
+        [None, "no number", "Ghost Co", "Smith", None],
+        [102.0, None, "Baker LLC", None, "not a date"],
+        [None, None, None, None, None],
+        ["  ", "blank text", "Ghost Co", "Smith", None],
+        ["103", None, None, "A, B, C", datetime.datetime(2026, 3, 4)],
+    ])
+    jobs_df = read_jobs(path)
+
+    assert jobs_df.columns.tolist() == ['Job number', 'Customer Company', 'Assignee(s)', 'Job Date',
+                                        'Evaluators Needed']
+    assert jobs_df['Job number'].dtype == 'int64'
+    assert jobs_df['Job number'].tolist() == [101, 102, 103]
+    assert jobs_df['Customer Company'].tolist() == ["acme corp", "baker llc", ""]
+    assert isinstance(jobs_df['Assignee(s)'].dtype, pd.StringDtype)
+    assert jobs_df['Assignee(s)'].isna().tolist() == [False, True, False]
+    assert pd.api.types.is_datetime64_any_dtype(jobs_df['Job Date'])
+    assert jobs_df['Job Date'].isna().tolist() == [False, True, False]
+    assert jobs_df['Evaluators Needed'].tolist() == [2, 1, 3]
+
+
+def test_mixed_job_numbers_stay_text(tmp_path):
+    path = _workbook(tmp_path / "jobs.xlsx", [
+        [101, "", "Acme Corp", "Smith"],
+        ["A-7 ", "", "Baker LLC", "Smith"],
+        [None, "", "Ghost Co", "Smith"],
+        [103.0, "", "Acme Corp", "Smith"],
+    ], header=HEADER[:4])
+    jobs_df = read_jobs(path)
+
+    assert 'Job Date' not in jobs_df
+    assert jobs_df['Job number'].tolist() == ["101", "A-7", "103"]
+    assert "None" not in jobs_df['Job number'].tolist()
+
+
+def test_missing_column_is_reported(tmp_path):
+    path = _workbook(tmp_path / "jobs.xlsx", [[101, "Acme Corp"]], header=['Job number', 'Customer Company'])
+    with pytest.raises(ValueError, match=r"missing column\(s\): Assignee\(s\)"):
+        read_jobs(path)
+
+
+def test_evaluators_needed():
+    assignees = pd.Series(["Smith", "Smith, Jones", None, "", "A,B,C"], dtype=object)
+    assert evaluators_needed(assignees).tolist() == [1, 2, 1, 1, 3]
+
+
+def test_job_slot_arrays_repeat_matched_jobs():
+    jobs_df = pd.DataFrame({
+        'Job number': [101, 102, 103, 104],
+        'Matched Customer': pd.Categorical(["Baker LLC", None, "Acme Corp", "Baker LLC"],
+                                           categories=["Acme Corp", "Baker LLC"]),
+        'Evaluators Needed': [2, 5, 1, 3],
+    })
+    job_numbers, customer_codes = job_slot_arrays(jobs_df)
+
+    np.testing.assert_array_equal(job_numbers, [101, 101, 103, 104, 104, 104])
+    np.testing.assert_array_equal(customer_codes, [1, 1, 0, 1, 1, 1])
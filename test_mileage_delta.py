@@ -0,0 +1,69 @@
+import shutil
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import evaluator_core as core
+import mileage_delta
+from mileage_model import MileageModel
+
+# The live model (MileageModel.apply_delta) and compaction
+# (mileage_delta.compact) must give the same table for the same delta file.
+
+DELTAS = {
+    'update_and_add': [
+        "Barnhart,A And G Industrial Services,100,200,150,upsert",
+        "Barnhart,New Customer Inc,40,80,75,upsert",
+    ],
+    'upsert_then_delete': [
+        "Barnhart,New Customer Inc,40,80,75,upsert",
+        "Barnhart,New Customer Inc,,,,delete",
+    ],
+    'delete_then_upsert': [
+        "Barnhart,A And G Industrial Services,,,,delete",
+        "Barnhart,A And G Industrial Services,100,200,150,upsert",
+    ],
+    'upsert_then_retire': [
+        "Barnhart,New Customer Inc,40,80,75,upsert",
+        "Barnhart,,,,,retire",
+    ],
+}
+
+
+def _table(model):
+    table = model.frame().astype({'Evaluator': str, 'Customer': str, 'Status': str})
+    return table.sort_values(['Evaluator', 'Customer']).reset_index(drop=True)
+
+
+@pytest.mark.parametrize("name", sorted(DELTAS))
+def test_live_and_compacted_deltas_agree(tmp_path, name):
+    mileage_path, full_time_path = tmp_path / "mileage.csv", tmp_path / "full_time.csv"
+    shutil.copy(core.MILEAGE_FILE, mileage_path)
+    shutil.copy(core.FULL_TIME_FILE, full_time_path)
+    delta_dir = tmp_path / "deltas"
+    delta_dir.mkdir()
+    delta_path = delta_dir / "001.csv"
+    delta_path.write_text("\n".join(["Evaluator,Customer,One-Way Miles,Round-Trip Miles,Drive Time (min),Action"]
+                                    + DELTAS[name]) + "\n")
+
+    base = MileageModel.load(str(mileage_path), str(full_time_path))
+    live = base.apply_delta(mileage_delta.read_delta(str(delta_path)),
+                            core.read_full_time_names(str(full_time_path)))
+    assert mileage_delta.compact(str(mileage_path), str(delta_dir)) == 1
+    compacted = MileageModel.load(str(mileage_path), str(full_time_path))
+
+    pd.testing.assert_frame_equal(_table(live), _table(compacted), check_dtype=False)
+
+
+def test_compaction_keeps_full_precision(tmp_path):
+    mileage_path = tmp_path / "mileage.csv"
+    shutil.copy(core.MILEAGE_FILE, mileage_path)
+    delta_dir = tmp_path / "deltas"
+    delta_dir.mkdir()
+    (delta_dir / "001.csv").write_text("Evaluator,Customer,One-Way Miles,Round-Trip Miles,Drive Time (min)\n"
+                                       "Barnhart,New Customer Inc,40.123456789,80.24691358,75.5\n")
+    mileage_delta.compact(str(mileage_path), str(delta_dir))
+
+    row = core.read_mileage(str(mileage_path)).query("Customer == 'New Customer Inc'")
+    assert np.isclose(row['One-Way Miles'].iloc[0], 40.123456789, rtol=0, atol=1e-12)
@@ -0,0 +1,148 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import evaluator_core as core
+from mileage_model import RANK_KEYS, MileageModel, RankingIndex, attach_or_publish
+
+
+@pytest.fixture(scope="module")
+def model():
+    return MileageModel.load()
+
+
+def test_publish_and_attach_share_arrays(tmp_path, model):
+    directory = str(tmp_path / "model")
+    model.publish(directory)
+    attached = MileageModel.attach(directory)
+
+    assert attached.version == model.version
+    assert isinstance(attached.columns['Total Cost'].base, np.memmap)
+    assert not attached.columns['Total Cost'].flags.writeable
+
+
+def test_republish_swaps_versions(tmp_path, model):
+    directory = str(tmp_path / "model")
+    model.publish(directory)
+    first = MileageModel.attach(directory)
+    smaller = MileageModel(model.evaluator_names, model.customer_names, model.evaluator_codes[:10],
+                           model.customer_codes[:10], model.full_time,
+                           {name: values[:10] for name, values in model.columns.items()})
+    for _ in range(3):
+        smaller.publish(directory)
+
+    assert len(MileageModel.attach(directory)) == 10
+    # The reader attached to the first version keeps its data
+    assert len(first) == len(model) and first.columns['Total Cost'].sum() > 0
+    versions = [name for name in os.listdir(directory) if name.isdigit()]
+    assert len(versions) == 2
+
+
+def test_attach_or_publish_reuses_published_model(tmp_path):
+    directory = str(tmp_path / "model")
+    first = attach_or_publish(directory, core.MILEAGE_FILE, core.FULL_TIME_FILE)
+    with open(os.path.join(directory, "CURRENT")) as f:
+        version = f.read()
+    second = attach_or_publish(directory, core.MILEAGE_FILE, core.FULL_TIME_FILE)
+
+    with open(os.path.join(directory, "CURRENT")) as f:
+        assert f.read() == version
+    assert second.version == first.version
+
+
+def _assert_same_index(incremental, fresh):
+    np.testing.assert_array_equal(incremental.offsets, fresh.offsets)
+    np.testing.assert_array_equal(incremental.evaluator_offsets, fresh.evaluator_offsets)
+    for key in RANK_KEYS:
+        np.testing.assert_array_equal(incremental.order[key], fresh.order[key])
+        np.testing.assert_array_equal(incremental.rank[key], fresh.rank[key])
+        np.testing.assert_array_equal(incremental.evaluator_order[key], fresh.evaluator_order[key])
+
+
+def test_ranking_orders_each_customer(model):
+    ranking = model.ranking
+    for key, column in RANK_KEYS.items():
+        values = model.columns[column]
+        order = ranking.order[key]
+        customers = model.customer_codes[order]
+        assert (np.diff(customers) >= 0).all()
+        same = customers[1:] == customers[:-1]
+        # Within a customer, non-decreasing values with ties in file order
+        ahead, behind = values[order][:-1][same], values[order][1:][same]
+        assert ((ahead < behind) | ((ahead == behind) & (order[:-1][same] < order[1:][same]))).all()
+        starts = ranking.offsets[customers]
+        np.testing.assert_array_equal(ranking.rank[key][order], np.arange(len(order)) - starts)
+
+
+def test_customer_rows_and_closest_rows(model):
+    frame = model.frame()
+    code = model.customer_code("A And G Industrial Services")
+    rows = model.ranking.customer_rows(code, by="miles", k=3)
+    expected = frame[frame['Customer'] == model.customer_names[code]].sort_values(
+        'Round-Trip Miles', kind='stable').index[:3]
+    np.testing.assert_array_equal(rows, expected)
+
+    closest = model.ranking.closest_rows(by="miles")
+    assert len(closest) == len(np.unique(model.customer_codes))
+    assert (model.ranking.rank['miles'][closest] == 0).all()
+
+
+DELTA = pd.DataFrame({
+    'Evaluator': ["Barnhart", "Barnhart", "Newcomer", "Barnhart"],
+    'Customer': ["A And G Industrial Services", "Brand New Customer", "A And G Industrial Services",
+                 "AGI Construction"],
+    'One-Way Miles': [1.0, 40.0, 2.0, np.nan],
+    'Round-Trip Miles': [2.0, 80.0, 4.0, np.nan],
+    'Drive Time (min)': [5.0, 75.0, 6.0, np.nan],
+    'Action': ["upsert", "upsert", "upsert", "delete"],
+})
+
+
+def test_ranking_after_delta_matches_full_rebuild(model):
+    full_time_names = core.read_full_time_names()
+    updated = model.apply_delta(DELTA, full_time_names)
+    assert len(updated) == len(model) + 1
+    top = updated.ranking.customer_rows(updated.customer_code("A And G Industrial Services"), k=2)
+    assert updated.evaluator_names[updated.evaluator_codes[top]].tolist() == ["Barnhart", "Newcomer"]
+    _assert_same_index(updated.ranking, RankingIndex(updated))
+
+    # Retiring an evaluator renumbers rows across every customer they served
+    retire = DELTA.iloc[[3]].assign(Customer="", Action="retire")
+    retired = updated.apply_delta(retire, full_time_names)
+    _assert_same_index(retired.ranking, RankingIndex(retired))
+    assert retired.evaluator_code("Barnhart") is not None
+    assert len(retired.ranking.evaluator_rows(retired.evaluator_code("Barnhart"))) == 0
+
+
+def test_evaluator_rows_by_rank(model):
+    ranking = model.ranking
+    code = model.evaluator_code("Barnhart")
+    rows = ranking.evaluator_rows(code)
+    ranks = ranking.rank['miles'][rows]
+    assert (model.evaluator_codes[rows] == code).all()
+    assert len(rows) == (model.evaluator_codes == code).sum()
+    assert (np.diff(ranks) >= 0).all()
+
+    for max_rank in (1, 2):
+        top = ranking.evaluator_rows(code, max_rank=max_rank)
+        np.testing.assert_array_equal(top, rows[ranks < max_rank])
+
+    competitors = ranking.competitors(model.customer_codes[rows])
+    np.testing.assert_array_equal(competitors, np.bincount(model.customer_codes)[model.customer_codes[rows]])
+    assert (ranks < competitors).all()
+
+
+def test_top_rows_match_merge_and_nsmallest(model):
+    frame = model.frame()
+    customers = np.unique(model.customer_codes)
+    codes = np.array([customers[0], -1, customers[5], customers[0], customers[9]])
+    needed = np.array([2, 3, 1, 500, 0])
+    rows, owner = model.ranking.top_rows(codes, needed, by="miles")
+
+    for job, (code, n) in enumerate(zip(codes, needed)):
+        expected = [] if code < 0 else frame[frame['Customer'] == model.customer_names[code]].sort_values(
+            'Round-Trip Miles', kind='stable').index[:n].tolist()
+        assert rows[owner == job].tolist() == expected
+    assert (np.diff(owner) >= 0).all()
@@ -0,0 +1,24 @@
+import pandas as pd
+
+from scenario_sweep import scenario_grid, sweep
+
+
+def _jobs(model, rows):
+    customers = pd.Categorical.from_codes([model.customer_code(c) for c, _ in rows],
+                                          categories=model.customer_names)
+    return pd.DataFrame({'Job number': range(1, len(rows) + 1), 'Matched Customer': customers,
+                         'Evaluators Needed': [n for _, n in rows]})
+
+
+def test_short_staffed_scenarios_stay_comparable(small_model):
+    # Yates Co needs three evaluators but only two have mileage for it
+    jobs_df = _jobs(small_model, [("Yates Co", 3), ("Xavier Inc", 1)])
+    scenarios = scenario_grid({'Mile Rate': [0.5, 1.0]})
+    results, stats = sweep(jobs_df, small_model.frame(), scenarios, workers=1)
+
+    assert stats['job_slots'] == 4
+    assert (results['Status'] == "Optimal").all()
+    assert (results['Unfilled'] == 1).all() and (results['Assigned'] == 3).all()
+    assert (results['Total Cost'] > 0).all()
+    # Adams and Baker on Yates, Carter on Xavier: 85 miles round trip
+    assert (results['Round-Trip Miles'] == 85).all()
@@ -0,0 +1,49 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from spatial_index import EvaluatorLocator
+
+
+@pytest.fixture
+def locator(small_model):
+    evaluators = np.full((len(small_model.evaluator_names), 2), np.nan)
+    # Adams and Baker near Concord NH, Carter in Albany NY
+    for name, coords in [("Adams", (43.2, -71.5)), ("Baker", (43.0, -71.0)), ("Carter", (42.65, -73.75))]:
+        evaluators[small_model.evaluator_code(name)] = coords
+    customers = np.full((len(small_model.customer_names), 2), np.nan)
+    customers[small_model.customer_code("Xavier Inc")] = (42.7, -73.7)
+    locations = {'centroids': pd.DataFrame({'Latitude': [43.2], 'Longitude': [-71.5]}, index=["03301"]),
+                 'evaluators': evaluators, 'customers': customers}
+    return EvaluatorLocator(small_model, locations)
+
+
+def _names(model, codes):
+    return [model.evaluator_names[c] if c >= 0 else None for c in codes]
+
+
+def test_nearest_and_within(locator, small_model):
+    codes, miles = locator.nearest(43.2, -71.5, k=2)
+    assert _names(small_model, codes) == ["Adams", "Baker"]
+    assert miles[0] == pytest.approx(0, abs=1e-6) and 20 < miles[1] < 40
+
+    codes, miles = locator.within(43.2, -71.5, miles=50)
+    assert _names(small_model, codes) == ["Adams", "Baker"]
+    assert (np.diff(miles) >= 0).all()
+    assert locator.zip_coordinates(3301) == (43.2, -71.5)
+
+
+def test_candidates_skip_unavailable(locator, small_model):
+    xavier, yates = small_model.customer_code("Xavier Inc"), small_model.customer_code("Yates Co")
+    nearest = locator.candidates([xavier, yates], k=2)
+    assert _names(small_model, nearest[0]) == ["Carter", "Adams"]
+    assert nearest[1].tolist() == [-1, -1]
+
+    available = np.ones(len(small_model.evaluator_names), dtype=bool)
+    available[small_model.evaluator_code("Carter")] = False
+    nearest = locator.candidates([xavier], k=2, available=available)
+    assert _names(small_model, nearest[0]) == ["Adams", "Baker"]
+
+    available[small_model.evaluator_code("Adams")] = False
+    nearest = locator.candidates([xavier], k=2, available=available)
+    assert _names(small_model, nearest[0]) == ["Baker", None]
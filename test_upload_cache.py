@@ -0,0 +1,70 @@
+import io
+
+import pandas as pd
+import pytest
+
+from evaluator_core import match_customers
+from mileage_model import shared_mileage_model
+from upload_cache import UploadCache, load_jobs
+
+# load_jobs against the real shared model: 'Matched Customer' then shares the
+# model's read-only customer name array, as it does on the pages.
+
+
+@pytest.fixture(scope="module")
+def mileage_df():
+    return shared_mileage_model().frame()
+
+
+def _workbook(customers):
+    buffer = io.BytesIO()
+    pd.DataFrame({
+        'Job number': range(1, len(customers) + 1),
+        'Customer Company': customers,
+        'Assignee(s)': ["Smith, Jones" if i % 3 == 0 else "Smith" for i in range(len(customers))],
+    }).to_excel(buffer, index=False)
+    buffer.seek(0)
+    return buffer
+
+
+def _load(upload, mileage_df, cache):
+    return load_jobs(upload, lambda jobs: match_customers(jobs, mileage_df['Customer']),
+                     mileage_df['Customer'].cat.categories, namespace="rapidfuzz", cache=cache)
+
+
+def test_load_jobs_with_shared_model(mileage_df):
+    customers = list(mileage_df['Customer'].cat.categories[:12])
+    cache = UploadCache()
+    # The same bytes twice (a workbook written again carries a new timestamp)
+    data = _workbook(customers).getvalue()
+
+    key, entry, info = _load(io.BytesIO(data), mileage_df, cache)
+    assert info == {'cache_hit': False, 'changed_rows': 12, 'rows': 12, 'partial': False}
+    assert entry['jobs']['Matched Customer'].astype(str).tolist() == customers
+    assert 0 < cache.nbytes() < 2 ** 20
+
+    cache.store_result(key, "plan", entry['jobs'].head(3))
+    assert cache.get(key)['results']['plan'] is not None
+
+    _, _, info = _load(io.BytesIO(data), mileage_df, cache)
+    assert info['cache_hit']
+
+
+def test_changed_rows_are_rematched(mileage_df):
+    customers = list(mileage_df['Customer'].cat.categories[:12])
+    cache = UploadCache()
+    _load(_workbook(customers), mileage_df, cache)
+
+    customers[5] = mileage_df['Customer'].cat.categories[20]
+    _, entry, info = _load(_workbook(customers), mileage_df, cache)
+    assert info['partial'] and info['changed_rows'] == 1
+    assert entry['jobs']['Matched Customer'].astype(str).tolist() == customers
+    assert len(cache) == 2
+
+
+def test_eviction_keeps_newest_entry(mileage_df):
+    categories = mileage_df['Customer'].cat.categories
+    cache = UploadCache(max_bytes=1)
+    _load(_workbook(list(categories[:4])), mileage_df, cache)
+    key, _, _ = _load(_workbook(list(categories[4:8])), mileage_df, cache)
+    assert len(cache) == 1 and cache.get(key) is not None
@@ -0,0 +1,173 @@
+import hashlib
+import io
+import os
+import pickle
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from job_ingest import read_jobs
+
+# Uploaded job files keyed by a SHA-256 of their bytes. Re-uploading the same
+# workbook (e.g. after a browser refresh) returns the parsed and matched jobs
+# plus any stored results without re-parsing, re-matching or re-solving.
+# Each row is also hashed, so an upload that differs from a cached one in a
+# few rows only re-matches those rows. Entries are evicted least recently used
+# once the cache holds more than EVALUATOR_UPLOAD_CACHE_MB.
+
+MAX_BYTES = int(float(os.environ.get("EVALUATOR_UPLOAD_CACHE_MB", "256")) * 2 ** 20)
+ROW_COLUMNS = ['Job number', 'Customer Company', 'Assignee(s)']
+
+
+def fingerprint(data, namespace=""):
+    digest = hashlib.sha256(namespace.encode("utf-8"))
+    digest.update(data)
+    return digest.hexdigest()
+
+
+# Stable key for results that also depend on page inputs (engine, available evaluators, ...)
+def result_key(*parts):
+    return fingerprint(repr(parts).encode("utf-8"))
+
+
+def hash_rows(jobs_df):
+    return pd.util.hash_pandas_object(jobs_df[ROW_COLUMNS], index=False).to_numpy()
+
+
+# Categorical columns are sized from their codes plus each distinct categories
+# index once: 'Matched Customer' shares the model's read-only name array, which
+# memory_usage(deep=True) cannot measure on pandas 2
+def _frame_size(frame):
+    size, seen = int(frame.index.memory_usage()), set()
+    for name in frame.columns:
+        column = frame[name]
+        if isinstance(column.dtype, pd.CategoricalDtype):
+            size += column.cat.codes.to_numpy().nbytes
+            categories = column.cat.categories
+            if id(categories) not in seen:
+                seen.add(id(categories))
+                size += sum(len(str(value)) + 49 for value in categories)
+        else:
+            size += int(column.memory_usage(index=False, deep=True))
+    return size
+
+
+def _entry_size(entry):
+    size = _frame_size(entry['jobs']) + entry['row_hashes'].nbytes
+    return size + len(pickle.dumps(entry['results'], protocol=pickle.HIGHEST_PROTOCOL))
+
+
+class UploadCache:
+    def __init__(self, max_bytes=MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.sizes = {}
+        self.lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def nbytes(self):
+        return sum(self.sizes.values())
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                self.entries.move_to_end(key)
+            return entry
+
+    def put(self, key, entry):
+        with self.lock:
+            self.entries[key] = entry
+            self.entries.move_to_end(key)
+            self.sizes[key] = _entry_size(entry)
+            self._evict()
+
+    # Store a result on an entry (re-measured, so eviction sees the new size)
+    def store_result(self, key, name, value):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return
+            entry['results'][name] = value
+            self.sizes[key] = _entry_size(entry)
+            self._evict()
+
+    def _evict(self):
+        while len(self.entries) > 1 and self.nbytes() > self.max_bytes:
+            oldest, _ = self.entries.popitem(last=False)
+            del self.sizes[oldest]
+
+    # Cached entry in the same namespace sharing the most rows with row_hashes
+    def closest(self, row_hashes, namespace):
+        with self.lock:
+            candidates = [e for e in self.entries.values() if e['namespace'] == namespace]
+        best, best_shared = None, 0
+        for entry in candidates:
+            shared = int(np.isin(row_hashes, entry['row_hashes']).sum())
+            if shared > best_shared:
+                best, best_shared = entry, shared
+        return best
+
+
+# One cache per server process, shared by every session
+@lru_cache(maxsize=1)
+def shared_upload_cache():
+    return UploadCache()
+
+
+def read_upload(uploaded_file):
+    uploaded_file.seek(0)
+    return uploaded_file.read()
+
+
+# Parse and match an uploaded job file through the cache. match_fn takes a jobs
+# frame and returns it with a categorical 'Matched Customer' over categories;
+# the namespace should identify the matcher and its inputs.
+# Returns (key, entry, info) where info reports a cache hit or the changed rows.
+def load_jobs(uploaded_file, match_fn, categories, namespace="", cache=None):
+    if cache is None:
+        cache = shared_upload_cache()
+    namespace = f"{namespace}|{fingerprint(chr(10).join(map(str, categories)).encode('utf-8'))}"
+    data = read_upload(uploaded_file)
+    key = fingerprint(data, namespace)
+    entry = cache.get(key)
+    if entry is not None:
+        return key, entry, {'cache_hit': True, 'changed_rows': 0, 'rows': len(entry['jobs'])}
+
+    jobs_df = read_jobs(io.BytesIO(data))
+    row_hashes = hash_rows(jobs_df)
+    previous = cache.closest(row_hashes, namespace)
+    if previous is None:
+        jobs_df = match_fn(jobs_df)
+        changed = len(jobs_df)
+    else:
+        # Reuse matches for rows seen before; only new or edited rows are matched
+        known = pd.Series(previous['jobs']['Matched Customer'].cat.codes.to_numpy(), index=previous['row_hashes'])
+        known = known[~known.index.duplicated()]
+        codes = known.reindex(row_hashes).to_numpy(dtype=np.float64, copy=True)
+        fresh = np.isnan(codes)
+        changed = int(fresh.sum())
+        if changed:
+            fresh_codes = match_fn(jobs_df[fresh])['Matched Customer'].cat.codes.to_numpy()
+            codes[fresh] = fresh_codes
+        jobs_df['Matched Customer'] = pd.Categorical.from_codes(codes.astype(np.int32), categories=categories)
+
+    entry = {'namespace': namespace, 'jobs': jobs_df, 'row_hashes': row_hashes, 'results': {}}
+    cache.put(key, entry)
+    return key, entry, {'cache_hit': False, 'changed_rows': changed, 'rows': len(jobs_df),
+                        'partial': previous is not None}
+
+
+def render_upload_status(info):
+    import streamlit as st
+
+    if info['cache_hit']:
+        st.caption("Same file as an earlier upload: showing the cached results.")
+    elif info.get('partial'):
+        st.info(f"{info['changed_rows']} of {info['rows']} rows differ from an earlier upload; "
+                "only those rows were re-matched.")